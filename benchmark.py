@@ -0,0 +1,201 @@
+"""
+Banc de performance : MGD, Jacobiennes, MGI, loi de mouvement, traj() complète,
+analyse des erreurs et vérification des collisions, sur des charges fixes (graine fixe).
+
+Les temps sont écrits en JSON ; avec --reference, chaque étape est comparée à un
+résultat précédent et le script sort en erreur (code 1) si une étape a ralenti
+au-delà du seuil configuré.
+
+Exemples :
+    python benchmark.py --sortie reference.json
+    python benchmark.py --reference reference.json --seuil 0.25 --seuil-etape traj=0.5
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from src.collisions import ModeleCollision
+from src.const_v import dh
+from src.matrice_tn import (generate_transformation_matrices, calcul_T06_global,
+                            generate_transformation_matrices_batch, calcul_T0i_batch)
+from src.modele_differentiel import Jacob_geo, Jacob_geo_batch, Jacob_analytique, MGI_numerique
+from src.part1_loi_mouvement import calcul_loi_mouvement
+from src.part2_trajectoire_operationnelle import calcul_trajectoire_operationnelle
+from src.part3_analyse_tache import calcul_X_robot_et_erreurs
+from src.part4_generation_articulaire import traj, Q_INIT_DEFAUT
+
+# Charges fixes
+GRAINE = 0
+NB_CONFIGURATIONS = 1000
+NB_CIBLES_MGI = 50
+NB_JACOB_ANALYTIQUE = 5
+O, R, V = [0.25, -0.15, 0.5], 0.1, 0.05
+
+
+def preparer_charges():
+    """ Données d'entrée des étapes (tirées une fois, hors chronométrage). """
+    rng = np.random.default_rng(GRAINE)
+    q = rng.uniform(-np.pi, np.pi, (NB_CONFIGURATIONS, 6))
+
+    # Cibles MGI atteignables : MGD de configurations proches de la configuration initiale
+    q_cibles = np.asarray(Q_INIT_DEFAUT) + rng.uniform(-0.5, 0.5, (NB_CIBLES_MGI, 6))
+    cibles = calcul_T0i_batch(generate_transformation_matrices_batch(q_cibles, dh))[:, -1, :3, 3]
+    # Départ à chaud : configuration voisine de la solution (cas du suivi de trajectoire)
+    q_chaud = q_cibles + rng.uniform(-0.02, 0.02, q_cibles.shape)
+
+    temps, s, s_dot, s_ddot, _ = calcul_loi_mouvement(R, V)
+    X, dX, _ = calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot)
+    _, q_traj, qp_traj, _ = traj(O, R, V)
+
+    return {"q": q, "cibles": cibles, "q_chaud": q_chaud, "temps": temps, "X": X, "dX": dX,
+            "q_traj": q_traj, "qp_traj": qp_traj}
+
+
+def definir_etapes(c):
+    """ {nom: (fonction sans argument, description de la charge)} """
+    def mgd():
+        for q in c["q"]:
+            calcul_T06_global(generate_transformation_matrices(q, dh))
+
+    def mgd_batch():
+        calcul_T0i_batch(generate_transformation_matrices_batch(c["q"], dh))
+
+    def jacob_geo():
+        for q in c["q"]:
+            Jacob_geo(generate_transformation_matrices(q, dh))
+
+    def jacob_geo_batch():
+        Jacob_geo_batch(calcul_T0i_batch(generate_transformation_matrices_batch(c["q"], dh)))
+
+    def jacob_analytique():
+        for q in c["q"][:NB_JACOB_ANALYTIQUE]:
+            Jacob_analytique(q)
+
+    def mgi_froid():
+        for cible in c["cibles"]:
+            MGI_numerique(cible, Q_INIT_DEFAUT, dh, max_iter=100, tol=1e-5, alpha=0.8)
+
+    def mgi_chaud():
+        for cible, q0 in zip(c["cibles"], c["q_chaud"]):
+            MGI_numerique(cible, q0, dh, max_iter=100, tol=1e-5, alpha=0.8)
+
+    def loi_mouvement():
+        calcul_loi_mouvement(R, V)
+
+    def trajectoire():
+        traj(O, R, V)
+
+    def analyse():
+        calcul_X_robot_et_erreurs(c["temps"], c["X"], c["dX"], c["q_traj"], c["qp_traj"])
+
+    modele = ModeleCollision()
+
+    def collisions():
+        modele.verifier(c["temps"], c["q_traj"], marge=0.02)
+
+    n = NB_CONFIGURATIONS
+    return {
+        "mgd": (mgd, f"{n} configurations, une par une"),
+        "mgd_batch": (mgd_batch, f"{n} configurations, en lot"),
+        "jacob_geo": (jacob_geo, f"{n} configurations, une par une"),
+        "jacob_geo_batch": (jacob_geo_batch, f"{n} configurations, en lot"),
+        "jacob_analytique": (jacob_analytique, f"{NB_JACOB_ANALYTIQUE} configurations"),
+        "mgi_froid": (mgi_froid, f"{NB_CIBLES_MGI} cibles depuis Q_INIT_DEFAUT"),
+        "mgi_chaud": (mgi_chaud, f"{NB_CIBLES_MGI} cibles depuis une configuration voisine"),
+        "loi_mouvement": (loi_mouvement, f"R={R}, V={V}, dt=0.005"),
+        "traj": (trajectoire, f"O={O}, R={R}, V={V}, dt=0.005"),
+        "analyse": (analyse, f"{len(c['temps'])} points"),
+        "collisions": (collisions, f"{len(c['temps'])} points, sol, marge 0.02 m"),
+    }
+
+
+def chronometrer(fonction, repetitions):
+    """ Une exécution de chauffe, puis 'repetitions' mesures (s). """
+    fonction()
+    durees = np.zeros(repetitions)
+    for k in range(repetitions):
+        t0 = time.perf_counter()
+        fonction()
+        durees[k] = time.perf_counter() - t0
+    return {"min": float(durees.min()), "mediane": float(np.median(durees)),
+            "moyenne": float(durees.mean()), "repetitions": repetitions}
+
+
+def comparer(resultats, reference, seuil, seuils_etapes):
+    """
+    Compare les médianes à la référence.
+
+    :return: liste des régressions (nom, ratio, seuil)
+    """
+    regressions = []
+    print(f"\n{'Étape':<18}{'Réf. (ms)':>12}{'Actuel (ms)':>14}{'Ratio':>8}{'Seuil':>8}")
+    for nom, mesure in resultats["etapes"].items():
+        if nom not in reference["etapes"]:
+            print(f"{nom:<18}{'-':>12}{mesure['mediane'] * 1e3:>14.3f}  (nouvelle étape)")
+            continue
+        ref = reference["etapes"][nom]["mediane"]
+        ratio = mesure["mediane"] / ref
+        limite = seuils_etapes.get(nom, seuil)
+        marque = "  RÉGRESSION" if ratio > 1 + limite else ""
+        print(f"{nom:<18}{ref * 1e3:>12.3f}{mesure['mediane'] * 1e3:>14.3f}{ratio:>8.2f}{1 + limite:>8.2f}{marque}")
+        if marque:
+            regressions.append((nom, ratio, limite))
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Banc de performance cinématique / trajectoire")
+    parser.add_argument("--sortie", default="benchmark.json", help="Fichier JSON des résultats")
+    parser.add_argument("--reference", help="Résultats de référence (JSON) pour détecter les régressions")
+    parser.add_argument("--seuil", type=float, default=0.25,
+                        help="Ralentissement toléré par rapport à la référence (0.25 = +25 %%)")
+    parser.add_argument("--seuil-etape", action="append", default=[], metavar="NOM=SEUIL",
+                        help="Seuil propre à une étape (répétable)")
+    parser.add_argument("--etapes", nargs="+", help="Sous-ensemble d'étapes à mesurer")
+    parser.add_argument("--repetitions", type=int, default=5, help="Mesures par étape")
+    args = parser.parse_args(args)
+
+    seuils_etapes = {}
+    for option in args.seuil_etape:
+        nom, _, valeur = option.partition("=")
+        seuils_etapes[nom] = float(valeur)
+
+    print("Préparation des charges...")
+    etapes = definir_etapes(preparer_charges())
+    noms = args.etapes or list(etapes)
+    inconnues = set(noms) - set(etapes)
+    if inconnues:
+        raise ValueError(f"Étapes inconnues : {sorted(inconnues)} (disponibles : {list(etapes)})")
+
+    resultats = {"date": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                 "numpy": np.__version__, "machine": platform.platform(), "processeur": platform.processor(),
+                 "etapes": {}}
+    for nom in noms:
+        fonction, charge = etapes[nom]
+        repetitions = 1 if nom == "traj" else args.repetitions  # traj() : plusieurs secondes
+        mesure = chronometrer(fonction, repetitions)
+        mesure["charge"] = charge
+        resultats["etapes"][nom] = mesure
+        print(f" {nom:<18} médiane {mesure['mediane'] * 1e3:10.3f} ms   ({charge})")
+
+    with open(args.sortie, "w") as f:
+        json.dump(resultats, f, indent=1)
+    print(f"\nRésultats écrits dans {args.sortie}")
+
+    if args.reference:
+        with open(args.reference) as f:
+            reference = json.load(f)
+        regressions = comparer(resultats, reference, args.seuil, seuils_etapes)
+        if regressions:
+            print(f"\n{len(regressions)} étape(s) en régression : {', '.join(nom for nom, _, _ in regressions)}")
+            return 1
+        print("\nAucune régression.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+import argparse
+
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -8,15 +10,32 @@ from src.part3_analyse_tache import (
     calcul_vitesse_OE,
     afficher_tache_X_t,
     calcul_X_robot_et_erreurs,
+    rapport_erreurs,
     afficher_erreurs_X,
 )
 
 from src.part4_generation_articulaire import traj, plot_resultats_articulaires
+from src.rendu_figures import configurer_rendu, attendre_rendus
+from src import instrumentation
+
+
 
 
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Génération de trajectoire UR3 (V.1 -> V.4)")
+    parser.add_argument("--figures", metavar="DOSSIER",
+                        help="Sauve les figures dans DOSSIER au lieu d'ouvrir des fenêtres (exécution sans surveillance)")
+    parser.add_argument("--format", choices=["png", "svg"], default="png", help="Format des images (défaut : png)")
+    parser.add_argument("--workers", type=int, default=2, help="Processus de rendu en arrière-plan (défaut : 2)")
+    parser.add_argument("--instrumentation", action="store_true",
+                        help="Mesure les durées par étape et les itérations MGI, puis affiche le rapport")
+    args = parser.parse_args(args)
 
+    if args.instrumentation:
+        instrumentation.activer()
+    if args.figures:
+        configurer_rendu(mode="fichier", dossier=args.figures, format=args.format, nb_workers=args.workers)
 
-def main():
     print("===============================================================")
     print("PROJET UR3 : GÉNÉRATION DE TRAJECTOIRE COMPLÈTE (V.1 -> V.4)")
     print("===============================================================\n")
@@ -98,9 +117,23 @@ def main():
         qp  # vitesses articulaires
     )
 
+    rapport = rapport_erreurs(time, erreur_X, erreur_dX)
+    for grandeur, unite in (("position", "m"), ("vitesse", "m/s")):
+        stats = rapport[grandeur]
+        print(f" -> Erreur {grandeur} : RMS {np.round(stats['rms'], 8)} {unite}, "
+              f"max {stats['norme_max']:.3e} {unite} à t = {stats['t_norme_max']:.2f} s")
+
     print(" -> Affichage des erreurs cartésiennes (position et vitesse)...")
     afficher_erreurs_X(time, erreur_X, erreur_dX)
 
+    if args.instrumentation:
+        print("\n--- Instrumentation (durées par étape, compteurs) ---")
+        print(instrumentation.rapport())
+
+    if args.figures:
+        fichiers = attendre_rendus()
+        print(f" -> {len(fichiers)} figures écrites dans '{args.figures}'.")
+
     print("\n=== SIMULATION TERMINÉE ===")
 
 
@@ -0,0 +1,34 @@
+"""
+Façade « calcul seul » : génération de trajectoire, modèles géométriques /
+différentiels / dynamiques et analyse des erreurs, sans matplotlib, sympy ni pybullet.
+
+Destinée aux processus de travail et aux outils en ligne de commande : seuls numpy
+et les modules de calcul sont importés. Les fonctions d'affichage (part1..part4) et
+Jacob_analytique (sympy) restent disponibles dans leurs modules et chargent leurs
+dépendances au premier appel.
+"""
+from src.collisions import ModeleCollision, distance_segments
+from src.const_v import dh, inertie, couples_max, capsules, limites_articulaires, modeles_robot
+from src.dynamique import rnea_batch, matrice_inertie_batch, verifier_couples
+from src.limites_articulaires import verifier_limites, ControleLimites, DepassementLimite
+from src.matrice_tn import (generate_transformation_matrices, calcul_T06_global,
+                            generate_transformation_matrices_batch, calcul_T0i_batch)
+from src.modele_differentiel import Jacob_geo, Jacob_geo_batch, MDD, MDI, MGI_numerique, MGI_pose
+from src.mgi_parallele import mgi_multi_departs, calcul_trajectoire_articulaire_parallele, traj_parallele
+from src.modeles_robot import ModeleRobot, modele_robot, noms_modeles
+from src.orientation import (quaternion_depuis_matrice, matrice_depuis_quaternion, slerp,
+                             vecteur_rotation, erreur_orientation)
+from src.part1_loi_mouvement import calcul_loi_mouvement, evaluer_loi_mouvement, loi_trapezoidale
+from src.part2_trajectoire_operationnelle import calcul_trajectoire_operationnelle
+from src.part3_analyse_tache import (calcul_vitesse_OE, calcul_X_robot_et_erreurs, calcul_orientation_et_erreurs,
+                                     rapport_erreurs)
+from src.part4_generation_articulaire import (Q_INIT_DEFAUT, calcul_trajectoire_articulaire,
+                                             resoudre_points_articulaires, traj)
+from src.trajectoire_composee import (segment_lineaire, segment_arc, planifier_composition,
+                                      evaluer_composition, calcul_trajectoire_composee, traj_composee)
+from src.trajectoire_pose import consigne_orientation, calcul_trajectoire_articulaire_pose, traj_pose
+from src.utils import (mgd_vers_simulation, simulation_vers_mgd,
+                       vitesse_mgd_vers_simulation, vitesse_simulation_vers_mgd)
+
+# Modules dont le chargement est différé (voir test_import_rapide.py)
+MODULES_DIFFERES = ("matplotlib", "sympy", "pybullet")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vérification des collisions (auto-collisions et environnement) par un modèle de capsules.
+
+Chaque segment du bras est une capsule (segment [A, B] + rayon) construite sur les
+origines des repères DH ; l'environnement est fait de plans (sol de plane.urdf, parois)
+et de capsules fixes (montages, une sphère étant une capsule de longueur nulle).
+
+Les distances minimales sont calculées en une fois sur toute une trajectoire
+(tableaux (N, paires)), sans appel à PyBullet. Une pré-passe par sphères englobantes
+(une par capsule) écarte les paires trivialement éloignées : la distance exacte
+segment / segment n'est évaluée que pour les paires candidates.
+"""
+import numpy as np
+
+from src.const_v import dh, capsules
+from src.matrice_tn import generate_transformation_matrices_batch, calcul_T0i_batch
+
+EPS = 1e-12
+
+
+def distance_segments(P1, Q1, P2, Q2):
+    """
+    Distance minimale entre les segments [P1, Q1] et [P2, Q2], vectorisée sur les premiers axes
+    (tableaux (..., 3)). Segments de longueur nulle acceptés (points).
+    """
+    d1 = Q1 - P1
+    d2 = Q2 - P2
+    r = P1 - P2
+    a = np.einsum('...i,...i->...', d1, d1)
+    e = np.einsum('...i,...i->...', d2, d2)
+    b = np.einsum('...i,...i->...', d1, d2)
+    c = np.einsum('...i,...i->...', d1, r)
+    f = np.einsum('...i,...i->...', d2, r)
+    a_s = np.maximum(a, EPS)
+    e_s = np.maximum(e, EPS)
+
+    # Paramètres des points les plus proches (cas général, puis bornes et segments dégénérés)
+    denom = a * e - b * b
+    s = np.where(denom > EPS, np.clip((b * f - c * e) / np.maximum(denom, EPS), 0.0, 1.0), 0.0)
+    t = (b * s + f) / e_s
+    s = np.where(t < 0.0, np.clip(-c / a_s, 0.0, 1.0), np.where(t > 1.0, np.clip((b - c) / a_s, 0.0, 1.0), s))
+    t = np.clip(t, 0.0, 1.0)
+
+    s = np.where(e <= EPS, np.clip(-c / a_s, 0.0, 1.0), s)
+    t = np.where(e <= EPS, 0.0, t)
+    t = np.where(a <= EPS, np.clip(f / e_s, 0.0, 1.0), t)
+    s = np.where(a <= EPS, 0.0, s)
+
+    ecart = (P1 + d1 * s[..., None]) - (P2 + d2 * t[..., None])
+    return np.linalg.norm(ecart, axis=-1)
+
+
+class ModeleCollision:
+    """
+    Modèle de capsules du bras et de son environnement.
+
+    :param dh_params: paramètres DH (défaut : UR3).
+    :param rayons: rayons des 7 capsules (socle, epaule, bras, avant_bras, poignet_1, poignet_2, outil).
+    :param longueur_outil: longueur de la capsule d'outil le long de z6 (m).
+    :param sol: ajoute le plan z = 0 (sol de plane.urdf).
+
+    Paires testées en auto-collision : capsules non adjacentes (les capsules voisines partagent
+    une articulation), hors capsules["paires_exclues"] (distance constante). Le socle, fixé au sol, n'est pas testé contre l'environnement.
+    """
+
+    def __init__(self, dh_params=dh, rayons=capsules["rayons"], longueur_outil=capsules["longueur_outil"],
+                 sol=True):
+        self.dh = dh_params
+        self.noms = list(capsules["noms"])
+        self.rayons = np.asarray(rayons, dtype=float)
+        if len(self.rayons) != len(self.noms):
+            raise ValueError(f"{len(self.noms)} rayons attendus ({', '.join(self.noms)}).")
+        self.longueur_outil = longueur_outil
+
+        nb = len(self.noms)
+        exclues = {(self.noms.index(a), self.noms.index(b)) for a, b in capsules["paires_exclues"]}
+        self.paires = np.array([(i, j) for i in range(nb) for j in range(i + 2, nb) if (i, j) not in exclues])
+        self.liens_environnement = np.arange(1, nb)
+
+        self.plans = []      # (nom, normale unitaire, distance d'origine : n.x >= d côté libre)
+        self.obstacles = []  # (nom, A, B, rayon)
+        if sol:
+            self.ajouter_plan("sol", [0, 0, 1], [0, 0, 0])
+
+    def ajouter_plan(self, nom, normale, point):
+        """ Demi-espace libre {x : n.(x - point) >= 0} (paroi, table, sol). """
+        normale = np.asarray(normale, dtype=float)
+        normale = normale / np.linalg.norm(normale)
+        self.plans.append((nom, normale, float(normale @ np.asarray(point, dtype=float))))
+
+    def ajouter_obstacle(self, nom, A, B, rayon):
+        """ Capsule fixe [A, B] de rayon 'rayon' (sphère si A = B). """
+        self.obstacles.append((nom, np.asarray(A, dtype=float), np.asarray(B, dtype=float), float(rayon)))
+
+    def capsules(self, q):
+        """
+        Extrémités des capsules pour des configurations q (N, 6).
+
+        :return: A, B (N, 7, 3)
+        """
+        q = np.atleast_2d(np.asarray(q, dtype=float))
+        T = calcul_T0i_batch(generate_transformation_matrices_batch(q, self.dh))
+        A = np.zeros((len(q), 7, 3))
+        A[:, 1:] = T[:, :, :3, 3]  # O0 (base) .. O6
+        B = np.empty_like(A)
+        B[:, :6] = A[:, 1:]
+        B[:, 6] = A[:, 6] + self.longueur_outil * T[:, -1, :3, 2]  # Bout de l'outil sur z6
+        return A, B
+
+    def _contacts(self):
+        """ Noms des contacts dans l'ordre des colonnes de distances(). """
+        contacts = [(self.noms[i], self.noms[j]) for i, j in self.paires]
+        for nom, *_ in self.plans:
+            contacts += [(self.noms[k], nom) for k in self.liens_environnement]
+        for nom, *_ in self.obstacles:
+            contacts += [(self.noms[k], nom) for k in self.liens_environnement]
+        return contacts
+
+    def distances(self, q):
+        """
+        Distances exactes (surface à surface, négatives en interpénétration) pour chaque
+        configuration et chaque contact testé.
+
+        :return: distances (N, nb_contacts), contacts (liste de couples de noms)
+        """
+        A, B = self.capsules(q)
+        contacts = self._contacts()
+        n, k = np.indices((len(A), len(contacts))).reshape(2, -1)
+        return self._distances_contacts(A, B, n, k).reshape(len(A), len(contacts)), contacts
+
+    def _candidats(self, A, B, marge):
+        """
+        Pré-passe par sphères englobantes (une par capsule) : masque (N, nb_contacts) des contacts
+        dont la distance peut être inférieure à 'marge' (les autres sont sûrement dégagés).
+        """
+        centres = 0.5 * (A + B)
+        ecart = B - A
+        rayons = 0.5 * np.sqrt(np.einsum('nki,nki->nk', ecart, ecart)) + self.rayons
+
+        # Comparaison des carrés : pas de racine pour les paires
+        i, j = self.paires[:, 0], self.paires[:, 1]
+        ecart = centres[:, i] - centres[:, j]
+        seuil = np.maximum(rayons[:, i] + rayons[:, j] + marge, 0.0)
+        colonnes = [np.einsum('npi,npi->np', ecart, ecart) <= seuil ** 2]
+
+        liens = self.liens_environnement
+        for _, normale, d in self.plans:
+            colonnes.append(centres[:, liens] @ normale - d - rayons[:, liens] <= marge)
+        for _, P, Q, rayon in self.obstacles:
+            ecart = centres[:, liens] - 0.5 * (P + Q)
+            seuil = np.maximum(rayons[:, liens] + 0.5 * np.linalg.norm(Q - P) + rayon + marge, 0.0)
+            colonnes.append(np.einsum('nli,nli->nl', ecart, ecart) <= seuil ** 2)
+        return np.concatenate(colonnes, axis=1)
+
+    def verifier(self, temps, q, marge=0.0):
+        """
+        Vérifie qu'une trajectoire garde au moins 'marge' (m) de dégagement partout.
+        Distances exactes calculées seulement pour les contacts non écartés par la pré-passe.
+
+        Returns:
+            dict {
+              'sans_collision': bool,
+              'collision': masque (N,) des échantillons à moins de 'marge',
+              'nb_collisions': nombre d'échantillons en collision,
+              'premier_temps', 'premier_contact', 'premiere_distance': premier contact (None sinon),
+              'degagement_min': plus petite distance exacte évaluée (None si tout est écarté),
+              'nb_candidats': nombre de distances exactes évaluées,
+            }
+        """
+        A, B = self.capsules(q)
+        masque = self._candidats(A, B, marge)
+        candidats = np.argwhere(masque)  # (échantillon, contact)
+
+        distances = np.full(masque.shape, np.inf)
+        if len(candidats):
+            n, k = candidats[:, 0], candidats[:, 1]
+            distances[n, k] = self._distances_contacts(A, B, n, k)
+
+        collision_contacts = distances < marge
+        collision = collision_contacts.any(axis=1)
+        lignes = np.flatnonzero(collision)
+
+        rapport = {
+            "sans_collision": len(lignes) == 0,
+            "collision": collision,
+            "nb_collisions": len(lignes),
+            "premier_temps": None,
+            "premier_contact": None,
+            "premiere_distance": None,
+            "degagement_min": float(distances.min()) if len(candidats) else None,
+            "nb_candidats": len(candidats),
+        }
+        if len(lignes) > 0:
+            i = lignes[0]
+            k = int(np.argmin(distances[i]))
+            rapport["premier_temps"] = float(np.asarray(temps)[i])
+            rapport["premier_contact"] = self._contacts()[k]
+            rapport["premiere_distance"] = float(distances[i, k])
+        return rapport
+
+    def _distances_contacts(self, A, B, n, k):
+        """ Distances exactes pour les couples (échantillon n, contact k), vectorisées par type de contact. """
+        nb_paires = len(self.paires)
+        nb_liens = len(self.liens_environnement)
+        distances = np.empty(len(n))
+
+        # Auto-collisions
+        m = k < nb_paires
+        i, j = self.paires[k[m], 0], self.paires[k[m], 1]
+        distances[m] = (distance_segments(A[n[m], i], B[n[m], i], A[n[m], j], B[n[m], j])
+                        - self.rayons[i] - self.rayons[j])
+
+        # Environnement : contact k -> (élément e, lien)
+        element, lien = np.divmod(np.maximum(k - nb_paires, 0), nb_liens)
+        lien = self.liens_environnement[lien]
+        for e, (_, normale, d) in enumerate(self.plans):
+            # Segment contre plan : la distance signée est minimale à une extrémité
+            m = (k >= nb_paires) & (element == e)
+            hauteur = np.minimum(A[n[m], lien[m]] @ normale, B[n[m], lien[m]] @ normale) - d
+            distances[m] = hauteur - self.rayons[lien[m]]
+        for e, (_, P, Q, rayon) in enumerate(self.obstacles, start=len(self.plans)):
+            m = (k >= nb_paires) & (element == e)
+            distances[m] = (distance_segments(A[n[m], lien[m]], B[n[m], lien[m]], P, Q)
+                            - self.rayons[lien[m]] - rayon)
+        return distances
@@ -11,10 +11,101 @@ r6 = 0.082
 
 # Paramètres DH Modifiés (Convention Khalil / Craig)
 # Structure adaptée pour correspondre à tes résultats précédents
-dh = {
-    "a_i_m1":     [0,      0,        a2,     a3,     0,       0      ], # a_{i-1}
-    "alpha_i_m1": [0,      np.pi/2,  0,      0,      np.pi/2, -np.pi/2], # alpha_{i-1}
-    "r_i":        [r1,     -r2,       0,      r4,      r5,      r6     ], # r_i
-    "theta_offset": [np.pi/2, 0,     0,      np.pi/2, 0,      -np.pi/2] # Offsets (q_fig)
+def _dh_ur(r1, r2, a2, a3, r4, r5, r6):
+    """ Paramètres DH modifiés d'un bras UR (même chaîne, dimensions propres à chaque modèle). """
+    return {
+        "a_i_m1":     [0,      0,        a2,     a3,     0,       0      ], # a_{i-1}
+        "alpha_i_m1": [0,      np.pi/2,  0,      0,      np.pi/2, -np.pi/2], # alpha_{i-1}
+        "r_i":        [r1,     -r2,       0,      r4,      r5,      r6     ], # r_i
+        "theta_offset": [np.pi/2, 0,     0,      np.pi/2, 0,      -np.pi/2] # Offsets (q_fig)
+    }
+
+dh = _dh_ur(r1, r2, a2, a3, r4, r5, r6)
+
+
+# Paramètres inertiels UR3 (exprimés dans les repères DH modifiés ci-dessus)
+# Masses constructeur ; centres de masse et inerties approximés par des cylindres
+# (segments 2 et 3 : tubes le long de x_i, de longueur a2 / a3).
+def _inertie_cylindre(m, rayon, longueur, axe):
+    """ Tenseur d'inertie (au centre de masse) d'un cylindre plein d'axe 'axe' (0=x, 2=z). """
+    I_axe = 0.5 * m * rayon ** 2
+    I_perp = m * (3 * rayon ** 2 + longueur ** 2) / 12
+    diag = [I_perp, I_perp, I_perp]
+    diag[axe] = I_axe
+    return np.diag(diag)
+
+inertie = {
+    "masse": [2.0, 3.42, 1.26, 0.8, 0.8, 0.35],
+    "centre_masse": [                      # c_i dans le repère i (m)
+        [0, 0, -0.02],
+        [a2 / 2, 0, 0],
+        [a3 / 2, 0, 0],
+        [0, 0, 0],
+        [0, 0, 0],
+        [0, 0, -0.01],
+    ],
+    "tenseur": [                           # I_ci dans le repère i (kg.m²)
+        _inertie_cylindre(2.0, 0.045, 0.10, 2),
+        _inertie_cylindre(3.42, 0.045, a2, 0),
+        _inertie_cylindre(1.26, 0.035, a3, 0),
+        _inertie_cylindre(0.8, 0.035, 0.08, 2),
+        _inertie_cylindre(0.8, 0.035, 0.08, 2),
+        _inertie_cylindre(0.35, 0.035, 0.04, 2),
+    ],
+}
+
+# Modèle de collision UR3 : capsules (segment + rayon, m) entre origines successives des repères DH,
+# du socle (origine du repère de base) à l'outil (prolongement de z6)
+capsules = {
+    "noms": ["socle", "epaule", "bras", "avant_bras", "poignet_1", "poignet_2", "outil"],
+    "rayons": [0.065, 0.045, 0.045, 0.035, 0.032, 0.032, 0.032],
+    "longueur_outil": 0.05,
+    # Paires non adjacentes jamais en contact : distance fixée par la cinématique, ou poignet compact
+    # (r4 = 0.01 : poignet_2 reste à moins de r5 de l'avant-bras, dégagement toujours < 0.016 m)
+    "paires_exclues": [("socle", "bras"), ("poignet_1", "outil"), ("avant_bras", "poignet_2")],
 }
 
+# Couples articulaires maximaux UR3 (N.m) : épaule 56, coude 28, poignets 12
+couples_max = [56.0, 56.0, 28.0, 12.0, 12.0, 12.0]
+
+# Limites articulaires (angles q du MGD, rad) : débattement ±360° sur tous les axes.
+# Accélérations : réglage logiciel (non publié par le constructeur).
+def _limites_ur(vitesse, acceleration):
+    return {
+        "position_min": [-2 * np.pi] * 6,
+        "position_max": [2 * np.pi] * 6,
+        "vitesse": vitesse,
+        "acceleration": acceleration,
+    }
+
+# UR3 : 180°/s (base, épaule, coude) et 360°/s (poignets)
+limites_articulaires = _limites_ur([np.pi, np.pi, np.pi, 2 * np.pi, 2 * np.pi, 2 * np.pi], [15.0] * 6)
+
+# Passage MGD -> PyBullet (URDF constructeur, commun aux bras UR) : q_sim = q_mgd * signes + offsets
+conversion_simulation = {
+    "signes": [1, -1, -1, 1, 1, 1],
+    "offsets": [0, 0, 0, -np.pi / 2, np.pi, 0],
+}
+
+# Registre des modèles : paramètres DH (r2 - r4 = décalage latéral d4 du constructeur),
+# limites, couples max et conversion vers la simulation. Inertie et capsules : UR3 seul.
+modeles_robot = {
+    "UR3": {
+        "dh": dh,
+        "limites": limites_articulaires,
+        "couples_max": couples_max,
+        "simulation": conversion_simulation,
+    },
+    "UR5": {
+        "dh": _dh_ur(0.089159, 0.13585, 0.425, 0.39225, 0.0267, 0.09465, 0.0823),
+        "limites": _limites_ur([np.pi] * 6, [15.0] * 6),
+        "couples_max": [150.0, 150.0, 150.0, 28.0, 28.0, 28.0],
+        "simulation": conversion_simulation,
+    },
+    "UR10": {
+        "dh": _dh_ur(0.1273, 0.220941, 0.612, 0.5723, 0.057, 0.1157, 0.0922),
+        "limites": _limites_ur([2 * np.pi / 3, 2 * np.pi / 3, np.pi, np.pi, np.pi, np.pi], [10.0] * 6),
+        "couples_max": [330.0, 330.0, 150.0, 54.0, 54.0, 54.0],
+        "simulation": conversion_simulation,
+    },
+}
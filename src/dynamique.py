@@ -0,0 +1,133 @@
+import numpy as np
+
+from src.const_v import dh, inertie, couples_max
+from src.matrice_tn import generate_transformation_matrices_batch
+
+
+def _RT(R, v):
+    """ R^T . v pour des lots (N, 3, 3) x (N, 3). """
+    return np.einsum('nji,nj->ni', R, v)
+
+
+def _R(R, v):
+    """ R . v pour des lots (N, 3, 3) x (N, 3). """
+    return np.einsum('nij,nj->ni', R, v)
+
+
+def rnea_batch(q, qp, qpp, dh_params=dh, inertie_params=inertie, gravite=9.81):
+    """
+    Modèle dynamique inverse (Newton-Euler récursif, convention DH modifiée) :
+    q, q̇, q̈ -> couples articulaires τ, calculé pour toute une trajectoire en un appel.
+
+    Récurrence avant (base -> outil) : vitesses / accélérations de chaque segment,
+    la gravité étant prise en compte par une accélération fictive de la base (0, 0, +g).
+    Récurrence arrière (outil -> base) : efforts transmis, τ_i = n_i . z_i.
+
+    Args:
+        q, qp, qpp: tableaux (N, 6) (convention MGD).
+
+    Returns:
+        tau: tableau (N, 6) en N.m
+    """
+    q = np.atleast_2d(np.asarray(q, dtype=float))
+    qp = np.atleast_2d(np.asarray(qp, dtype=float))
+    qpp = np.atleast_2d(np.asarray(qpp, dtype=float))
+    N, nb_axes = q.shape
+
+    mats = generate_transformation_matrices_batch(q, dh_params)
+    R = mats[:, :, :3, :3]  # ^{i-1}R_i
+    P = mats[:, :, :3, 3]   # ^{i-1}P_i
+
+    masses = inertie_params["masse"]
+    centres = np.asarray(inertie_params["centre_masse"], dtype=float)
+    tenseurs = np.asarray(inertie_params["tenseur"], dtype=float)
+
+    z = np.array([0.0, 0.0, 1.0])
+    w = np.zeros((N, 3))
+    wd = np.zeros((N, 3))
+    vd = np.tile([0.0, 0.0, gravite], (N, 1))
+
+    F = np.zeros((N, nb_axes, 3))
+    Nm = np.zeros((N, nb_axes, 3))
+
+    # 1. Récurrence avant
+    for i in range(nb_axes):
+        Ri, Pi = R[:, i], P[:, i]
+        w_rel = _RT(Ri, w)
+        w_i = w_rel + qp[:, i, None] * z
+        wd_i = _RT(Ri, wd) + np.cross(w_rel, qp[:, i, None] * z) + qpp[:, i, None] * z
+        vd_i = _RT(Ri, np.cross(wd, Pi) + np.cross(w, np.cross(w, Pi)) + vd)
+
+        c = centres[i]
+        vd_c = np.cross(wd_i, c) + np.cross(w_i, np.cross(w_i, c)) + vd_i
+
+        F[:, i] = masses[i] * vd_c
+        Nm[:, i] = wd_i @ tenseurs[i].T + np.cross(w_i, w_i @ tenseurs[i].T)
+
+        w, wd, vd = w_i, wd_i, vd_i
+
+    # 2. Récurrence arrière
+    tau = np.zeros((N, nb_axes))
+    f = np.zeros((N, 3))
+    n = np.zeros((N, 3))
+    for i in reversed(range(nb_axes)):
+        if i < nb_axes - 1:
+            Rf = _R(R[:, i + 1], f)
+            n = Nm[:, i] + _R(R[:, i + 1], n) + np.cross(centres[i], F[:, i]) + np.cross(P[:, i + 1], Rf)
+            f = Rf + F[:, i]
+        else:
+            n = Nm[:, i] + np.cross(centres[i], F[:, i])
+            f = F[:, i]
+        tau[:, i] = n[:, 2]
+
+    return tau
+
+
+def matrice_inertie_batch(q, dh_params=dh, inertie_params=inertie):
+    """
+    Matrice d'inertie M(q) (N, 6, 6) par RNEA sans gravité ni vitesse :
+    la colonne j est le couple produit par q̈ = e_j.
+    """
+    q = np.atleast_2d(np.asarray(q, dtype=float))
+    N, nb_axes = q.shape
+    zeros = np.zeros_like(q)
+
+    M = np.zeros((N, nb_axes, nb_axes))
+    for j in range(nb_axes):
+        qpp = np.zeros_like(q)
+        qpp[:, j] = 1.0
+        M[:, :, j] = rnea_batch(q, zeros, qpp, dh_params, inertie_params, gravite=0.0)
+    return M
+
+
+def verifier_couples(temps, tau, limites=couples_max):
+    """
+    Vérifie que les couples d'une trajectoire restent dans les limites |τ_i| <= τ_max,i.
+
+    Returns:
+        dict {
+          'faisable': bool,
+          'depassement': masque (N, 6) des échantillons hors limites,
+          'nb_depassements': nombre d'échantillons (lignes) hors limites,
+          'premier_temps', 'premier_axe': premier dépassement (None si faisable),
+          'marge': τ_max - max|τ| par axe (négative si dépassement),
+        }
+    """
+    limites = np.asarray(limites, dtype=float)
+    abs_tau = np.abs(tau)
+    depassement = abs_tau > limites
+    lignes = np.flatnonzero(depassement.any(axis=1))
+
+    rapport = {
+        "faisable": len(lignes) == 0,
+        "depassement": depassement,
+        "nb_depassements": len(lignes),
+        "premier_temps": None,
+        "premier_axe": None,
+        "marge": limites - abs_tau.max(axis=0),
+    }
+    if len(lignes) > 0:
+        i = lignes[0]
+        rapport["premier_temps"] = float(np.asarray(temps)[i])
+        rapport["premier_axe"] = int(np.argmax(depassement[i]))  # Indice 0..5
+    return rapport
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diffusion de consignes articulaires vers un contrôleur temps réel (type UR) par socket.
+
+  - ServeurControleur : remplaçant local du contrôleur. À cadence fixe (125 à 500 Hz),
+    il consomme une consigne de sa file et renvoie un paquet d'état, qu'une consigne
+    soit disponible ou non (tick sans consigne = famine).
+  - ClientFlux : client asyncio qui envoie les consignes de traj() en gardant au plus
+    'anticipation' consignes non consommées côté contrôleur (contre-pression par les
+    acquittements des paquets d'état, et par writer.drain() côté socket).
+
+Le couple client / serveur mesure la latence aller-retour, la gigue d'arrivée des
+paquets d'état, les paquets en retard et les famines, pour évaluer la chaîne de
+diffusion sur une seule machine Linux.
+
+Paquets (little-endian) :
+  consigne : seq (int32), t_envoi (float64), q (6 float64), qp (6 float64)
+  état     : creneau, seq_consomme, seq_recu (int32), t_envoi_echo, delai_serveur,
+             t_serveur (float64), q (6 float64)
+La latence aller-retour est t_reception - t_envoi_echo - delai_serveur : seules des
+différences d'instants pris sur une même horloge interviennent.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import struct
+import time
+from collections import deque
+
+import numpy as np
+
+from src.ordonnanceur import OrdonnanceurPeriodique
+
+NB_AXES = 6
+FORMAT_CONSIGNE = struct.Struct(f"<id{NB_AXES}d{NB_AXES}d")
+FORMAT_ETAT = struct.Struct(f"<iiiddd{NB_AXES}d")
+
+
+def _percentiles(valeurs, prefixe):
+    """ p50 / p99 / max d'une série (en s), vides si la série est vide. """
+    if len(valeurs) == 0:
+        return {f"{prefixe}_p50": None, f"{prefixe}_p99": None, f"{prefixe}_max": None}
+    return {f"{prefixe}_p50": float(np.percentile(valeurs, 50)),
+            f"{prefixe}_p99": float(np.percentile(valeurs, 99)),
+            f"{prefixe}_max": float(np.max(valeurs))}
+
+
+class ServeurControleur:
+    """
+    Contrôleur simulé : boucle à cadence fixe, une consigne consommée par tick.
+
+    :param frequence: fréquence de la boucle (Hz).
+    :param capacite: taille de la file de consignes du contrôleur.
+    :param attente_active: fin d'attente en boucle active (voir OrdonnanceurPeriodique).
+    """
+
+    def __init__(self, frequence=500, capacite=256, attente_active=5e-4):
+        self.frequence = frequence
+        self.capacite = capacite
+        self.attente_active = attente_active
+
+        self.port = None
+        self.statistiques = None
+        self._fin = None
+
+    async def servir(self, hote="127.0.0.1", port=0, pret=None):
+        """
+        Attend une connexion, la sert jusqu'à la fin du flux, puis s'arrête.
+
+        :param port: 0 pour un port libre choisi par le système (voir self.port).
+        :param pret: fonction appelée avec le port une fois le serveur à l'écoute.
+        :return: statistiques de la session.
+        """
+        self._fin = asyncio.Event()
+        serveur = await asyncio.start_server(self._session, hote, port)
+        self.port = serveur.sockets[0].getsockname()[1]
+        if pret is not None:
+            pret(self.port)
+
+        await self._fin.wait()
+        serveur.close()
+        await serveur.wait_closed()
+        return self.statistiques
+
+    async def _session(self, reader, writer):
+        writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        file = deque()
+        etat = {"seq_recu": -1, "t_envoi": 0.0, "t_recu": 0.0, "fin_flux": False, "debordements": 0}
+
+        async def lire():
+            try:
+                while True:
+                    paquet = await reader.readexactly(FORMAT_CONSIGNE.size)
+                    t_recu = time.perf_counter()
+                    valeurs = FORMAT_CONSIGNE.unpack(paquet)
+                    if len(file) >= self.capacite:
+                        etat["debordements"] += 1  # Le client ne respecte pas l'anticipation
+                        continue
+                    file.append((valeurs[0], np.array(valeurs[2:2 + NB_AXES])))
+                    etat.update(seq_recu=valeurs[0], t_envoi=valeurs[1], t_recu=t_recu)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                etat["fin_flux"] = True
+
+        lecture = asyncio.ensure_future(lire())
+        ordonnanceur = OrdonnanceurPeriodique(1.0 / self.frequence, politique="sauter",
+                                              attente_active=self.attente_active)
+        q_actuel = np.zeros(NB_AXES)
+        seq_consomme = -1
+        famines = 0
+
+        try:
+            while True:
+                tick = await ordonnanceur.attendre_async()
+
+                if file:
+                    seq_consomme, q_actuel = file.popleft()
+                elif etat["fin_flux"]:
+                    break
+                elif seq_consomme >= 0:
+                    famines += 1  # Flux démarré mais aucune consigne disponible à ce tick
+
+                # Numéro de créneau horaire (les ticks sautés en dépassement comptent)
+                creneau = tick + ordonnanceur.nb_sautes
+                t_serveur = time.perf_counter()
+                writer.write(FORMAT_ETAT.pack(creneau, seq_consomme, etat["seq_recu"], etat["t_envoi"],
+                                              t_serveur - etat["t_recu"], t_serveur, *q_actuel))
+        finally:
+            lecture.cancel()
+            writer.close()
+
+        self.statistiques = {"nb_ticks": ordonnanceur.nb_ticks, "nb_famines": famines,
+                             "nb_debordements": etat["debordements"],
+                             "cadence": ordonnanceur.statistiques()}
+        self._fin.set()
+
+
+class ClientFlux:
+    """
+    Client de diffusion des consignes avec file d'anticipation bornée.
+
+    :param anticipation: nombre maximal de consignes envoyées et non encore consommées.
+    :param frequence: fréquence attendue des paquets d'état (Hz), pour la gigue.
+    :param seuil_retard: retard (s) au-delà duquel un paquet d'état est compté en retard
+                         (défaut : une demi-période).
+    """
+
+    def __init__(self, anticipation=16, frequence=500, seuil_retard=None):
+        if anticipation < 1:
+            raise ValueError("L'anticipation doit être au moins de 1 consigne.")
+        self.anticipation = anticipation
+        self.frequence = frequence
+        self.seuil_retard = 0.5 / frequence if seuil_retard is None else seuil_retard
+
+    async def diffuser(self, hote, port, q, qp):
+        """
+        Envoie toutes les consignes (q, qp) et attend leur consommation.
+
+        :return: dict de statistiques (latence, gigue, retards, durée).
+        """
+        q = np.asarray(q, dtype=float)
+        qp = np.asarray(qp, dtype=float)
+        N = len(q)
+
+        reader, writer = await asyncio.open_connection(hote, port)
+        writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        acquitte = -1
+        place_libre = asyncio.Event()
+        rtt = np.full(N, np.nan)
+        creneaux, arrivees = [], []
+
+        async def recevoir():
+            nonlocal acquitte
+            while acquitte < N - 1:
+                paquet = await reader.readexactly(FORMAT_ETAT.size)
+                t_reception = time.perf_counter()
+                creneau, seq_consomme, seq_recu, t_envoi_echo, delai_serveur = FORMAT_ETAT.unpack(paquet)[:5]
+                creneaux.append(creneau)
+                arrivees.append(t_reception)
+
+                if seq_recu >= 0 and np.isnan(rtt[seq_recu]):
+                    rtt[seq_recu] = t_reception - t_envoi_echo - delai_serveur
+                if seq_consomme > acquitte:
+                    acquitte = seq_consomme
+                    place_libre.set()
+
+        async def envoyer():
+            for k in range(N):
+                # Contre-pression : au plus 'anticipation' consignes en attente côté contrôleur
+                while k - acquitte > self.anticipation:
+                    place_libre.clear()
+                    await place_libre.wait()
+                writer.write(FORMAT_CONSIGNE.pack(k, time.perf_counter(), *q[k], *qp[k]))
+                await writer.drain()
+
+        t0 = time.perf_counter()
+        await asyncio.gather(envoyer(), recevoir())
+        duree = time.perf_counter() - t0
+        writer.close()
+
+        # Gigue : écart des arrivées à l'horaire idéal creneau * période (référence : arrivée la plus précoce)
+        creneaux = np.asarray(creneaux)
+        arrivees = np.asarray(arrivees)
+        ecarts = (arrivees - arrivees[0]) - (creneaux - creneaux[0]) / self.frequence
+        retards = ecarts - ecarts.min()
+
+        statistiques = {"nb_consignes": N, "nb_etats": len(creneaux), "duree": duree,
+                        "nb_etats_en_retard": int(np.sum(retards > self.seuil_retard)),
+                        "nb_creneaux_sans_etat": int(creneaux[-1] - creneaux[0] + 1 - len(creneaux))}
+        statistiques.update(_percentiles(rtt[~np.isnan(rtt)], "rtt"))
+        statistiques.update(_percentiles(retards, "gigue"))
+        return statistiques
+
+
+def _processus_serveur(frequence, capacite, file_resultats):
+    """ Serveur dans un processus séparé : envoie son port, puis ses statistiques. """
+    serveur = ServeurControleur(frequence, capacite)
+    statistiques = asyncio.run(serveur.servir(pret=file_resultats.put))
+    file_resultats.put(statistiques)
+
+
+def banc_flux(q, qp, frequence=500, anticipation=16, capacite=256):
+    """
+    Banc complet sur la machine locale : serveur dans un processus séparé, client ici.
+
+    :return: dict {'client': statistiques client, 'serveur': statistiques serveur}
+    """
+    contexte = multiprocessing.get_context("spawn")
+    file_resultats = contexte.Queue()
+    processus = contexte.Process(target=_processus_serveur, args=(frequence, capacite, file_resultats))
+    processus.start()
+
+    try:
+        port = file_resultats.get(timeout=30)
+        client = ClientFlux(anticipation, frequence)
+        stats_client = asyncio.run(client.diffuser("127.0.0.1", port, q, qp))
+        stats_serveur = file_resultats.get(timeout=30)
+    finally:
+        processus.join(timeout=5)
+        if processus.is_alive():
+            processus.terminate()
+
+    return {"client": stats_client, "serveur": stats_serveur}
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Banc de diffusion des consignes traj() vers un contrôleur simulé")
+    parser.add_argument("--frequence", type=float, default=500, help="Cadence du contrôleur (Hz)")
+    parser.add_argument("--anticipation", type=int, default=16, help="Consignes en attente max côté contrôleur")
+    args = parser.parse_args(args)
+
+    from src.part4_generation_articulaire import traj
+
+    temps, q, qp, _ = traj([0.25, -0.15, 0.5], 0.1, 0.05, dt=1.0 / args.frequence)
+    print(f"{len(temps)} consignes à {args.frequence:.0f} Hz ({temps[-1]:.1f} s)")
+
+    resultats = banc_flux(q, qp, args.frequence, args.anticipation)
+    client, serveur = resultats["client"], resultats["serveur"]
+    print(f" -> Durée : {client['duree']:.2f} s, {client['nb_etats']} paquets d'état reçus")
+    print(f" -> Latence aller-retour : p50 {client['rtt_p50'] * 1e3:.3f} ms, "
+          f"p99 {client['rtt_p99'] * 1e3:.3f} ms, max {client['rtt_max'] * 1e3:.3f} ms")
+    print(f" -> Gigue d'arrivée : p50 {client['gigue_p50'] * 1e3:.3f} ms, p99 {client['gigue_p99'] * 1e3:.3f} ms, "
+          f"{client['nb_etats_en_retard']} paquets en retard")
+    print(f" -> Contrôleur : {serveur['cadence']['frequence_reelle']:.1f} Hz tenus, "
+          f"{serveur['nb_famines']} ticks sans consigne, {serveur['nb_debordements']} débordements")
+
+
+if __name__ == "__main__":
+    main()
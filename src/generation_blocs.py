@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Génération de trajectoires longues par blocs, à mémoire bornée.
+
+traj() matérialise toute la base de temps et tous les tableaux (N, 6) en float64 :
+pour un programme de plusieurs heures à haute fréquence, cela représente des Go.
+Ici l'axe du temps est parcouru par fenêtres de taille fixe ; pour chaque bloc :
+  - la consigne opérationnelle n'est évaluée que sur les instants du bloc,
+  - le MGI repart de la dernière solution du bloc précédent,
+  - qpp (gradient de qp) utilise le dernier qp du bloc précédent et un échantillon
+    d'anticipation, repris ensuite comme premier échantillon du bloc suivant,
+puis le bloc est écrit sur disque et libéré. Le résultat est identique à celui
+d'un calcul d'un seul tenant.
+
+Les fichiers suivent le format de la télémétrie (index.json + bloc_XXXXX.npz) :
+charger_telemetrie() les relit et src.pybullet.rejeu les rejoue.
+
+Option float32 : q, qp et qpp sont stockés en float32 (le temps reste en float64,
+sa résolution en float32 dépasserait dt au bout de quelques heures). Pour chaque bloc,
+l'erreur d'arrondi est mesurée contre le float64 : en articulaire, et en position de
+l'outil par MGD ; au-delà de tol_float32, la génération s'arrête en erreur.
+
+Option limites : les limites articulaires sont contrôlées pendant le MGI, la génération
+s'arrête (DepassementLimite) au premier dépassement sans calculer les blocs suivants.
+"""
+import json
+import os
+
+import numpy as np
+
+from src.limites_articulaires import ControleLimites
+from src.matrice_tn import generate_transformation_matrices_batch, calcul_T0i_batch
+from src.part1_loi_mouvement import evaluer_loi_mouvement
+from src.part2_trajectoire_operationnelle import calcul_trajectoire_operationnelle
+from src.part4_generation_articulaire import Q_INIT_DEFAUT, parametres_robot, resoudre_points_articulaires
+from src.trajectoire_composee import planifier_composition, evaluer_composition
+
+CHAMPS = ("temps", "q", "qp", "qpp")
+
+
+def consigne_cercle(O, R, V):
+    """
+    Consigne du cercle V.1 / V.2, évaluable par fenêtres.
+
+    Returns:
+        duree, evaluer (fonction temps -> X, dX)
+    """
+    _, _, _, (_, _, tf) = evaluer_loi_mouvement(np.zeros(0), R, V)  # Temps de commutation seuls
+
+    def evaluer(temps):
+        s, s_dot, s_ddot, _ = evaluer_loi_mouvement(temps, R, V)
+        X, dX, _ = calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot)
+        return X, dX
+
+    return tf, evaluer
+
+
+def consigne_composee(segments, V, A=0.25, fusion=1.0):
+    """
+    Consigne d'un programme multi-segments (voir trajectoire_composee), évaluable par fenêtres.
+
+    Returns:
+        duree, evaluer (fonction temps -> X, dX)
+    """
+    plan = planifier_composition(segments, V, A, fusion)
+
+    def evaluer(temps):
+        X, dX, _ = evaluer_composition(plan, temps)
+        return X, dX
+
+    return plan["duree"], evaluer
+
+
+def _position_outil(q, dh_params):
+    """ Position de l'outil (N, 3) par MGD vectorisé. """
+    return calcul_T0i_batch(generate_transformation_matrices_batch(q, dh_params))[:, -1, :3, 3]
+
+
+def generer_par_blocs(consigne, dossier, dt=0.005, taille_bloc=20000, float32=False, tol_float32=1e-6,
+                      q_init=None, limites=None, robot=None, Debug=False):
+    """
+    Génère la trajectoire articulaire d'une consigne bloc par bloc et l'écrit dans 'dossier'.
+
+    Args:
+        consigne: (duree, evaluer) renvoyé par consigne_cercle() ou consigne_composee().
+        dt (s): période d'échantillonnage demandée (même base de temps que traj()).
+        taille_bloc: nombre d'échantillons par bloc (borne la mémoire utilisée).
+        float32: stocke q, qp, qpp en float32.
+        tol_float32 (m): erreur de position de l'outil tolérée par le stockage float32.
+        q_init: graine du premier MGI (par défaut Q_INIT_DEFAUT).
+        limites: limites articulaires contrôlées pendant le calcul (ex. const_v.limites_articulaires).
+        robot: nom du modèle ou ModeleRobot (UR3 par défaut) ; comme pour traj(), un robot donné
+               apporte ses paramètres DH et, si limites est None, ses limites.
+
+    Returns:
+        index (dict écrit dans index.json) : blocs, erreurs de suivi et d'arrondi par bloc.
+    """
+    duree, evaluer = consigne
+    N = int(duree / dt) + 1
+    if N < 2:
+        raise ValueError(f"Trajectoire trop courte ({duree:.3g} s) pour dt = {dt} s.")
+    if taille_bloc < 1:
+        raise ValueError("taille_bloc doit être au moins de 1 échantillon.")
+    pas = duree / (N - 1)  # Même base de temps que np.linspace(0, duree, N)
+    dh_params, limites = parametres_robot(robot, limites)
+
+    os.makedirs(dossier, exist_ok=True)
+    type_stockage = np.float32 if float32 else np.float64
+    index = {"nb_axes": 6, "champs": list(CHAMPS), "nb_echantillons": 0, "blocs": [],
+             "dt": pas, "duree": duree, "type": np.dtype(type_stockage).name}
+
+    # État transmis d'un bloc au suivant
+    q_prev = np.array(Q_INIT_DEFAUT if q_init is None else q_init, dtype=float)
+    qp_avant = None  # qp de l'échantillon précédant le bloc
+    anticipe = None  # (q, qp) du premier échantillon du bloc, calculé par le bloc précédent
+    controle = None if limites is None else ControleLimites(pas, limites)
+
+    for i0 in range(0, N, taille_bloc):
+        i1 = min(i0 + taille_bloc, N)
+        j1 = min(i1 + 1, N)  # Un échantillon d'anticipation pour le gradient en fin de bloc
+
+        temps = np.arange(i0, j1) * pas
+        if j1 == N:
+            temps[-1] = duree
+        X, dX = evaluer(temps)
+
+        q = np.empty((j1 - i0, 6))
+        qp = np.empty((j1 - i0, 6))
+        debut = 0
+        if anticipe is not None:
+            q[0], qp[0] = anticipe
+            debut = 1
+        q_prev = resoudre_points_articulaires(X[debut:], dX[debut:], q[debut:], qp[debut:], q_prev, Debug=Debug,
+                                             controle=controle, dh_params=dh_params)
+
+        # qpp : mêmes différences (centrées / décentrées aux extrémités) que np.gradient sur toute la trajectoire
+        etendu = qp if qp_avant is None else np.vstack((qp_avant, qp))
+        qpp = np.gradient(etendu, pas, axis=0)[len(etendu) - len(qp):]
+
+        n = i1 - i0
+        if controle is not None and j1 == N:
+            controle.terminer()
+        anticipe = (q[n], qp[n]) if j1 > i1 else None
+        qp_avant = qp[n - 1]
+
+        X_robot = _position_outil(q[:n], dh_params)
+        bloc = {"temps": temps[:n], "q": q[:n].astype(type_stockage),
+                "qp": qp[:n].astype(type_stockage), "qpp": qpp[:n].astype(type_stockage)}
+        description = {"fichier": f"bloc_{len(index['blocs']):05d}.npz", "n": n,
+                       "t_debut": float(temps[0]), "t_fin": float(temps[n - 1]),
+                       "erreur_position_max": float(np.max(np.linalg.norm(X[:n] - X_robot, axis=1)))}
+
+        if float32:
+            # Erreur d'arrondi mesurée contre le calcul float64
+            erreur_X = np.linalg.norm(_position_outil(bloc["q"].astype(np.float64), dh_params) - X_robot, axis=1)
+            description.update(erreur_q_float32=float(np.max(np.abs(bloc["q"] - q[:n]))),
+                               erreur_X_float32=float(np.max(erreur_X)))
+            if description["erreur_X_float32"] > tol_float32:
+                raise ValueError(f"Bloc {len(index['blocs'])} : erreur de position due au float32 "
+                                 f"({description['erreur_X_float32']:.3e} m) au-delà de {tol_float32:.1e} m ; "
+                                 f"stockez en float64.")
+
+        np.savez(os.path.join(dossier, description["fichier"]), **bloc)
+        index["blocs"].append(description)
+        index["nb_echantillons"] += n
+        with open(os.path.join(dossier, "index.json"), "w") as f:
+            json.dump(index, f, indent=1)  # Index à jour après chaque bloc : exploitable si interrompu
+
+        if Debug: print(f"Bloc {len(index['blocs'])} : t = {temps[0]:.2f} .. {temps[n - 1]:.2f} s")
+
+    return index
+
+
+def traj_par_blocs(O, R, V, dossier, dt=0.005, **options):
+    """ Équivalent de traj(O, R, V) par blocs (options : voir generer_par_blocs). """
+    return generer_par_blocs(consigne_cercle(O, R, V), dossier, dt, **options)
+
+
+def iterer_blocs(dossier):
+    """ Parcourt les blocs d'un dossier un par un (dict {champ: tableau}), sans tout charger. """
+    with open(os.path.join(dossier, "index.json")) as f:
+        index = json.load(f)
+    for bloc in index["blocs"]:
+        with np.load(os.path.join(dossier, bloc["fichier"])) as donnees:
+            yield {champ: donnees[champ] for champ in index["champs"]}
@@ -0,0 +1,121 @@
+"""
+Instrumentation optionnelle du pipeline traj() : durées par étape et compteurs
+(itérations MGI, échecs, replis sur q_prev, ...).
+
+Désactivée par défaut. Deux formes de points de mesure :
+  - @chronometre("nom") sur les fonctions d'étape (appelées une fois par trajectoire) :
+    une fois désactivée, le coût est un test de booléen par appel ;
+  - dans les boucles chaudes (itérations MGI, points de trajectoire), un test explicite
+    'if instrumentation.ACTIF:' autour des mesures : rien n'est mesuré ni alloué
+    quand l'instrumentation est désactivée.
+
+Usage :
+    instrumentation.activer()
+    traj(O, R, V)
+    print(instrumentation.rapport())
+"""
+import functools
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+ACTIF = False
+_DUREES = defaultdict(list)
+_COMPTEURS = Counter()
+
+
+def activer(reinitialiser_mesures=True):
+    """ Active les mesures (en repartant de zéro par défaut). """
+    global ACTIF
+    if reinitialiser_mesures:
+        reinitialiser()
+    ACTIF = True
+
+
+def desactiver():
+    global ACTIF
+    ACTIF = False
+
+
+def reinitialiser():
+    """ Efface les durées et compteurs enregistrés. """
+    _DUREES.clear()
+    _COMPTEURS.clear()
+
+
+def compter(nom, n=1):
+    """ Incrémente le compteur 'nom' (sans effet si désactivé). """
+    if ACTIF:
+        _COMPTEURS[nom] += n
+
+
+def enregistrer_duree(nom, duree):
+    """ Ajoute une durée (s) à l'étape 'nom' (sans effet si désactivé). """
+    if ACTIF:
+        _DUREES[nom].append(duree)
+
+
+def chronometre(nom):
+    """ Décorateur : durée de chaque appel de la fonction, enregistrée sous 'nom'. """
+    def decorateur(fonction):
+        @functools.wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            if not ACTIF:
+                return fonction(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                _DUREES[nom].append(time.perf_counter() - t0)
+        return enveloppe
+    return decorateur
+
+
+class RapportInstrumentation:
+    """
+    Résumé des mesures :
+      - etapes[nom] = {'nb', 'total', 'moyenne', 'p50', 'p99', 'max', 'histogramme': (effectifs, bornes)}
+        (durées en s, classes logarithmiques),
+      - compteurs[nom] = valeur.
+    """
+
+    def __init__(self, durees, compteurs, nb_classes=20):
+        self.etapes = {}
+        for nom, valeurs in durees.items():
+            valeurs = np.asarray(valeurs)
+            bas, haut = valeurs.min(), valeurs.max()
+            bornes = np.geomspace(bas, haut, nb_classes + 1) if 0 < bas < haut else nb_classes
+            self.etapes[nom] = {
+                "nb": len(valeurs),
+                "total": float(valeurs.sum()),
+                "moyenne": float(valeurs.mean()),
+                "p50": float(np.percentile(valeurs, 50)),
+                "p99": float(np.percentile(valeurs, 99)),
+                "max": float(haut),
+                "histogramme": np.histogram(valeurs, bins=bornes),
+            }
+        self.compteurs = dict(compteurs)
+
+    def en_dict(self):
+        """ Version sérialisable en JSON (histogrammes en listes). """
+        etapes = {}
+        for nom, stats in self.etapes.items():
+            effectifs, bornes = stats["histogramme"]
+            etapes[nom] = dict(stats, histogramme={"effectifs": effectifs.tolist(), "bornes": bornes.tolist()})
+        return {"etapes": etapes, "compteurs": self.compteurs}
+
+    def __str__(self):
+        lignes = [f"{'Étape':<28}{'Appels':>8}{'Total (ms)':>12}{'Moy. (µs)':>12}{'p99 (µs)':>12}"]
+        for nom, stats in sorted(self.etapes.items(), key=lambda e: -e[1]["total"]):
+            lignes.append(f"{nom:<28}{stats['nb']:>8}{stats['total'] * 1e3:>12.2f}"
+                          f"{stats['moyenne'] * 1e6:>12.1f}{stats['p99'] * 1e6:>12.1f}")
+        if self.compteurs:
+            lignes.append("")
+            lignes.extend(f"{nom:<28}{valeur:>8}" for nom, valeur in sorted(self.compteurs.items()))
+        return "\n".join(lignes)
+
+
+def rapport(nb_classes=20):
+    """ Rapport des mesures enregistrées depuis la dernière réinitialisation. """
+    return RapportInstrumentation(_DUREES, _COMPTEURS, nb_classes)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Limites articulaires (position, vitesse, accélération) des trajectoires q, qp, qpp.
+
+- verifier_limites() : contrôle d'une trajectoire complète en une passe numpy
+  (premier dépassement, axe, marges par axe).
+- ControleLimites : même contrôle échantillon par échantillon, branché dans la boucle
+  du MGI (resoudre_points_articulaires) ; lève DepassementLimite au premier dépassement,
+  sans attendre la fin du calcul. L'accélération de l'échantillon i-1 est contrôlée dès
+  que qp[i] est connu, avec les mêmes différences que np.gradient : les deux contrôles
+  donnent le même premier dépassement.
+
+Le MGI renvoie des angles dans [-pi, pi] : la position est contrôlée sur q déroulé
+(utils.derouler_angles), seule façon de voir un axe sortir de +/- 2 pi. qp venant du MDI,
+il ne voit pas les discontinuités de q (changement de branche du MGI) : le « saut »
+|q[i] - q[i-1]| (q déroulé) est donc borné par qp_max * dt.
+"""
+import numpy as np
+
+from src.const_v import limites_articulaires
+from src.utils import derouler_angles
+
+# Ordre de priorité au sein d'un échantillon (l'accélération de i n'est connue qu'avec qp[i+1])
+GRANDEURS = ("position", "vitesse", "saut", "acceleration")
+_LIBELLES = {"position": "position", "vitesse": "vitesse", "saut": "saut articulaire",
+             "acceleration": "accélération"}
+
+
+class DepassementLimite(ValueError):
+    """ Limite articulaire dépassée pendant le calcul d'une trajectoire. """
+
+    def __init__(self, grandeur, indice, temps, axe, valeur, limite):
+        self.grandeur = grandeur
+        self.indice = indice
+        self.temps = temps
+        self.axe = axe
+        self.valeur = valeur
+        self.limite = limite
+        super().__init__(f"Limite en {_LIBELLES[grandeur]} dépassée à t = {temps:.3f} s (échantillon {indice}), "
+                         f"axe {axe + 1} : {valeur:.4g} pour une limite de {limite:.4g}.")
+
+
+def _bornes(limites):
+    """ Limites converties en tableaux (6,) : position min / max, vitesse, accélération. """
+    return tuple(np.asarray(limites[cle], dtype=float)
+                 for cle in ("position_min", "position_max", "vitesse", "acceleration"))
+
+
+def _marges_position(q, q_min, q_max):
+    """ Distance à la butée la plus proche (négative hors débattement). """
+    return np.minimum(q_max - q, q - q_min)
+
+
+def verifier_limites(temps, q, qp, qpp, limites=limites_articulaires):
+    """
+    Vérifie qu'une trajectoire respecte les limites articulaires
+    (q_min <= q <= q_max sur q déroulé, |qp| <= qp_max, |q[i] - q[i-1]| <= qp_max * dt,
+    |qpp| <= qpp_max).
+
+    Returns:
+        dict {
+          'faisable': bool,
+          'depassement': masque (N, 6) des échantillons hors limites (toutes grandeurs),
+          'nb_depassements': nombre d'échantillons (lignes) hors limites,
+          'premier_temps', 'premier_axe', 'premiere_grandeur', 'premiere_valeur':
+              premier dépassement (None si faisable),
+          'marge': {grandeur: marge minimale par axe (6,), négative si dépassement},
+        }
+    """
+    q_min, q_max, qp_max, qpp_max = _bornes(limites)
+    q = derouler_angles(q)
+
+    # Saut entre échantillons (nul au premier, borné comme le deuxième)
+    pas = np.diff(np.asarray(temps, dtype=float))
+    saut = np.zeros_like(q)
+    saut[1:] = np.diff(q, axis=0)
+    saut_max = qp_max * np.concatenate((pas[:1], pas))[:, None]
+
+    valeurs = (q, qp, saut, qpp)
+    marges = np.stack((_marges_position(q, q_min, q_max), qp_max - np.abs(qp),
+                       saut_max - np.abs(saut), qpp_max - np.abs(qpp)))
+    hors_limites = marges < 0                  # (4, N, 6)
+    depassement = hors_limites.any(axis=0)
+    lignes = np.flatnonzero(depassement.any(axis=1))
+
+    rapport = {
+        "faisable": len(lignes) == 0,
+        "depassement": depassement,
+        "nb_depassements": len(lignes),
+        "premier_temps": None,
+        "premier_axe": None,
+        "premiere_grandeur": None,
+        "premiere_valeur": None,
+        "marge": dict(zip(GRANDEURS, marges.min(axis=1))),
+    }
+    if len(lignes) > 0:
+        i = lignes[0]
+        g = int(np.argmax(hors_limites[:, i].any(axis=1)))  # Ordre : GRANDEURS
+        axe = int(np.argmax(hors_limites[g, i]))
+        rapport["premier_temps"] = float(np.asarray(temps)[i])
+        rapport["premier_axe"] = axe
+        rapport["premiere_grandeur"] = GRANDEURS[g]
+        rapport["premiere_valeur"] = float(valeurs[g][i, axe])
+    return rapport
+
+
+class ControleLimites:
+    """
+    Contrôle incrémental des limites, appelé sur chaque échantillon (q_i, qp_i) dans l'ordre.
+    Conserve les deux derniers qp pour l'accélération et le dernier q déroulé (correction
+    de 2 pi cumulée, comme np.unwrap) ; terminer() contrôle le dernier échantillon.
+
+    :param dt: période d'échantillonnage (s), celle de np.gradient(qp, dt).
+    :param limites: dict du type const_v.limites_articulaires.
+    :param t0: instant du premier échantillon (pour les messages).
+    """
+
+    def __init__(self, dt, limites=limites_articulaires, t0=0.0):
+        self.dt = dt
+        self.t0 = t0
+        self.q_min, self.q_max, self.qp_max, self.qpp_max = _bornes(limites)
+        self.n = 0
+        self.qp_avant = None     # qp[n-2]
+        self.qp_dernier = None   # qp[n-1]
+        self.q_brut = None       # q[n-1] tel que renvoyé par le MGI
+        self.q_deroule = None    # q[n-1] déroulé
+        self.correction = 0.0    # Multiples de 2 pi cumulés
+
+    def _controler(self, grandeur, indice, valeurs, marges, limites):
+        if np.any(marges < 0):
+            axe = int(np.argmax(marges < 0))
+            raise DepassementLimite(grandeur, indice, self.t0 + indice * self.dt, axe,
+                                    float(valeurs[axe]), float(limites[axe]))
+
+    def _controler_acceleration(self, indice, qpp):
+        self._controler("acceleration", indice, qpp, self.qpp_max - np.abs(qpp), self.qpp_max)
+
+    def _derouler(self, q):
+        """ q déroulé par rapport à l'échantillon précédent (mêmes opérations que np.unwrap). """
+        if self.q_brut is not None:
+            ecart = q - self.q_brut
+            ecart_mod = np.mod(ecart + np.pi, 2 * np.pi) - np.pi
+            ecart_mod[(ecart_mod == -np.pi) & (ecart > 0)] = np.pi
+            correction = ecart_mod - ecart
+            correction[np.abs(ecart) < np.pi] = 0
+            self.correction = self.correction + correction
+        return q + self.correction
+
+    def __call__(self, q, qp):
+        """
+        Contrôle l'accélération de l'échantillon n-1, puis l'échantillon n (position, vitesse, saut) :
+        dans l'ordre des échantillons, comme verifier_limites().
+        """
+        i = self.n
+        if i == 1:
+            self._controler_acceleration(0, (qp - self.qp_dernier) / self.dt)
+        elif i >= 2:
+            self._controler_acceleration(i - 1, (qp - self.qp_avant) / (2. * self.dt))
+
+        q = np.asarray(q, dtype=float)
+        q_deroule = self._derouler(q)
+        q_limite = np.where(q_deroule > self.q_max, self.q_max, self.q_min)
+        self._controler("position", i, q_deroule, _marges_position(q_deroule, self.q_min, self.q_max), q_limite)
+        self._controler("vitesse", i, qp, self.qp_max - np.abs(qp), self.qp_max)
+        if i >= 1:
+            saut = q_deroule - self.q_deroule
+            self._controler("saut", i, saut, self.qp_max * self.dt - np.abs(saut), self.qp_max * self.dt)
+
+        self.qp_avant, self.qp_dernier = self.qp_dernier, np.array(qp, dtype=float)
+        self.q_brut, self.q_deroule = q.copy(), q_deroule
+        self.n += 1
+
+    def terminer(self):
+        """ Accélération du dernier échantillon (différence décentrée, comme np.gradient). """
+        if self.n >= 2:
+            self._controler_acceleration(self.n - 1, (self.qp_dernier - self.qp_avant) / self.dt)
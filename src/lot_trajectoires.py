@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Génération de trajectoires par lots, sans affichage (nœud de calcul).
+
+Les jobs sont lus dans un fichier JSON ou CSV, répartis entre plusieurs processus,
+et chaque trajectoire est écrite dans un fichier .npz compressé (temps, q, qp, qpp
+et paramètres du job). Un tableau récapitulatif est affiché en fin de lot.
+
+Formats des jobs :
+  - JSON : liste d'objets {"nom": .., "O": [Ox, Oy, Oz], "R": .., "V": .., "dt": ..}
+           (ou {"jobs": [...]}) ;
+  - CSV  : en-tête nom,Ox,Oy,Oz,R,V[,dt].
+"nom" et "dt" sont facultatifs (défauts : job_0000, ... et 0.005 s).
+
+Exemple :
+    ur3-traj jobs.csv --sortie trajectoires --workers 8
+    python -m src.lot_trajectoires jobs.json --resume resume.json
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.calcul import (traj, calcul_loi_mouvement, calcul_trajectoire_operationnelle,
+                        calcul_X_robot_et_erreurs)
+
+DT_DEFAUT = 0.005
+
+
+def _normaliser_job(brut, k, source):
+    """ Job lu (dict JSON ou ligne CSV) -> {"nom", "O", "R", "V", "dt"} validé. """
+    try:
+        if "O" in brut:
+            O = [float(c) for c in brut["O"]]
+        else:
+            O = [float(brut["Ox"]), float(brut["Oy"]), float(brut["Oz"])]
+        R, V = float(brut["R"]), float(brut["V"])
+        dt = float(brut.get("dt") or DT_DEFAUT)
+    except KeyError as e:
+        raise ValueError(f"{source}, job {k} : champ {e} manquant.")
+    except (TypeError, ValueError):
+        raise ValueError(f"{source}, job {k} : valeur non numérique ({brut}).")
+
+    if len(O) != 3:
+        raise ValueError(f"{source}, job {k} : O doit avoir 3 coordonnées.")
+    if R <= 0 or V <= 0 or dt <= 0:
+        raise ValueError(f"{source}, job {k} : R, V et dt doivent être strictement positifs.")
+
+    nom = str(brut.get("nom") or f"job_{k:04d}")
+    if os.sep in nom or nom in (".", ".."):
+        raise ValueError(f"{source}, job {k} : nom invalide '{nom}'.")
+    return {"nom": nom, "O": O, "R": R, "V": V, "dt": dt}
+
+
+def lire_jobs(chemin):
+    """
+    Lit un fichier de jobs (.json ou .csv).
+
+    :return: liste de jobs {"nom", "O", "R", "V", "dt"}
+    """
+    extension = os.path.splitext(chemin)[1].lower()
+    if extension == ".json":
+        with open(chemin) as f:
+            bruts = json.load(f)
+        if isinstance(bruts, dict):
+            bruts = bruts.get("jobs", [])
+    elif extension == ".csv":
+        with open(chemin, newline="") as f:
+            bruts = list(csv.DictReader(f))
+    else:
+        raise ValueError(f"Format de jobs non reconnu : {chemin} (attendu .json ou .csv).")
+
+    jobs = [_normaliser_job(brut, k, chemin) for k, brut in enumerate(bruts)]
+    if not jobs:
+        raise ValueError(f"Aucun job dans {chemin}.")
+
+    noms = [job["nom"] for job in jobs]
+    doublons = sorted({nom for nom in noms if noms.count(nom) > 1})
+    if doublons:
+        raise ValueError(f"Noms de jobs en double (fichiers de sortie communs) : {doublons}")
+    return jobs
+
+
+def generer_job(job, dossier):
+    """
+    Calcule la trajectoire d'un job, l'écrit dans dossier/<nom>.npz et renvoie ses métriques.
+    Une erreur est rapportée dans le résultat (statut "échec") sans interrompre le lot.
+    """
+    t0 = time.perf_counter()
+    resultat = {"nom": job["nom"], "O": job["O"], "R": job["R"], "V": job["V"], "dt": job["dt"],
+                "pid": os.getpid()}
+    try:
+        temps, q, qp, qpp = traj(job["O"], job["R"], job["V"], dt=job["dt"])
+
+        # Consigne opérationnelle (bon marché) pour l'erreur de suivi de la trajectoire articulaire
+        _, s, s_dot, s_ddot, _ = calcul_loi_mouvement(job["R"], job["V"], job["dt"])
+        X, dX, _ = calcul_trajectoire_operationnelle(job["O"], job["R"], s, s_dot, s_ddot)
+        _, _, erreur_X, erreur_dX = calcul_X_robot_et_erreurs(temps, X, dX, q, qp)
+
+        fichier = os.path.join(dossier, f"{job['nom']}.npz")
+        np.savez_compressed(fichier, temps=temps, q=q, qp=qp, qpp=qpp,
+                            O=job["O"], R=job["R"], V=job["V"], dt=job["dt"])
+
+        resultat.update(statut="ok", fichier=fichier, nb_points=len(temps), duree_trajectoire=float(temps[-1]),
+                        erreur_position_max=float(np.max(np.linalg.norm(erreur_X, axis=1))),
+                        erreur_vitesse_max=float(np.max(np.linalg.norm(erreur_dX, axis=1))),
+                        qp_max=float(np.max(np.abs(qp))))
+    except Exception as e:
+        resultat.update(statut="échec", erreur=f"{type(e).__name__}: {e}")
+
+    resultat["duree_calcul"] = time.perf_counter() - t0
+    return resultat
+
+
+def _generer_job(arguments):
+    return generer_job(*arguments)
+
+
+def executer_lot(jobs, dossier, nb_workers=None, progression=None):
+    """
+    Génère tous les jobs dans nb_workers processus (défaut : nombre de cœurs).
+    Avec nb_workers = 1, les jobs sont calculés dans le processus courant.
+
+    :param progression: fonction appelée avec chaque résultat, dans l'ordre des jobs.
+    :return: liste des résultats, dans l'ordre des jobs.
+    """
+    os.makedirs(dossier, exist_ok=True)
+    nb_workers = min(nb_workers or os.cpu_count(), len(jobs))
+    arguments = [(job, dossier) for job in jobs]
+
+    def collecter(iterateur):
+        resultats = []
+        for resultat in iterateur:
+            resultats.append(resultat)
+            if progression is not None:
+                progression(resultat)
+        return resultats
+
+    if nb_workers == 1:
+        return collecter(map(_generer_job, arguments))
+    with ProcessPoolExecutor(max_workers=nb_workers) as executeur:
+        return collecter(executeur.map(_generer_job, arguments))
+
+
+def tableau_resume(resultats):
+    """ Tableau texte : une ligne par job, puis le total. """
+    lignes = [f"{'Job':<20}{'Statut':>8}{'Points':>8}{'tf (s)':>9}{'Err. X max (m)':>16}"
+              f"{'|qp| max (rad/s)':>18}{'Calcul (s)':>12}"]
+    for res in resultats:
+        if res["statut"] == "ok":
+            lignes.append(f"{res['nom']:<20}{res['statut']:>8}{res['nb_points']:>8}{res['duree_trajectoire']:>9.2f}"
+                          f"{res['erreur_position_max']:>16.3e}{res['qp_max']:>18.3f}{res['duree_calcul']:>12.2f}")
+        else:
+            lignes.append(f"{res['nom']:<20}{res['statut']:>8}   {res['erreur']}")
+
+    nb_ok = sum(res["statut"] == "ok" for res in resultats)
+    total = sum(res["duree_calcul"] for res in resultats)
+    lignes.append(f"\n{nb_ok}/{len(resultats)} jobs réussis, {total:.1f} s de calcul cumulé")
+    return "\n".join(lignes)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Génération de trajectoires UR3 par lots (sans affichage)")
+    parser.add_argument("jobs", help="Fichier de jobs (.json ou .csv)")
+    parser.add_argument("--sortie", default="trajectoires", help="Dossier des fichiers .npz (défaut : trajectoires)")
+    parser.add_argument("--workers", type=int, default=None, help="Processus de calcul (défaut : nombre de cœurs)")
+    parser.add_argument("--resume", metavar="FICHIER", help="Écrit aussi les résultats en JSON")
+    args = parser.parse_args(args)
+
+    jobs = lire_jobs(args.jobs)
+    nb_workers = min(args.workers or os.cpu_count(), len(jobs))
+    print(f"{len(jobs)} jobs, {nb_workers} processus, sortie dans '{args.sortie}'")
+
+    def progression(resultat):
+        print(f" [{resultat['statut']:>5}] {resultat['nom']} ({resultat['duree_calcul']:.2f} s)", flush=True)
+
+    t0 = time.perf_counter()
+    resultats = executer_lot(jobs, args.sortie, nb_workers, progression)
+    print(f"\nLot terminé en {time.perf_counter() - t0:.1f} s\n")
+    print(tableau_resume(resultats))
+
+    if args.resume:
+        with open(args.resume, "w") as f:
+            json.dump(resultats, f, indent=1, ensure_ascii=False)
+
+    return 0 if all(res["statut"] == "ok" for res in resultats) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
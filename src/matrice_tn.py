@@ -54,4 +54,50 @@ def calcul_T06_global(matrices):
     T_global = np.eye(4)
     for T in matrices:
         T_global = np.dot(T_global, T)
-    return T_global
\ No newline at end of file
+    return T_global
+
+def generate_transformation_matrices_batch(q, dh):
+    """
+    Version vectorisée de generate_transformation_matrices pour toute une trajectoire.
+    q : tableau (N, 6) -> renvoie un tableau (N, 6, 4, 4) des matrices [T01, T12, ... T56].
+    """
+    q = np.atleast_2d(np.asarray(q, dtype=float))
+    N, nb_axes = q.shape
+
+    a = np.asarray(dh["a_i_m1"], dtype=float)
+    alpha = np.asarray(dh["alpha_i_m1"], dtype=float)
+    r = np.asarray(dh["r_i"], dtype=float)
+    theta = q + np.asarray(dh["theta_offset"], dtype=float)
+
+    c_t = np.cos(theta)
+    s_t = np.sin(theta)
+    c_a = np.cos(alpha)
+    s_a = np.sin(alpha)
+
+    # Même structure que matrice_Tim1_Ti, remplie terme à terme
+    T = np.zeros((N, nb_axes, 4, 4))
+    T[:, :, 0, 0] = c_t
+    T[:, :, 0, 1] = -s_t
+    T[:, :, 0, 3] = a
+    T[:, :, 1, 0] = s_t * c_a
+    T[:, :, 1, 1] = c_t * c_a
+    T[:, :, 1, 2] = -s_a
+    T[:, :, 1, 3] = -r * s_a
+    T[:, :, 2, 0] = s_t * s_a
+    T[:, :, 2, 1] = c_t * s_a
+    T[:, :, 2, 2] = c_a
+    T[:, :, 2, 3] = r * c_a
+    T[:, :, 3, 3] = 1
+    return T
+
+
+def calcul_T0i_batch(matrices):
+    """
+    Produits cumulés des matrices élémentaires (N, 6, 4, 4) -> [T01, T02, ... T06] (N, 6, 4, 4).
+    calcul_T0i_batch(...)[:, -1] correspond à calcul_T06_global pour chaque échantillon.
+    """
+    T_abs = np.empty_like(matrices)
+    T_abs[:, 0] = matrices[:, 0]
+    for i in range(1, matrices.shape[1]):
+        T_abs[:, i] = T_abs[:, i - 1] @ matrices[:, i]
+    return T_abs
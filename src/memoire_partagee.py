@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Passage de trajectoires entre processus par mémoire partagée (multiprocessing.shared_memory).
+
+Le producteur (planificateur) publie ses tableaux (temps, q, qp, ...) dans un segment
+nommé ; seul un petit descripteur (nom du segment, décalage / forme / type de chaque
+tableau) est transmis aux autres processus, qui projettent le segment et lisent les
+tableaux sans copie, dans un bloc vues().
+
+Cycle de vie : l'en-tête du segment contient un compteur de références (producteur +
+lecteurs attachés), modifié sous un verrou fichier (fcntl). Chaque fermer() décrémente
+le compteur et le dernier à se détacher libère le segment. Le segment est donc retiré du
+suivi de resource_tracker, qui le détruirait sinon à la sortie de son créateur, même
+si des lecteurs l'utilisent encore.
+"""
+import contextlib
+import fcntl
+import gc
+import os
+import tempfile
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+TAILLE_ENTETE = 64  # Compteur de références (int64), puis alignement des tableaux
+ALIGNEMENT = 64
+
+
+def _chemin_verrou(nom):
+    return os.path.join(tempfile.gettempdir(), f"{nom.lstrip('/')}.verrou")
+
+
+def _detacher_du_suivi(shm):
+    """ Retire le segment de resource_tracker : sa durée de vie est gérée par le compteur. """
+    resource_tracker.unregister(shm._name, "shared_memory")
+
+
+class _Verrou:
+    """ Verrou inter-processus exclusif sur un fichier (fcntl.flock). """
+
+    def __init__(self, nom):
+        self.chemin = _chemin_verrou(nom)
+
+    def __enter__(self):
+        self.fd = os.open(self.chemin, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+
+
+class TrajectoirePartagee:
+    """
+    Accès (producteur ou lecteur) à une trajectoire en mémoire partagée.
+    À créer par publier_trajectoire() ou ouvrir_trajectoire().
+
+    Les tableaux s'obtiennent sans copie dans un bloc vues() (en lecture seule côté
+    lecteur), ou copiés par copie(cle). Les vues appartiennent à la trajectoire :
+    fermer() est refusé tant qu'une vue (ou une tranche de vue) reste référencée.
+    """
+
+    def __init__(self, shm, descripteur, lecture_seule):
+        self._shm = shm
+        self.descripteur = descripteur
+        self._lecture_seule = lecture_seule
+        self._compteur = np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+        self._blocs = 0                   # Blocs vues() en cours
+        self._emises = []                 # Références faibles des vues rendues par vues()
+
+    def _projeter(self, cle):
+        """ Nouvelle vue numpy sur le tableau 'cle' du segment. """
+        if self._shm is None:
+            raise ValueError("Trajectoire partagée déjà fermée.")
+        decalage, forme, type_ = self.descripteur["tableaux"][cle]
+        vue = np.ndarray(forme, dtype=type_, buffer=self._shm.buf, offset=decalage)
+        vue.flags.writeable = not self._lecture_seule
+        return vue
+
+    def _nb_vues_vivantes(self):
+        """ Vues rendues par vues() encore référencées (une tranche retient sa vue). """
+        self._emises = [ref for ref in self._emises if ref() is not None]
+        return len(self._emises)
+
+    @contextlib.contextmanager
+    def vues(self):
+        """
+        Vues sans copie sur tous les tableaux, valables dans le bloc :
+            with trajectoire.vues() as tableaux:
+                calcul(tableaux["q"])
+        Le dict est vidé en sortie de bloc.
+        """
+        vues = {cle: self._projeter(cle) for cle in self.descripteur["tableaux"]}
+        self._emises.extend(weakref.ref(vue) for vue in vues.values())
+        self._blocs += 1
+        try:
+            yield vues
+        finally:
+            self._blocs -= 1
+            vues.clear()
+
+    def copie(self, cle):
+        """ Copie du tableau 'cle', indépendante du segment (survit à fermer()). """
+        return np.array(self._projeter(cle))
+
+    def keys(self):
+        return self.descripteur["tableaux"].keys()
+
+    @property
+    def nb_references(self):
+        return int(self._compteur[0])
+
+    def fermer(self):
+        """
+        Se détache du segment ; le libère si c'était la dernière référence.
+        """
+        if self._shm is None:
+            return
+
+        # Fermer le segment sous des tableaux encore utilisés ferait planter le processus
+        if self._blocs:
+            raise ValueError("Bloc vues() en cours : fermer() après la sortie du bloc.")
+        if self._nb_vues_vivantes():
+            gc.collect()  # Vues retenues seulement par des cycles (trace d'exception, ...)
+        if self._nb_vues_vivantes():
+            raise ValueError("Des tableaux de la trajectoire partagée sont encore référencés : "
+                             "supprimez-les (ou utilisez copie()) avant fermer().")
+
+        nom = self.descripteur["nom"]
+        with _Verrou(nom):
+            self._compteur[0] -= 1
+            restant = int(self._compteur[0])
+            self._compteur = None
+            self._shm.close()
+            if restant == 0:
+                # unlink() se retire lui-même du suivi : on l'y remet juste avant
+                resource_tracker.register(self._shm._name, "shared_memory")
+                self._shm.unlink()
+
+        if restant == 0:
+            os.remove(_chemin_verrou(nom))
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+def publier_trajectoire(**tableaux):
+    """
+    Copie les tableaux dans un nouveau segment partagé (une seule copie, côté producteur).
+
+    Exemple : trajectoire = publier_trajectoire(temps=temps, q=q, qp=qp)
+              envoyer(trajectoire.descripteur) ; ... ; trajectoire.fermer()
+
+    :return: TrajectoirePartagee (producteur, compte pour une référence).
+    """
+    if not tableaux:
+        raise ValueError("Aucun tableau à publier.")
+
+    # Disposition : en-tête puis tableaux alignés
+    disposition = {}
+    decalage = TAILLE_ENTETE
+    for cle, tableau in tableaux.items():
+        tableau = np.ascontiguousarray(tableau)
+        disposition[cle] = (decalage, tableau.shape, tableau.dtype.str)
+        decalage += -(-tableau.nbytes // ALIGNEMENT) * ALIGNEMENT
+
+    shm = shared_memory.SharedMemory(create=True, size=decalage)
+    _detacher_du_suivi(shm)
+    descripteur = {"nom": shm.name, "taille": decalage, "tableaux": disposition}
+
+    with _Verrou(shm.name):
+        trajectoire = TrajectoirePartagee(shm, descripteur, lecture_seule=False)
+        trajectoire._compteur[0] = 1
+        with trajectoire.vues() as vues:
+            for cle, tableau in tableaux.items():
+                vues[cle][...] = tableau
+    return trajectoire
+
+
+def ouvrir_trajectoire(descripteur):
+    """
+    Projette une trajectoire publiée (sans copie) et s'ajoute à ses références.
+
+    :param descripteur: TrajectoirePartagee.descripteur du producteur.
+    :return: TrajectoirePartagee (lecteur, tableaux en lecture seule).
+    """
+    nom = descripteur["nom"]
+    with _Verrou(nom):
+        try:
+            shm = shared_memory.SharedMemory(name=nom)
+        except FileNotFoundError:
+            os.remove(_chemin_verrou(nom))  # Recréé par le verrou ci-dessus
+            raise ValueError(f"Segment partagé {nom} introuvable (déjà libéré ?).")
+        _detacher_du_suivi(shm)
+
+        compteur = np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+        if compteur[0] <= 0:
+            del compteur
+            shm.close()
+            raise ValueError(f"Segment partagé {nom} en cours de libération.")
+        compteur[0] += 1
+        del compteur
+
+        return TrajectoirePartagee(shm, descripteur, lecture_seule=True)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MGI d'une trajectoire en parallèle, par découpage en segments.
+
+Dans traj(), chaque MGI est initialisé par la solution de l'échantillon précédent :
+la boucle est séquentielle et n'occupe qu'un cœur. Ici :
+  1. un guide séquentiel grossier (un échantillon sur 'decimation_guide') fournit
+     la graine de chaque début de segment, sur la même branche de solutions que
+     le départ (MGI multi-départs si le guide ne converge pas) ;
+  2. les K segments sont résolus en parallèle (un processus par segment) ;
+  3. les raccords sont vérifiés : le début du segment k est comparé au prolongement
+     linéaire de la fin du segment k-1 (seconde différence de q au raccord).
+     - Saut au-delà de seuil_branche (changement de branche) : le segment k est
+       résolu à nouveau, séquentiellement, depuis la fin du segment k-1.
+     - Petit saut (dérive du guide dans l'espace nul, le MGI position étant
+       redondant) : il est réparti sur les 'fenetre_raccord' derniers échantillons
+       du segment k-1 (fondu), chaque échantillon étant ramené sur la consigne par
+       le MGI ; la vitesse du fondu, projetée dans le noyau de J_v, est ajoutée à qp.
+
+La trajectoire obtenue suit la consigne avec la même tolérance que traj() ; elle peut
+différer de la solution séquentielle dans l'espace nul (de l'ordre de la dérive du guide).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.const_v import dh
+from src.matrice_tn import generate_transformation_matrices
+from src.modele_differentiel import Jacob_geo, MGI_numerique
+from src.part1_loi_mouvement import calcul_loi_mouvement
+from src.part2_trajectoire_operationnelle import calcul_trajectoire_operationnelle
+from src.part4_generation_articulaire import Q_INIT_DEFAUT, parametres_robot, resoudre_points_articulaires
+
+
+def ecart_angulaire(q_a, q_b):
+    """ q_a - q_b ramené dans [-pi, pi[ (les solutions du MGI sont normalisées modulo 2 pi). """
+    return (np.asarray(q_a) - q_b + np.pi) % (2 * np.pi) - np.pi
+
+
+def mgi_multi_departs(cible, q_ref, nb_departs=16, amplitude=0.5, graine=0, dh_params=dh):
+    """
+    MGI depuis q_ref et depuis des graines tirées autour de q_ref ; renvoie la solution
+    convergée la plus proche de q_ref (None si aucune ne converge).
+    """
+    rng = np.random.default_rng(graine)
+    graines = np.vstack((q_ref, q_ref + rng.uniform(-amplitude, amplitude, (nb_departs - 1, 6))))
+
+    meilleure, distance = None, np.inf
+    for graine_mgi in graines:
+        q_sol = MGI_numerique(cible, graine_mgi, dh_params, max_iter=100, alpha=0.8, tol=1e-5)
+        if q_sol is not None:
+            d = np.linalg.norm(ecart_angulaire(q_sol, q_ref))
+            if d < distance:
+                meilleure, distance = q_sol, d
+    return meilleure
+
+
+def _graines_segments(X_ref, bornes, q_init, decimation_guide, dh_params):
+    """ Guide séquentiel grossier jusqu'au dernier début de segment : graine de chaque segment. """
+    indices_guide = np.arange(0, bornes[-2] + 1, decimation_guide)
+    graines = {0: q_init}
+    q_prev = q_init
+    for i in indices_guide[1:]:
+        q_sol = MGI_numerique(X_ref[i], q_prev, dh_params, max_iter=50, alpha=0.8, tol=1e-5)
+        if q_sol is None:
+            q_sol = mgi_multi_departs(X_ref[i], q_prev, dh_params=dh_params)
+            if q_sol is None:
+                raise ValueError(f"MGI du guide impossible à l'échantillon {i} (consigne hors d'atteinte ?).")
+        q_prev = q_sol
+        graines[i] = q_sol
+    return [graines[b] for b in bornes[:-1]]
+
+
+def _resoudre_segment(arguments):
+    """ Segment résolu séquentiellement depuis sa graine (processus de travail). """
+    X_ref, dX_ref, graine, dh_params = arguments
+    q = np.empty((len(X_ref), 6))
+    qp = np.empty((len(X_ref), 6))
+    resoudre_points_articulaires(X_ref, dX_ref, q, qp, graine, dh_params=dh_params)
+    return q, qp
+
+
+def _ecart_prolongement(q, b):
+    """ Écart de q[b] au prolongement linéaire de q[b-2], q[b-1] (seconde différence, modulo 2 pi). """
+    return ecart_angulaire(q[b], q[b - 1] + ecart_angulaire(q[b - 1], q[b - 2]))
+
+
+def _fondu_raccord(X_ref, dX_ref, q, qp, fin, saut, fenetre, dt, dh_params):
+    """
+    Répartit 'saut' sur les échantillons [fin - fenetre, fin) par un poids lisse de 0 à 1,
+    ramène chaque échantillon sur la consigne et ajoute la vitesse du fondu (dans le noyau de J_v).
+    """
+    u = np.arange(1, fenetre + 1) / fenetre
+    poids = 3 * u ** 2 - 2 * u ** 3
+    d_poids = (6 * u - 6 * u ** 2) / (fenetre * dt)
+
+    for j, i in enumerate(range(fin - fenetre, fin)):
+        q_sol = MGI_numerique(X_ref[i], q[i] + poids[j] * saut, dh_params, max_iter=20, alpha=0.8, tol=1e-5)
+        if q_sol is not None:
+            q[i] = q_sol
+        J_v = Jacob_geo(generate_transformation_matrices(q[i], dh_params))[:3, :]
+        J_pinv = np.linalg.pinv(J_v)
+        noyau = np.eye(6) - J_pinv @ J_v
+        qp[i] = J_pinv @ dX_ref[i] + noyau @ (d_poids[j] * saut)
+
+
+def calcul_trajectoire_articulaire_parallele(X_ref, dX_ref, dt, q_init=None, nb_workers=None, nb_segments=None,
+                                             decimation_guide=20, fenetre_raccord=50, tol_raccord=1e-4,
+                                             seuil_branche=0.5, robot=None, Debug=False):
+    """
+    Équivalent parallèle de calcul_trajectoire_articulaire (voir l'en-tête du module).
+
+    Args:
+        nb_workers: processus de calcul (défaut : nombre de cœurs ; 1 = dans ce processus).
+        nb_segments: nombre de segments (défaut : nb_workers).
+        decimation_guide: un échantillon sur decimation_guide dans le guide séquentiel.
+        fenetre_raccord: nombre d'échantillons sur lesquels un petit saut est réparti.
+        tol_raccord (rad): écart au prolongement toléré sans réparation (ordre de grandeur
+                           des secondes différences de q dans une solution séquentielle).
+        seuil_branche (rad): saut au-delà duquel le segment est résolu à nouveau.
+        robot: nom du modèle ou ModeleRobot dont les paramètres DH sont utilisés (UR3 par défaut).
+
+    Returns:
+        q, qp, qpp, raccords (liste de dict par raccord : indice, saut initial / final, réparation)
+    """
+    N = len(X_ref)
+    nb_workers = nb_workers or os.cpu_count()
+    nb_segments = nb_segments or nb_workers
+    q_init = np.array(Q_INIT_DEFAUT if q_init is None else q_init, dtype=float)
+    dh_params, _ = parametres_robot(robot)
+
+    # Débuts de segments sur la grille du guide (au moins deux échantillons par segment)
+    bornes = np.round(np.arange(nb_segments) * N / nb_segments / decimation_guide).astype(int) * decimation_guide
+    bornes = np.append(np.unique(bornes), N)
+    if np.any(np.diff(bornes) < 2):
+        raise ValueError("Trop de segments pour la longueur de la trajectoire.")
+
+    graines = _graines_segments(X_ref, bornes, q_init, decimation_guide, dh_params)
+    arguments = [(X_ref[a:b], dX_ref[a:b], graine, dh_params) for a, b, graine in zip(bornes[:-1], bornes[1:], graines)]
+
+    if Debug: print(f"MGI parallèle : {len(arguments)} segments, {nb_workers} processus")
+    if nb_workers == 1:
+        segments = list(map(_resoudre_segment, arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=min(nb_workers, len(arguments))) as executeur:
+            segments = list(executeur.map(_resoudre_segment, arguments))
+
+    q = np.concatenate([q_seg for q_seg, _ in segments])
+    qp = np.concatenate([qp_seg for _, qp_seg in segments])
+
+    # Raccords, dans l'ordre : une réparation du segment k modifie la fin prise en compte au raccord k+1
+    raccords = []
+    for k in range(1, len(bornes) - 1):
+        a, b = bornes[k - 1], bornes[k]
+        saut = _ecart_prolongement(q, b)
+        raccord = {"indice": int(b), "saut_initial": float(np.max(np.abs(saut)))}
+
+        if raccord["saut_initial"] > seuil_branche:
+            # Changement de branche : le segment k repart de la fin du segment k-1
+            resoudre_points_articulaires(X_ref[b:bornes[k + 1]], dX_ref[b:bornes[k + 1]],
+                                         q[b:bornes[k + 1]], qp[b:bornes[k + 1]], q[b - 1], dh_params=dh_params)
+            raccord["reparation"] = "segment_resolu"
+        elif raccord["saut_initial"] > tol_raccord:
+            _fondu_raccord(X_ref, dX_ref, q, qp, b, saut, min(fenetre_raccord, b - a - 1), dt, dh_params)
+            raccord["reparation"] = "fondu"
+        else:
+            raccord["reparation"] = "aucune"
+
+        raccord["saut_final"] = float(np.max(np.abs(_ecart_prolongement(q, b))))
+        raccords.append(raccord)
+        if Debug: print(f"Raccord {k} (échantillon {b}) : {raccord}")
+
+    qpp = np.gradient(qp, dt, axis=0)
+    return q, qp, qpp, raccords
+
+
+def traj_parallele(O, R, V, dt=0.005, **options):
+    """
+    Équivalent de traj(O, R, V) avec le MGI parallélisé par segments
+    (options : voir calcul_trajectoire_articulaire_parallele).
+
+    Returns:
+        time, q, qp, qpp, raccords
+    """
+    time, s, s_dot, s_ddot, _ = calcul_loi_mouvement(R, V, dt)
+    X_ref, dX_ref, _ = calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot)
+    q, qp, qpp, raccords = calcul_trajectoire_articulaire_parallele(X_ref, dX_ref, time[1] - time[0], **options)
+    return time, q, qp, qpp, raccords
@@ -1,6 +1,10 @@
+import functools
+import time
+
 import numpy as np
+from src import instrumentation
+from src.const_v import dh
 from src.matrice_tn import generate_transformation_matrices, calcul_T06_global
-import sympy as sp
 
 
 def calculate_z_and_o(T):
@@ -50,6 +54,22 @@ def Jacob_geo(matrices, Debug=False):
     return J
 
 
+def Jacob_geo_batch(T_abs):
+    """
+    Version vectorisée de Jacob_geo pour toute une trajectoire.
+    Prend les matrices cumulées T0i (N, 6, 4, 4) (voir calcul_T0i_batch)
+    et renvoie les Jacobiennes géométriques (N, 6, 6).
+    """
+    z = T_abs[:, :, :3, 2]  # Axes z_i (N, 6, 3)
+    o = T_abs[:, :, :3, 3]  # Origines O_i (N, 6, 3)
+    ot = o[:, -1:, :]  # Organe terminal (N, 1, 3)
+
+    J = np.empty((T_abs.shape[0], 6, T_abs.shape[1]))
+    J[:, :3, :] = np.cross(z, ot - o).transpose(0, 2, 1)  # Jv = z_i ^ (OT - O_i)
+    J[:, 3:, :] = z.transpose(0, 2, 1)  # Jw = z_i
+    return J
+
+
 def MDD(dq, J):
     """ Modèle Différentiel Direct : Vitesse Articulaire -> Vitesse Cartésienne """
     return np.dot(J, dq)
@@ -73,11 +93,14 @@ def MGI_numerique(target_pos, q_init, dh_params, max_iter=100, tol=1e-4, alpha=0
         print(f"\n--- Début MGI Numérique ---")
         print(f"Cible : {target_pos}")
 
+    instrumente = instrumentation.ACTIF
     for i in range(max_iter):
         # 1. Où est-on ? (MGD)
+        if instrumente: t0 = time.perf_counter()
         mats = generate_transformation_matrices(q, dh_params)
         T06 = calcul_T06_global(mats)
         curr_pos = T06[:3, 3]
+        if instrumente: instrumentation.enregistrer_duree("mgi_mgd", time.perf_counter() - t0)
 
         # 2. Erreur
         err = target_pos - curr_pos
@@ -89,50 +112,117 @@ def MGI_numerique(target_pos, q_init, dh_params, max_iter=100, tol=1e-4, alpha=0
         # 3. Condition d'arrêt
         if err_norm < tol:
             if Debug: print(f"Succès MGI en {i} itérations !")
+            if instrumente:
+                instrumentation.compter("mgi_appels")
+                instrumentation.compter("mgi_iterations", i)
             # Normalisation des angles entre -pi et pi
             return (q + np.pi) % (2 * np.pi) - np.pi
 
         # 4. Correction via Jacobienne Inverse
+        if instrumente: t0 = time.perf_counter()
         J = Jacob_geo(mats)
         # On ne corrige que la position X,Y,Z -> on prend les 3 premières lignes
         J_pos = J[:3, :]
+        if instrumente: t1 = time.perf_counter()
 
         dq = np.dot(np.linalg.pinv(J_pos), err)
+        if instrumente:
+            instrumentation.enregistrer_duree("mgi_jacobienne", t1 - t0)
+            instrumentation.enregistrer_duree("mgi_pinv", time.perf_counter() - t1)
 
         # 5. Mise à jour avec Gain (alpha) pour la stabilité
         q = q + alpha * dq
 
     if Debug:
         print(f"Echec MGI : Erreur finale {err_norm:.4f}m")
+    if instrumente:
+        instrumentation.compter("mgi_appels")
+        instrumentation.compter("mgi_iterations", max_iter)
+        instrumentation.compter("mgi_echecs")
     return None
 
 
-def Jacob_analytique(q_val=None, Debug=False):
+def erreur_orientation_locale(R_cible, R_courante):
+    """
+    Erreur d'orientation 1/2 (n x n_d + s x s_d + a x a_d) dans le repère de base :
+    égale au vecteur de rotation pour de petits écarts, sans trigonométrie.
+    """
+    return 0.5 * np.cross(R_courante.T, R_cible.T).sum(axis=0)
+
+
+def MGI_pose(target_pos, target_rot, q_init, dh_params, max_iter=100, tol=1e-4, tol_rot=1e-4, alpha=0.5,
+             Debug=False):
     """
-    Calcule la Jacobienne Analytique (Symbolique) pour l'UR3.
+    MGI en pose complète (position + orientation) par Newton-Raphson amorti sur la
+    Jacobienne 6x6. Retrouve q tel que T06(q) = [target_rot, target_pos].
+
     Args:
-        q_val (list, optional): Valeurs numériques des angles [q1...q6] (en radians).
-                                Si fourni, retourne la matrice numérique.
-        Debug (bool): Affiche les matrices symboliques intermédiaires.
+        target_rot: matrice de rotation (3x3) de l'outil, dans le repère de base.
+        tol (m), tol_rot (rad): tolérances en position et en orientation.
 
     Returns:
-        sp.Matrix (si q_val=None) ou np.ndarray (si q_val fourni)
+        q (normalisé dans [-pi, pi]) ou None si non convergé
     """
+    q = np.array(q_init, dtype=float)
+    target_pos = np.array(target_pos, dtype=float)
+    target_rot = np.array(target_rot, dtype=float)
+
+    instrumente = instrumentation.ACTIF
+    err = np.zeros(6)
+    for i in range(max_iter):
+        mats = generate_transformation_matrices(q, dh_params)
+        T06 = calcul_T06_global(mats)
+        err[:3] = target_pos - T06[:3, 3]
+        err[3:] = erreur_orientation_locale(target_rot, T06[:3, :3])
+
+        if Debug and i % 10 == 0:
+            print(f"Iter {i}: Erreur = {np.linalg.norm(err[:3]):.5f} m, {np.linalg.norm(err[3:]):.5f} rad")
+
+        if np.linalg.norm(err[:3]) < tol and np.linalg.norm(err[3:]) < tol_rot:
+            if instrumente:
+                instrumentation.compter("mgi_appels")
+                instrumentation.compter("mgi_iterations", i)
+            return (q + np.pi) % (2 * np.pi) - np.pi
+
+        # Correction via la Jacobienne complète (6x6)
+        dq = np.dot(np.linalg.pinv(Jacob_geo(mats)), err)
+        q = q + alpha * dq
+
+    if Debug:
+        print(f"Echec MGI pose : erreur finale {np.linalg.norm(err[:3]):.4f} m, {np.linalg.norm(err[3:]):.4f} rad")
+    if instrumente:
+        instrumentation.compter("mgi_appels")
+        instrumentation.compter("mgi_iterations", max_iter)
+        instrumentation.compter("mgi_echecs")
+    return None
+
+
+def _cle_dh(dh_params):
+    """ Clé hashable d'un jeu de paramètres DH (cache des noyaux symboliques). """
+    return tuple(tuple(float(v) for v in dh_params[cle]) for cle in ("a_i_m1", "alpha_i_m1", "r_i", "theta_offset"))
+
+
+@functools.lru_cache(maxsize=None)
+def _jacobienne_symbolique(cle_dh):
+    """
+    Jacobienne géométrique symbolique (6x6) pour des paramètres DH donnés (voir _cle_dh).
+    Construite une fois par modèle de robot puis conservée.
+
+    Returns:
+        symboles (q1..q6), J_sym (sp.Matrix)
+    """
+    import sympy as sp  # Calcul symbolique : chargé au premier appel seulement
+
     # 1. Définition des symboles
     # q1..q6 sont les variables, les autres sont les paramètres géométriques constants
-    q1, q2, q3, q4, q5, q6 = sp.symbols('q1 q2 q3 q4 q5 q6')
-    r1, r2, r4, r5, r6 = 0.152, 0.120, 0.010, 0.083, 0.082
-    a2, a3 = 0.244, 0.213
+    q = sp.symbols('q1 q2 q3 q4 q5 q6')
+    a_i_m1, alpha_i_m1, r_i, theta_offset = cle_dh
 
-    # Paramètres DH Modifiés UR3 : (alpha_i-1, a_i-1, r_i, theta_offset)
-    # Attention aux signes de r2 et aux offsets définis dans votre projet
+    # Paramètres DH Modifiés : (alpha_i-1, a_i-1, r_i, theta_offset)
+    # Angles (alpha, offsets) exprimés en multiples exacts de pi : cos / sin exacts (0, ±1)
     dh_params = [
-        (0, 0, r1, q1 + sp.pi / 2),  # Axe 1
-        (sp.pi / 2, 0, -r2, q2),  # Axe 2 (r2 négatif dans votre const_v)
-        (0, a2, 0, q3),  # Axe 3
-        (0, a3, r4, q4 + sp.pi / 2),  # Axe 4 (r4 ajouté)
-        (sp.pi / 2, 0, r5, q5),  # Axe 5
-        (-sp.pi / 2, 0, r6, q6 - sp.pi / 2)  # Axe 6
+        (sp.nsimplify(alpha_i_m1[i], [sp.pi]), a_i_m1[i], r_i[i], q[i] + sp.nsimplify(theta_offset[i], [sp.pi]))
+        for i in range(len(a_i_m1))
     ]
 
     # 2. Construction des Matrices de Transformation Symboliques
@@ -155,8 +245,6 @@ def Jacob_analytique(q_val=None, Debug=False):
     for alpha, a, r, theta in dh_params:
         T_elem = mat_dh_sym(alpha, a, r, theta)
         T_curr = T_curr * T_elem  # Multiplication symbolique
-        # On simplifie un peu à chaque étape pour éviter des expressions géantes
-        # (Note: sp.simplify peut être lent, on l'utilise avec parcimonie)
         T_abs.append(T_curr)
 
     # T_abs contient [T01, T02, T03, T04, T05, T06]
@@ -192,21 +280,39 @@ def Jacob_analytique(q_val=None, Debug=False):
     J_sym = cols[0]
     for i in range(1, 6):
         J_sym = J_sym.row_join(cols[i])
+    return q, J_sym
 
 
-    # 4. Évaluation Numérique (si q_val est fourni)
-    if q_val is not None:
-        if len(q_val) != 6:
-            raise ValueError("q_val doit contenir 6 angles.")
+@functools.lru_cache(maxsize=None)
+def _jacobienne_compilee(cle_dh):
+    """ Jacobienne symbolique convertie en fonction numpy (lambdify), une fois par modèle. """
+    import sympy as sp
+    q, J_sym = _jacobienne_symbolique(cle_dh)
+    return sp.lambdify(q, J_sym, modules="numpy")
 
-        # Dictionnaire de substitution : {q1: val1, q2: val2...}
-        subs_dict = {
-            q1: q_val[0], q2: q_val[1], q3: q_val[2],
-            q4: q_val[3], q5: q_val[4], q6: q_val[5]
-        }
 
-        # Substitution et conversion en numpy float
-        J_num = np.array(J_sym.evalf(subs=subs_dict)).astype(np.float64)
-        return J_num
+def Jacob_analytique(q_val=None, Debug=False, dh_params=dh):
+    """
+    Calcule la Jacobienne Analytique (Symbolique), pour l'UR3 par défaut.
+    Args:
+        q_val (list, optional): Valeurs numériques des angles [q1...q6] (en radians).
+                                Si fourni, retourne la matrice numérique.
+        Debug (bool): Affiche la matrice symbolique.
+        dh_params (dict): paramètres DH du robot (voir const_v.modeles_robot).
+
+    La matrice symbolique et sa version compilée (lambdify) sont construites au premier
+    appel pour un jeu de paramètres DH donné, puis réutilisées.
 
-    return J_sym
\ No newline at end of file
+    Returns:
+        sp.Matrix (si q_val=None) ou np.ndarray (si q_val fourni)
+    """
+    cle = _cle_dh(dh_params)
+    if q_val is None:
+        _, J_sym = _jacobienne_symbolique(cle)
+        if Debug: print(J_sym)
+        return J_sym
+
+    # 4. Évaluation Numérique
+    if len(q_val) != 6:
+        raise ValueError("q_val doit contenir 6 angles.")
+    return np.asarray(_jacobienne_compilee(cle)(*q_val), dtype=np.float64)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registre des modèles de robot (UR3, UR5, UR10).
+
+Chaque modèle (const_v.modeles_robot) porte ses paramètres DH, ses limites articulaires,
+ses couples maximaux et sa conversion vers la simulation. modele_robot(nom) renvoie une
+instance unique par modèle : les noyaux de calcul (MGD, Jacobiennes, MGI) y sont liés à
+ses paramètres, et la Jacobienne analytique compilée (sympy -> numpy) n'est construite
+qu'au premier appel. Changer de modèle ne coûte donc rien dans les boucles de calcul.
+"""
+import numpy as np
+
+from src.const_v import modeles_robot
+from src.limites_articulaires import verifier_limites, ControleLimites
+from src.matrice_tn import (generate_transformation_matrices, calcul_T06_global,
+                            generate_transformation_matrices_batch, calcul_T0i_batch)
+from src.modele_differentiel import Jacob_geo, Jacob_geo_batch, MGI_numerique, _cle_dh, _jacobienne_compilee
+from src.utils import mgd_vers_simulation, simulation_vers_mgd
+
+_INSTANCES = {}
+
+
+class ModeleRobot:
+    """
+    Paramètres et noyaux de calcul d'un modèle de robot.
+
+    :param nom: nom du modèle (clé de const_v.modeles_robot).
+    :param parametres: dict {dh, limites, couples_max, simulation}.
+    """
+
+    def __init__(self, nom, parametres):
+        self.nom = nom
+        self.dh = parametres["dh"]
+        self.limites = parametres["limites"]
+        self.couples_max = np.asarray(parametres["couples_max"], dtype=float)
+        self.simulation = parametres["simulation"]
+        self._cle_dh = _cle_dh(self.dh)
+        self._jacobienne_analytique = None  # Compilée au premier appel
+
+    def __repr__(self):
+        return f"ModeleRobot({self.nom!r})"
+
+    # --- Modèles géométriques
+    def mgd(self, q):
+        """ Matrice T06 (4x4) pour une configuration q. """
+        return calcul_T06_global(generate_transformation_matrices(q, self.dh))
+
+    def mgd_batch(self, q):
+        """ Matrices cumulées T0i (N, 6, 4, 4) pour des configurations q (N, 6). """
+        return calcul_T0i_batch(generate_transformation_matrices_batch(q, self.dh))
+
+    def position_outil(self, q):
+        """ Position de l'outil (N, 3) pour des configurations q (N, 6). """
+        return self.mgd_batch(q)[:, -1, :3, 3]
+
+    def mgi(self, cible, q_init, **options):
+        """ MGI numérique (options : voir MGI_numerique). """
+        return MGI_numerique(cible, q_init, self.dh, **options)
+
+    # --- Modèles différentiels
+    def jacobienne(self, q):
+        """ Jacobienne géométrique (6x6). """
+        return Jacob_geo(generate_transformation_matrices(q, self.dh))
+
+    def jacobienne_batch(self, q):
+        """ Jacobiennes géométriques (N, 6, 6). """
+        return Jacob_geo_batch(self.mgd_batch(q))
+
+    def jacobienne_analytique(self, q):
+        """ Jacobienne analytique (6x6), évaluée par la fonction compilée du modèle. """
+        if self._jacobienne_analytique is None:
+            self._jacobienne_analytique = _jacobienne_compilee(self._cle_dh)
+        return np.asarray(self._jacobienne_analytique(*q), dtype=np.float64)
+
+    # --- Limites et simulation
+    def verifier_limites(self, temps, q, qp, qpp):
+        """ verifier_limites() avec les limites du modèle. """
+        return verifier_limites(temps, q, qp, qpp, limites=self.limites)
+
+    def controle_limites(self, dt, t0=0.0):
+        """ ControleLimites avec les limites du modèle (contrôle pendant le MGI). """
+        return ControleLimites(dt, self.limites, t0)
+
+    def vers_simulation(self, q):
+        return mgd_vers_simulation(q, self.simulation)
+
+    def depuis_simulation(self, q_sim):
+        return simulation_vers_mgd(q_sim, self.simulation)
+
+
+def noms_modeles():
+    """ Noms des modèles disponibles. """
+    return list(modeles_robot)
+
+
+def modele_robot(nom="UR3"):
+    """
+    Modèle de robot par son nom (insensible à la casse), une instance par modèle.
+    Une instance de ModeleRobot est renvoyée telle quelle.
+    """
+    if isinstance(nom, ModeleRobot):
+        return nom
+    cle = str(nom).upper()
+    if cle not in modeles_robot:
+        raise ValueError(f"Modèle de robot inconnu : {nom!r} (disponibles : {', '.join(modeles_robot)}).")
+    if cle not in _INSTANCES:
+        _INSTANCES[cle] = ModeleRobot(cle, modeles_robot[cle])
+    return _INSTANCES[cle]
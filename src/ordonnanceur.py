@@ -0,0 +1,150 @@
+import asyncio
+import time
+
+import numpy as np
+
+
+POLITIQUES = ("rattraper", "sauter", "recaler")
+
+
+class OrdonnanceurPeriodique:
+    """
+    Cadence une boucle sur des échéances absolues t0 + k * periode (horloge monotone).
+
+    Contrairement à un time.sleep(periode) après le travail, la durée du corps de
+    boucle ne s'accumule pas : la période moyenne reste celle demandée tant que
+    le corps tient dans la période.
+
+    Politiques en cas de dépassement (corps plus long que la période) :
+      - "rattraper" : les ticks en retard s'enchaînent sans attente jusqu'à rattraper l'horaire,
+      - "sauter"    : les échéances manquées sont abandonnées, on repart sur la suivante,
+      - "recaler"   : l'horaire est redéfini à partir de l'instant présent.
+
+    :param periode: période visée (s).
+    :param politique: politique de dépassement (voir ci-dessus).
+    :param nb_mesures: nombre de ticks mémorisés pour les statistiques (tampon circulaire).
+    :param attente_active: durée (s) finale attendue en boucle active pour la précision.
+    """
+
+    def __init__(self, periode, politique="rattraper", nb_mesures=100000, attente_active=2e-4):
+        if politique not in POLITIQUES:
+            raise ValueError(f"Politique inconnue : {politique} (attendu : {POLITIQUES})")
+
+        self.periode = periode
+        self.politique = politique
+        self.attente_active = attente_active
+
+        self.instants = np.zeros(nb_mesures)  # Début effectif de chaque tick
+        self.retards = np.zeros(nb_mesures)   # Début effectif - échéance
+        self.nb_ticks = 0
+        self.nb_depassements = 0
+        self.nb_sautes = 0
+        self._echeance = None
+
+    def attendre(self):
+        """
+        Attend l'échéance suivante (le premier appel démarre l'horaire immédiatement).
+
+        :return: indice du tick.
+        """
+        if self._avancer_echeance():
+            # Sommeil grossier, puis attente active sur la fin
+            restant = self._echeance - time.perf_counter()
+            if restant > self.attente_active:
+                time.sleep(restant - self.attente_active)
+            while time.perf_counter() < self._echeance:
+                pass
+
+        return self._marquer_tick()
+
+    async def attendre_async(self):
+        """
+        Comme attendre(), pour une boucle asyncio : le sommeil grossier rend la main
+        à la boucle d'événements (les autres tâches continuent pendant l'attente).
+
+        :return: indice du tick.
+        """
+        if self._avancer_echeance():
+            restant = self._echeance - time.perf_counter()
+            if restant > self.attente_active:
+                await asyncio.sleep(restant - self.attente_active)
+            while time.perf_counter() < self._echeance:
+                pass
+
+        return self._marquer_tick()
+
+    def _avancer_echeance(self):
+        """
+        Calcule l'échéance suivante selon la politique de dépassement.
+
+        :return: False au premier appel (pas d'attente), True sinon.
+        """
+        maintenant = time.perf_counter()
+
+        if self._echeance is None:
+            self._echeance = maintenant
+            return False
+
+        self._echeance += self.periode
+        if maintenant > self._echeance:
+            self.nb_depassements += 1
+            if self.politique == "sauter":
+                manques = int((maintenant - self._echeance) // self.periode) + 1
+                self.nb_sautes += manques
+                self._echeance += manques * self.periode
+            elif self.politique == "recaler":
+                self._echeance = maintenant
+        return True
+
+    def _marquer_tick(self):
+        """ Enregistre le début effectif du tick et son retard sur l'échéance. """
+        debut = time.perf_counter()
+        i = self.nb_ticks % len(self.instants)
+        self.instants[i] = debut
+        self.retards[i] = debut - self._echeance
+        self.nb_ticks += 1
+        return self.nb_ticks - 1
+
+    def executer(self, corps, nb_iterations):
+        """
+        Appelle corps(k) à chaque échéance, nb_iterations fois.
+        """
+        for _ in range(nb_iterations):
+            k = self.attendre()
+            corps(k)
+
+    def statistiques(self, nb_classes=50):
+        """
+        Statistiques de cadence sur les ticks mémorisés.
+
+        :return: dict avec frequence_reelle, periode (moyenne, écart-type, min, max),
+                 gigue (percentiles du retard), compteurs de dépassements / ticks sautés,
+                 et histogrammes (effectifs, bornes) des périodes et de la gigue.
+        """
+        n = min(self.nb_ticks, len(self.instants))
+        if n < 2:
+            raise ValueError("Pas assez de ticks enregistrés.")
+
+        debut = self.nb_ticks - n
+        idx = np.arange(debut, self.nb_ticks) % len(self.instants)
+        instants = self.instants[idx]
+        retards = self.retards[idx]
+        periodes = np.diff(instants)
+
+        return {
+            "periode_visee": self.periode,
+            "frequence_visee": 1.0 / self.periode,
+            "frequence_reelle": (n - 1) / (instants[-1] - instants[0]),
+            "periode_moyenne": float(np.mean(periodes)),
+            "periode_ecart_type": float(np.std(periodes)),
+            "periode_min": float(np.min(periodes)),
+            "periode_max": float(np.max(periodes)),
+            "gigue_p50": float(np.percentile(retards, 50)),
+            "gigue_p99": float(np.percentile(retards, 99)),
+            "gigue_max": float(np.max(retards)),
+            "nb_ticks": self.nb_ticks,
+            "nb_depassements": self.nb_depassements,
+            "nb_sautes": self.nb_sautes,
+            "histo_periodes": np.histogram(periodes, bins=nb_classes),
+            "histo_gigue": np.histogram(retards, bins=nb_classes),
+        }
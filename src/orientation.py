@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Orientation de l'outil : quaternions unitaires (convention [w, x, y, z]), SLERP
+et erreurs d'orientation, vectorisés sur toute une trajectoire (tableaux (N, ...)).
+"""
+import numpy as np
+
+EPS = 1e-12
+
+
+def quaternion_depuis_matrice(R):
+    """ Matrices de rotation (..., 3, 3) -> quaternions unitaires (..., 4), w >= 0. """
+    R = np.asarray(R, dtype=float)
+    m00, m11, m22 = R[..., 0, 0], R[..., 1, 1], R[..., 2, 2]
+
+    # Quatre formules (Shepperd) : on retient celle de plus grand pivot, numériquement stable
+    candidats = np.stack((
+        np.stack((1 + m00 + m11 + m22, R[..., 2, 1] - R[..., 1, 2],
+                  R[..., 0, 2] - R[..., 2, 0], R[..., 1, 0] - R[..., 0, 1]), axis=-1),
+        np.stack((R[..., 2, 1] - R[..., 1, 2], 1 + m00 - m11 - m22,
+                  R[..., 0, 1] + R[..., 1, 0], R[..., 0, 2] + R[..., 2, 0]), axis=-1),
+        np.stack((R[..., 0, 2] - R[..., 2, 0], R[..., 0, 1] + R[..., 1, 0],
+                  1 - m00 + m11 - m22, R[..., 1, 2] + R[..., 2, 1]), axis=-1),
+        np.stack((R[..., 1, 0] - R[..., 0, 1], R[..., 0, 2] + R[..., 2, 0],
+                  R[..., 1, 2] + R[..., 2, 1], 1 - m00 - m11 + m22), axis=-1),
+    ), axis=-2)  # (..., 4 formules, 4 composantes)
+    pivots = np.stack((1 + m00 + m11 + m22, 1 + m00 - m11 - m22, 1 - m00 + m11 - m22, 1 - m00 - m11 + m22), axis=-1)
+    choix = np.argmax(pivots, axis=-1)
+
+    Q = np.take_along_axis(candidats, choix[..., None, None], axis=-2)[..., 0, :]
+    Q = Q / np.linalg.norm(Q, axis=-1, keepdims=True)
+    return np.where(Q[..., :1] < 0, -Q, Q)
+
+
+def matrice_depuis_quaternion(Q):
+    """ Quaternions (..., 4) -> matrices de rotation (..., 3, 3). """
+    Q = np.asarray(Q, dtype=float)
+    w, x, y, z = np.moveaxis(Q / np.linalg.norm(Q, axis=-1, keepdims=True), -1, 0)
+    return np.stack((
+        np.stack((1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)), axis=-1),
+        np.stack((2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)), axis=-1),
+        np.stack((2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)), axis=-1),
+    ), axis=-2)
+
+
+def slerp(Q0, Q1, u):
+    """
+    Interpolation sphérique de Q0 (u = 0) à Q1 (u = 1), par le plus court chemin,
+    pour un tableau de paramètres u (N,) -> quaternions (N, 4).
+    """
+    Q0 = np.asarray(Q0, dtype=float)
+    Q1 = np.asarray(Q1, dtype=float)
+    u = np.asarray(u, dtype=float)[:, None]
+
+    produit = Q0 @ Q1
+    if produit < 0:  # q et -q : même rotation, on prend l'arc le plus court
+        Q1, produit = -Q1, -produit
+    theta = np.arccos(min(produit, 1.0))
+    if np.sin(theta) < 1e-9:  # Orientations confondues : interpolation linéaire
+        Q = (1 - u) * Q0 + u * Q1
+    else:
+        Q = (np.sin((1 - u) * theta) * Q0 + np.sin(u * theta) * Q1) / np.sin(theta)
+    return Q / np.linalg.norm(Q, axis=1, keepdims=True)
+
+
+def vecteur_rotation(R):
+    """
+    Logarithme des rotations (..., 3, 3) : vecteur axe * angle (..., 3), angle dans [0, pi].
+    """
+    Q = quaternion_depuis_matrice(R)
+    w, v = Q[..., 0], Q[..., 1:]
+    norme_v = np.linalg.norm(v, axis=-1)
+    angle = 2 * np.arctan2(norme_v, w)
+    facteur = np.where(norme_v > EPS, angle / np.maximum(norme_v, EPS), 2.0)  # Petits angles : 2 v
+    return v * facteur[..., None]
+
+
+def erreur_orientation(R_consigne, R_robot):
+    """
+    Erreur d'orientation (..., 3) dans le repère de base : vecteur de rotation de
+    R_consigne . R_robot^T (rotation qui amène l'outil sur la consigne).
+    """
+    return vecteur_rotation(np.asarray(R_consigne) @ np.swapaxes(R_robot, -1, -2))
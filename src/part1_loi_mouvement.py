@@ -1,11 +1,11 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
+from src.instrumentation import chronometre
+from src.rendu_figures import rendu_figure, terminer_figure, reduire_series
 
-def calcul_loi_mouvement(R, V, dt=0.005):
-    """
-    V.1 : Calcule la loi de mouvement s(t), s_dot(t), s_ddot(t) pour le profil A->B->C->A.
-    """
+
+def _commutations_loi_mouvement(R, V):
+    """ Accélération, décélération et temps de commutation (t1, t2, tf) du profil A->B->C->A. """
     # Phase 1: Accélération (A->B, quart de tour)
     dist_acc = (np.pi * R) / 2
     acc = V ** 2 / (2 * dist_acc)
@@ -22,40 +22,109 @@ def calcul_loi_mouvement(R, V, dt=0.005):
     dt_dec = V / dec
     tf = t2 + dt_dec
 
+    return acc, dec, (t1, t2, tf)
+
+
+def evaluer_loi_mouvement(temps, R, V):
+    """
+    Loi de mouvement V.1 évaluée (de façon vectorisée) sur un vecteur temps quelconque,
+    par exemple une fenêtre d'une trajectoire trop longue pour être calculée d'un bloc.
+
+    Returns:
+        s, s_dot, s_ddot, (t1, t2, tf)
+    """
+    acc, dec, (t1, t2, tf) = _commutations_loi_mouvement(R, V)
+    dist_acc = (np.pi * R) / 2
+    t = np.asarray(temps, dtype=float)
+
+    s = np.empty_like(t)
+    s_dot = np.empty_like(t)
+    s_ddot = np.empty_like(t)
+
+    # Accélération
+    phase = t <= t1
+    s_ddot[phase] = acc
+    s_dot[phase] = acc * t[phase]
+    s[phase] = 0.5 * acc * t[phase] ** 2
+
+    # Vitesse constante
+    phase = (t > t1) & (t <= t2)
+    s_ddot[phase] = 0
+    s_dot[phase] = V
+    s[phase] = dist_acc + V * (t[phase] - t1)
+
+    # Décélération (saturation en fin de tour)
+    phase = t > t2
+    t_rel = t[phase] - t2
+    s_ddot[phase] = -dec
+    s_dot[phase] = np.maximum(V - dec * t_rel, 0)
+    s[phase] = np.minimum(2 * dist_acc + V * t_rel - 0.5 * dec * t_rel ** 2, 2 * np.pi * R)
+
+    return s, s_dot, s_ddot, (t1, t2, tf)
+
+
+@chronometre("loi_mouvement")
+def calcul_loi_mouvement(R, V, dt=0.005):
+    """
+    V.1 : Calcule la loi de mouvement s(t), s_dot(t), s_ddot(t) pour le profil A->B->C->A.
+    """
+    _, _, (t1, t2, tf) = _commutations_loi_mouvement(R, V)
+
     # Vecteur temps
     N = int(tf / dt) + 1
     time = np.linspace(0, tf, N)
 
-    s = np.zeros_like(time)
-    s_dot = np.zeros_like(time)
-    s_ddot = np.zeros_like(time)
-
-    for i, t in enumerate(time):
-        if t <= t1:  # Accélération
-            s_ddot[i] = acc
-            s_dot[i] = acc * t
-            s[i] = 0.5 * acc * t ** 2
-        elif t <= t2:  # Vitesse constante
-            s_t1 = dist_acc
-            s_ddot[i] = 0
-            s_dot[i] = V
-            s[i] = s_t1 + V * (t - t1)
-        else:  # Décélération
-            s_t2 = dist_acc + dist_const
-            t_rel = t - t2
-            s_ddot[i] = -dec
-            s_dot[i] = V - dec * t_rel
-            s[i] = s_t2 + V * t_rel - 0.5 * dec * t_rel ** 2
-
-            if s_dot[i] < 0: s_dot[i] = 0
-            if s[i] > 2 * np.pi * R: s[i] = 2 * np.pi * R  # Saturation fin
+    s, s_dot, s_ddot, _ = evaluer_loi_mouvement(time, R, V)
 
     # Retourne les vecteurs et les temps de commutation
     return time, s, s_dot, s_ddot, (t1, t2, tf)
 
 
+def loi_trapezoidale(temps, L, V, A):
+    """
+    Loi de mouvement trapézoïdale générique (accélération A, palier V, décélération A)
+    pour parcourir une distance L. Évaluée de façon vectorisée sur un vecteur temps
+    quelconque (avant 0 : repos en s=0, après tf : repos en s=L).
+    Si L est trop court pour atteindre V, le profil devient triangulaire.
+
+    Returns:
+        s, s_dot, s_ddot, (t1, t2, tf)
+    """
+    t_acc = V / A
+    if V * t_acc > L:
+        # Profil triangulaire : on n'atteint jamais V
+        V = np.sqrt(L * A)
+        t_acc = V / A
+
+    t1 = t_acc
+    t2 = t1 + (L - V * t_acc) / V
+    tf = t2 + t_acc
+
+    t = np.clip(np.asarray(temps, dtype=float), 0.0, tf)
+    t_dec = np.clip(t - t2, 0.0, None)
+
+    phase_acc = t <= t1
+    phase_dec = t > t2
+
+    s_ddot = np.where(phase_acc, A, np.where(phase_dec, -A, 0.0))
+    s_dot = np.where(phase_acc, A * t, np.where(phase_dec, V - A * t_dec, V))
+    s = np.where(phase_acc, 0.5 * A * t ** 2,
+                 np.where(phase_dec, 0.5 * V * t1 + V * (t2 - t1) + V * t_dec - 0.5 * A * t_dec ** 2,
+                          0.5 * V * t1 + V * (t - t1)))
+
+    # Repos hors de [0, tf]
+    hors = (np.asarray(temps) < 0) | (np.asarray(temps) > tf)
+    s_dot = np.where(hors, 0.0, s_dot)
+    s_ddot = np.where(hors, 0.0, s_ddot)
+
+    return s, s_dot, s_ddot, (t1, t2, tf)
+
+
+@rendu_figure("loi_mouvement")
 def afficher_courbes_loi_mouvement(time, s, s_dot, s_ddot, temps_commutation):
+    import matplotlib.pyplot as plt
     t1, t2, tf = temps_commutation
+    time, s, s_dot, s_ddot = reduire_series(time, s, s_dot, s_ddot)
     plt.figure(figsize=(10, 8))
 
     plt.subplot(3, 1, 1)
@@ -80,4 +149,4 @@ def afficher_courbes_loi_mouvement(time, s, s_dot, s_ddot, temps_commutation):
     plt.grid(True)
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    terminer_figure()
\ No newline at end of file
@@ -1,7 +1,10 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
+from src.instrumentation import chronometre
+from src.rendu_figures import rendu_figure, terminer_figure, reduire_series
 
+
+@chronometre("trajectoire_operationnelle")
 def calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot):
     """
     V.2 : Calcule X(t), dX(t), ddX(t) dans l'espace opérationnel.
@@ -31,8 +34,11 @@ def calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot):
     return X, dX, ddX
 
 
+@rendu_figure("trajectoire_operationnelle")
 def afficher_courbes_operationnelles(time, X, dX, ddX, Center, Rayon):
     """ Affiche les profils X, Z et la 3D """
+    import matplotlib.pyplot as plt
+    time, X = reduire_series(time, X)
     fig = plt.figure(figsize=(12, 8))
 
     # Position X
@@ -53,4 +59,4 @@ def afficher_courbes_operationnelles(time, X, dX, ddX, Center, Rayon):
     ax3d.legend()
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    terminer_figure(fig)
\ No newline at end of file
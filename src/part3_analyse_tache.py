@@ -1,10 +1,13 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from src.rendu_figures import rendu_figure, terminer_figure, reduire_series
 
 
 from src.const_v import dh
-from src.matrice_tn import generate_transformation_matrices, calcul_T06_global
-from src.modele_differentiel import Jacob_geo
+from src.instrumentation import chronometre
+from src.matrice_tn import generate_transformation_matrices_batch, calcul_T0i_batch
+from src.modele_differentiel import Jacob_geo_batch
+from src.orientation import erreur_orientation
 
 
 
@@ -15,12 +18,15 @@ def calcul_vitesse_OE(dX):
     return np.linalg.norm(dX, axis=1)
 
 
+@rendu_figure("tache_X_t")
 def afficher_tache_X_t(time, X, dX, ddX, v_norm, temps_commutation=None):
     """
     Affiche les courbes demandées pour le module V.3.
     Si temps_commutation est fourni (t1, t2, tf), on affiche les temps de
     commutation t1 et t2 sur les courbes.
     """
+    import matplotlib.pyplot as plt
+    time, X, dX, ddX, v_norm = reduire_series(time, X, dX, ddX, v_norm)
     fig, axes = plt.subplots(2, 2, figsize=(12, 10))
 
     # Position
@@ -61,34 +67,28 @@ def afficher_tache_X_t(time, X, dX, ddX, v_norm, temps_commutation=None):
             axe.axvline(t2, color='k', ls='--', alpha=0.5)
 
     plt.tight_layout()
-    plt.show()
+    terminer_figure(fig)
 
 
+@chronometre("analyse_erreurs")
 def calcul_X_robot_et_erreurs(temps, X_consigne, dX_consigne, q, q_point):
     """
     À partir de la trajectoire articulaire (q, q_point), on recalcule :
       - la position de l'outil X_robot(t) via la MGD,
       - la vitesse de l'outil dX_robot(t) via la jacobienne,
     puis on renvoie les erreurs par rapport aux consignes.
+    Calcul vectorisé sur toute la trajectoire (pas de boucle par échantillon).
     """
-    nb_points = len(temps)
-
-    X_robot = np.zeros_like(X_consigne)
-    dX_robot = np.zeros_like(dX_consigne)
+    q = np.asarray(q, dtype=float)
+    q_point = np.asarray(q_point, dtype=float)
 
-    for i in range(nb_points):
-        q_i = q[i, :]
-        q_point_i = q_point[i, :]
+    # MGD sur toute la trajectoire en un seul appel : T0i de chaque échantillon
+    T_abs = calcul_T0i_batch(generate_transformation_matrices_batch(q, dh))
+    X_robot = T_abs[:, -1, :3, 3]
 
-        # MGD : position de l'outil
-        matrices = generate_transformation_matrices(q_i, dh)
-        T06 = calcul_T06_global(matrices)
-        X_robot[i, :] = T06[:3, 3]
-
-        # Modèle différentiel : vitesse de l'outil
-        J = Jacob_geo(matrices)
-        J_v = J[:3, :]   # partie linéaire
-        dX_robot[i, :] = J_v.dot(q_point_i)
+    # Modèle différentiel : dX = J_v(q) . q_point, échantillon par échantillon (einsum)
+    J_v = Jacob_geo_batch(T_abs)[:, :3, :]   # partie linéaire (N, 3, 6)
+    dX_robot = np.einsum('nij,nj->ni', J_v, q_point)
 
     # Erreurs
     erreur_X = X_consigne - X_robot
@@ -97,10 +97,76 @@ def calcul_X_robot_et_erreurs(temps, X_consigne, dX_consigne, q, q_point):
     return X_robot, dX_robot, erreur_X, erreur_dX
 
 
+@chronometre("analyse_orientation")
+def calcul_orientation_et_erreurs(temps, R_consigne, omega_consigne, q, q_point, dh_params=dh):
+    """
+    Pendant de calcul_X_robot_et_erreurs pour l'orientation de l'outil (vectorisé) :
+      - orientation R_robot(t) (N, 3, 3) via la MGD,
+      - vitesse angulaire omega_robot(t) = J_w(q) . q_point,
+    et erreurs par rapport aux consignes : erreur_R est le vecteur de rotation
+    (axe * angle, rad, repère de base) de R_consigne . R_robot^T.
+    """
+    q = np.asarray(q, dtype=float)
+    q_point = np.asarray(q_point, dtype=float)
+
+    T_abs = calcul_T0i_batch(generate_transformation_matrices_batch(q, dh_params))
+    R_robot = T_abs[:, -1, :3, :3]
+    J_w = Jacob_geo_batch(T_abs)[:, 3:, :]   # partie angulaire (N, 3, 6)
+    omega_robot = np.einsum('nij,nj->ni', J_w, q_point)
+
+    erreur_R = erreur_orientation(R_consigne, R_robot)
+    erreur_omega = omega_consigne - omega_robot
+
+    return R_robot, omega_robot, erreur_R, erreur_omega
+
+
+def _statistiques_erreur(temps, erreur, percentiles):
+    """ Statistiques par axe d'un tableau d'erreurs (N, 3). """
+    abs_err = np.abs(erreur)
+    i_pire = np.argmax(abs_err, axis=0)
+    norme = np.linalg.norm(erreur, axis=1)
+    stats = {
+        "rms": np.sqrt(np.mean(erreur ** 2, axis=0)),
+        "max": abs_err[i_pire, np.arange(erreur.shape[1])],
+        "t_max": np.asarray(temps)[i_pire],
+        "norme_max": np.max(norme),
+        "t_norme_max": np.asarray(temps)[np.argmax(norme)],
+    }
+    for p in percentiles:
+        stats[f"p{p:g}"] = np.percentile(abs_err, p, axis=0)
+    return stats
+
+
+def rapport_erreurs(temps, erreur_X, erreur_dX, percentiles=(50, 95, 99), erreur_R=None, erreur_omega=None):
+    """
+    Rapport d'erreurs sans affichage (exploitable en validation automatique).
+    Pour la position et la vitesse (et l'orientation / la vitesse angulaire si
+    erreur_R / erreur_omega sont fournies), et pour chaque axe (x, y, z) :
+      - rms, max (valeur absolue) et instant t_max de la pire erreur,
+      - percentiles de |e| (clés 'p50', 'p95', ...),
+      - norme_max / t_norme_max : pire erreur en norme euclidienne.
+
+    Returns:
+        dict {'position': {...}, 'vitesse': {...}[, 'orientation': {...}, 'vitesse_angulaire': {...}]}
+    """
+    rapport = {
+        "position": _statistiques_erreur(temps, erreur_X, percentiles),
+        "vitesse": _statistiques_erreur(temps, erreur_dX, percentiles),
+    }
+    if erreur_R is not None:
+        rapport["orientation"] = _statistiques_erreur(temps, erreur_R, percentiles)
+    if erreur_omega is not None:
+        rapport["vitesse_angulaire"] = _statistiques_erreur(temps, erreur_omega, percentiles)
+    return rapport
+
+
+@rendu_figure("erreurs_X")
 def afficher_erreurs_X(temps, erreur_X, erreur_dX):
     """
     Affiche les erreurs sur X(t) et Xdot(t) sous forme de deux sous-graphiques.
     """
+    import matplotlib.pyplot as plt
+    temps, erreur_X, erreur_dX = reduire_series(temps, erreur_X, erreur_dX)
     fig, axes = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
 
     # Erreurs de position
@@ -123,4 +189,4 @@ def afficher_erreurs_X(temps, erreur_X, erreur_dX):
     axes[1].legend()
 
     plt.tight_layout()
-    plt.show()
+    terminer_figure(fig)
@@ -1,67 +1,152 @@
+import time as chrono
+
 import numpy as np
-import matplotlib.pyplot as plt
+
+from src.rendu_figures import rendu_figure, terminer_figure, reduire_series
 
 # Imports internes des autres modules du projet
+from src import instrumentation
 from src.const_v import dh
+from src.limites_articulaires import ControleLimites
 from src.matrice_tn import generate_transformation_matrices
 from src.modele_differentiel import Jacob_geo, MGI_numerique
+from src.modeles_robot import modele_robot
 
 # Imports des parties V.1 et V.2 (Refactoring)
 from src.part1_loi_mouvement import calcul_loi_mouvement
 from src.part2_trajectoire_operationnelle import calcul_trajectoire_operationnelle
 
 
-def traj(O, R, V, Debug=False):
+# État initial estimé pour le MGI (bras levé, coude plié)
+Q_INIT_DEFAUT = np.array([0.0, np.pi / 2, -np.pi / 4, 0.0, -np.pi / 2, 0.0])
+
+
+def parametres_robot(robot=None, limites=None):
     """
-    V.4 : Génération de mouvement dans l'espace articulaire.
-    Combine V.1, V.2 et les modèles inverses pour sortir q(t).
+    Paramètres DH et limites à contrôler pour un robot.
+    Sans robot : DH de l'UR3 (const_v.dh) et 'limites' inchangées (None = aucun contrôle).
+    Avec un robot (nom ou ModeleRobot) : ses DH et, si limites est None, ses propres limites.
 
     Returns:
-        time, q, qp, qpp
+        dh_params, limites
     """
-    # 1. Génération de la consigne opérationnelle (Appel aux parties V.1 et V.2)
-    # Note: On récupère le tuple des temps dans '_' mais on ne l'utilise pas ici
-    time, s, s_dot, s_ddot, _ = calcul_loi_mouvement(R, V)
+    if robot is None:
+        return dh, limites
+    modele = modele_robot(robot)
+    return modele.dh, modele.limites if limites is None else limites
 
-    X_ref, dX_ref, ddX_ref = calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot)
 
-    N = len(time)
-    dt = time[1] - time[0]
+@instrumentation.chronometre("trajectoire_articulaire")
+def calcul_trajectoire_articulaire(X_ref, dX_ref, dt, q_init=None, q=None, qp=None, limites=None, dh_params=dh,
+                                   Debug=False):
+    """
+    Convertit une consigne opérationnelle (X_ref, dX_ref) en trajectoire articulaire :
+    MGI pour la position, MDI (pseudo-inverse de J_v) pour la vitesse.
+    Chaque MGI est initialisé par la solution de l'échantillon précédent.
+
+    Args:
+        q_init: graine du premier MGI (par défaut Q_INIT_DEFAUT).
+        q, qp: tableaux (N, 6) préalloués à remplir (optionnels).
+        limites: limites articulaires (ex. const_v.limites_articulaires) contrôlées pendant
+                 le calcul : DepassementLimite est levée au premier dépassement.
+        dh_params: paramètres DH du robot (UR3 par défaut).
+
+    Returns:
+        q, qp, qpp
+    """
+    N = len(X_ref)
 
     # Tableaux de sortie
-    q = np.zeros((N, 6))
-    qp = np.zeros((N, 6))
+    if q is None:
+        q = np.zeros((N, 6))
+    if qp is None:
+        qp = np.zeros((N, 6))
 
-    # État initial estimé pour le MGI
-    q_prev = np.array([0.0, np.pi / 2, -np.pi / 4, 0.0, -np.pi / 2, 0.0])
+    q_prev = np.array(Q_INIT_DEFAUT if q_init is None else q_init, dtype=float)
 
     if Debug: print(f"Calcul de la trajectoire articulaire ({N} points)...")
 
-    for i in range(N):
+    controle = None if limites is None else ControleLimites(dt, limites)
+    resoudre_points_articulaires(X_ref, dX_ref, q, qp, q_prev, Debug=Debug, controle=controle, dh_params=dh_params)
+    if controle is not None:
+        controle.terminer()
+
+    # C. Accélération (Dérivation numérique)
+    qpp = np.gradient(qp, dt, axis=0)
+
+    return q, qp, qpp
+
+
+def resoudre_points_articulaires(X_ref, dX_ref, q, qp, q_prev, Debug=False, controle=None, dh_params=dh):
+    """
+    MGI (position) et MDI (vitesse) échantillon par échantillon, écrits en place dans q et qp.
+    Chaque MGI est initialisé par la solution de l'échantillon précédent, le premier par q_prev.
+    controle (optionnel) est appelé sur chaque (q_i, qp_i) et peut interrompre le calcul
+    en levant une exception (voir limites_articulaires.ControleLimites).
+
+    Returns:
+        dernière solution (graine du MGI de l'échantillon suivant)
+    """
+    for i in range(len(X_ref)):
         # A. Position Articulaire (MGI)
-        q_sol = MGI_numerique(X_ref[i], q_prev, dh, max_iter=20, alpha=0.8, tol=1e-5)
+        q_sol = MGI_numerique(X_ref[i], q_prev, dh_params, max_iter=20, alpha=0.8, tol=1e-5)
 
         if q_sol is None:
             if Debug: print(f"Warn: MGI non convergé itération {i}")
+            if instrumentation.ACTIF: instrumentation.compter("repli_q_prev")
             q_sol = q_prev
 
         q[i, :] = q_sol
         q_prev = q_sol
 
         # B. Vitesse Articulaire (MDI / Jacobienne)
-        mats = generate_transformation_matrices(q_sol, dh)
+        if instrumentation.ACTIF: t0 = chrono.perf_counter()
+        mats = generate_transformation_matrices(q_sol, dh_params)
         J = Jacob_geo(mats)
         J_v = J[:3, :]  # Partie linéaire
         qp[i, :] = np.dot(np.linalg.pinv(J_v), dX_ref[i])
+        if instrumentation.ACTIF: instrumentation.enregistrer_duree("mdi", chrono.perf_counter() - t0)
 
-    # C. Accélération (Dérivation numérique)
-    qpp = np.gradient(qp, dt, axis=0)
+        if controle is not None:
+            controle(q[i], qp[i])
+
+    instrumentation.compter("points", len(X_ref))
+    return q_prev
+
+
+@instrumentation.chronometre("traj")
+def traj(O, R, V, Debug=False, dt=0.005, limites=None, robot=None):
+    """
+    V.4 : Génération de mouvement dans l'espace articulaire.
+    Combine V.1, V.2 et les modèles inverses pour sortir q(t).
+    dt : période d'échantillonnage de la trajectoire (s).
+    limites : limites articulaires contrôlées pendant le MGI (arrêt au premier dépassement).
+    robot : nom du modèle ("UR3", "UR5", "UR10", voir modeles_robot) ou ModeleRobot ; UR3 par défaut.
+            Avec un robot, limites=None contrôle les limites du modèle (voir parametres_robot).
+
+    Returns:
+        time, q, qp, qpp
+    """
+    # 1. Génération de la consigne opérationnelle (Appel aux parties V.1 et V.2)
+    # Note: On récupère le tuple des temps dans '_' mais on ne l'utilise pas ici
+    time, s, s_dot, s_ddot, _ = calcul_loi_mouvement(R, V, dt)
+
+    X_ref, dX_ref, ddX_ref = calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot)
+
+    dt = time[1] - time[0]
+
+    # 2. Conversion en trajectoire articulaire (MGI + MDI)
+    dh_params, limites = parametres_robot(robot, limites)
+    q, qp, qpp = calcul_trajectoire_articulaire(X_ref, dX_ref, dt, limites=limites, dh_params=dh_params, Debug=Debug)
 
     return time, q, qp, qpp
 
 
+@rendu_figure("resultats_articulaires")
 def plot_resultats_articulaires(time, q, qp, qpp, temps_commutation=None):
     """ Affiche les courbes q, q_dot, q_ddot (avec temps de commutation si fournis) """
+    import matplotlib.pyplot as plt
+    time, q, qp, qpp = reduire_series(time, q, qp, qpp)
 
     fig, axes = plt.subplots(3, 1, figsize=(10, 12), sharex=True)
     labels = [f'q{i + 1}' for i in range(6)]
@@ -98,4 +183,4 @@ def plot_resultats_articulaires(time, q, qp, qpp, temps_commutation=None):
             axe.axvline(t2, color='k', ls='--', alpha=0.5)
 
     plt.tight_layout()
-    plt.show()
+    terminer_figure(fig)
@@ -5,13 +5,20 @@ Created on Wed Nov  5 11:24:20 2025
 
 @author: taix
 """
-import matplotlib.pyplot as plt
 import pybullet as p
 import numpy as np
 
+from src.rendu_figures import rendu_figure, terminer_figure, reduire_series
+
+# Couleurs des axes X, Y, Z des repères (R, G, B)
+COULEURS_AXES = ([1, 0, 0], [0, 1, 0], [0, 0, 1])
+
 
 #############################################
+@rendu_figure("loi_mvt")
 def afficheloi_mvt(s,ds,dds,temps,tc):
+    import matplotlib.pyplot as plt
+    temps, s, ds, dds = reduire_series(temps, s, ds, dds)
     fig, axes = plt.subplots(nrows=3,ncols=1)
 
     axes[0].plot(temps, s, "r-", label=" s(t) ")
@@ -31,7 +38,7 @@ def afficheloi_mvt(s,ds,dds,temps,tc):
     axes[2].set_title('Fonction dds(t)')
     plt.tight_layout()
     plt.legend()
-    plt.show()
+    terminer_figure(fig)
 ######################################################
 # affichage de 3 subplots
 # INPUT: 
@@ -42,7 +49,10 @@ def afficheloi_mvt(s,ds,dds,temps,tc):
 # OUTPUT:
 #       affiche les 3 courbes avec les instants de commutation
 ################################################################
+@rendu_figure("3courbes")
 def affichage3courbes(t, tim, f1, ref1, f2, ref2, f3, ref3):
+    import matplotlib.pyplot as plt
+    tim, f1, f2, f3 = reduire_series(tim, f1, f2, f3)
     fig, axes = plt.subplots(nrows=3,ncols=1)
 
     axes[0].plot(tim, f1, "r-")
@@ -62,10 +72,11 @@ def affichage3courbes(t, tim, f1, ref1, f2, ref2, f3, ref3):
     axes[2].set_title('Fonction' + ref3)
     plt.tight_layout()
     
-    plt.show()
+    terminer_figure(fig)
     return
 ##########################################################################
 def plot3figures(time,f,g,h) :
+    import matplotlib.pyplot as plt
     fig = plt.figure()
     
     plt.subplot(3,1,1)
@@ -90,26 +101,14 @@ def draw_coordinate_frame(pos, orn, length=1.0):
     :return: Une liste des IDs des lignes de débogage.
     """
     
-    # Convertir le quaternion en matrice de rotation pour obtenir les vecteurs des axes
-    rot_matrix = np.array(p.getMatrixFromQuaternion(orn)).reshape(3, 3)
-    
-    # Vecteurs de base du repère dans son propre référentiel
-    base_x = np.array([1, 0, 0])
-    base_y = np.array([0, 1, 0])
-    base_z = np.array([0, 0, 1])
-    
-    # Calculer les vecteurs des axes dans le référentiel monde
-    axis_x = pos + rot_matrix @ (base_x * length)
-    axis_y = pos + rot_matrix @ (base_y * length)
-    axis_z = pos + rot_matrix @ (base_z * length)
-    
-    # Convertir la position en tableau NumPy si ce n'est pas déjà le cas pour les opérations
-    pos_np = np.array(pos)
+    # Extrémités des trois axes : colonnes de la matrice de rotation
+    pos_np = np.array(pos, dtype=float)
+    extremites = pos_np + length * quaternions_vers_matrices(orn)[0].T
     
     # Tracer les axes avec des couleurs différentes (R, G, B)
-    line_id_x = p.addUserDebugLine(pos_np, axis_x, lineColorRGB=[1, 0, 0], lineWidth=2) # Rouge pour X
-    line_id_y = p.addUserDebugLine(pos_np, axis_y, lineColorRGB=[0, 1, 0], lineWidth=2) # Vert pour Y
-    line_id_z = p.addUserDebugLine(pos_np, axis_z, lineColorRGB=[0, 0, 1], lineWidth=2) # Bleu pour Z
+    line_id_x = p.addUserDebugLine(pos_np, extremites[0], lineColorRGB=COULEURS_AXES[0], lineWidth=2) # Rouge pour X
+    line_id_y = p.addUserDebugLine(pos_np, extremites[1], lineColorRGB=COULEURS_AXES[1], lineWidth=2) # Vert pour Y
+    line_id_z = p.addUserDebugLine(pos_np, extremites[2], lineColorRGB=COULEURS_AXES[2], lineWidth=2) # Bleu pour Z
     
     return [line_id_x, line_id_y, line_id_z]
 
@@ -134,19 +133,17 @@ def draw_coordinate_frame(pos, orn, length=1.0):
 ###############################################################################
 def update_joint_frame(robotId, jointIndex, line_ids, length=0.2):
     """
-    Supprime le repère précédent et dessine un nouveau repère sur le joint spécifié.
+    Met à jour le repère dessiné sur le joint spécifié.
+    Les lignes existantes sont modifiées en place (replaceItemUniqueId) au lieu
+    d'être supprimées puis recréées ; au premier appel (line_ids vide) elles sont créées.
     
     :param robotId: ID du robot.
     :param jointIndex: Index du joint/link cible.
-    :param line_ids: Liste des IDs des lignes du repère précédent (pour la suppression).
+    :param line_ids: Liste des IDs des lignes du repère précédent (vide au premier appel).
     :param length: Longueur des axes du repère.
-    :return: Nouvelle liste des IDs des lignes du repère.
+    :return: Liste des IDs des lignes du repère.
     """
-    # 1. Suppression des lignes précédentes
-    for line_id in line_ids:
-        p.removeUserDebugItem(line_id)
-        
-    # 2. Récupération de la pose actuelle du link
+    # 1. Récupération de la pose actuelle du link
     try:
         link_state = p.getLinkState(robotId, jointIndex)
         pos = link_state[0]
@@ -155,19 +152,105 @@ def update_joint_frame(robotId, jointIndex, line_ids, length=0.2):
         print(f"Erreur : Joint/Link {jointIndex} introuvable.")
         return []
 
-    # 3. Dessin du nouveau repère
-    
-    # Calcul des vecteurs des axes (similaire à la fonction draw_coordinate_frame)
-    rot_matrix = np.array(p.getMatrixFromQuaternion(orn)).reshape(3, 3)
-    pos_np = np.array(pos)
-    
-    axis_x = pos_np + rot_matrix @ (np.array([1, 0, 0]) * length)
-    axis_y = pos_np + rot_matrix @ (np.array([0, 1, 0]) * length)
-    axis_z = pos_np + rot_matrix @ (np.array([0, 0, 1]) * length)
-    
-    # Tracer les axes
-    line_id_x = p.addUserDebugLine(pos_np, axis_x, lineColorRGB=[1, 0, 0], lineWidth=3, lifeTime=0)
-    line_id_y = p.addUserDebugLine(pos_np, axis_y, lineColorRGB=[0, 1, 0], lineWidth=3, lifeTime=0)
-    line_id_z = p.addUserDebugLine(pos_np, axis_z, lineColorRGB=[0, 0, 1], lineWidth=3, lifeTime=0)
-    
-    return [line_id_x, line_id_y, line_id_z]
+    # 2. Extrémités des axes (colonnes de la matrice de rotation)
+    pos_np = np.array(pos, dtype=float)
+    extremites = pos_np + length * quaternions_vers_matrices(orn)[0].T
+
+    # 3. Tracé : remplacement des lignes précédentes s'il y en a
+    remplacer = list(line_ids) if len(line_ids) == 3 else [-1, -1, -1]
+    return [p.addUserDebugLine(pos_np, extremites[k], lineColorRGB=COULEURS_AXES[k], lineWidth=3,
+                               lifeTime=0, replaceItemUniqueId=remplacer[k])
+            for k in range(3)]
+
+###############################################################################
+def quaternions_vers_matrices(quaternions):
+    """
+    Matrices de rotation (N, 3, 3) de quaternions PyBullet [qx, qy, qz, qw] ((4,) ou (N, 4)),
+    calculées en une seule opération (sans appel à getMatrixFromQuaternion par quaternion).
+    """
+    quaternions = np.atleast_2d(np.asarray(quaternions, dtype=float))
+    x, y, z, w = quaternions.T
+
+    R = np.empty((len(quaternions), 3, 3))
+    R[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    R[:, 0, 1] = 2 * (x * y - z * w)
+    R[:, 0, 2] = 2 * (x * z + y * w)
+    R[:, 1, 0] = 2 * (x * y + z * w)
+    R[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    R[:, 1, 2] = 2 * (y * z - x * w)
+    R[:, 2, 0] = 2 * (x * z - y * w)
+    R[:, 2, 1] = 2 * (y * z + x * w)
+    R[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return R
+
+
+class ReperesLiens:
+    """
+    Repères (X, Y, Z) affichés sur plusieurs liens du robot, mis à jour en place.
+
+    Les 3 lignes par lien sont créées au premier rafraîchissement puis seulement
+    déplacées (replaceItemUniqueId) ; les poses de tous les liens sont lues en un
+    appel (getLinkStates) et les extrémités des axes calculées en une opération.
+    Avec decimation = k, seul un appel à mettre_a_jour sur k redessine les repères :
+    l'affichage ne ralentit plus la boucle de simulation.
+
+    :param robot_id: ID du robot.
+    :param liens: indices des liens à afficher.
+    :param longueur: longueur des axes (m).
+    :param decimation: un rafraîchissement tous les 'decimation' appels.
+    :param largeur: épaisseur des lignes.
+    """
+
+    def __init__(self, robot_id, liens, longueur=0.2, decimation=1, largeur=3, physicsClientId=0):
+        if decimation < 1:
+            raise ValueError("La décimation doit être un entier >= 1.")
+
+        self.robot_id = robot_id
+        self.liens = list(liens)
+        self.longueur = longueur
+        self.decimation = int(decimation)
+        self.largeur = largeur
+        self.physicsClientId = physicsClientId
+
+        self.line_ids = np.full((len(self.liens), 3), -1, dtype=int)
+        self.nb_appels = 0
+        self.nb_rafraichissements = 0
+
+    def poses(self):
+        """ Positions (L, 3) et matrices de rotation (L, 3, 3) des repères des liens. """
+        etats = p.getLinkStates(self.robot_id, self.liens, computeForwardKinematics=1,
+                                physicsClientId=self.physicsClientId)
+        positions = np.array([etat[4] for etat in etats])
+        rotations = quaternions_vers_matrices([etat[5] for etat in etats])
+        return positions, rotations
+
+    def mettre_a_jour(self, forcer=False):
+        """
+        Redessine les repères si l'appel tombe sur la décimation (ou si forcer).
+
+        :return: True si les repères ont été redessinés.
+        """
+        self.nb_appels += 1
+        if not forcer and (self.nb_appels - 1) % self.decimation != 0:
+            return False
+
+        positions, rotations = self.poses()
+        # Extrémité de l'axe k du lien l : position + longueur * colonne k de R
+        extremites = positions[:, None, :] + self.longueur * np.transpose(rotations, (0, 2, 1))
+
+        for l in range(len(self.liens)):
+            for k in range(3):
+                self.line_ids[l, k] = p.addUserDebugLine(
+                    positions[l], extremites[l, k], lineColorRGB=COULEURS_AXES[k],
+                    lineWidth=self.largeur, lifeTime=0, replaceItemUniqueId=int(self.line_ids[l, k]),
+                    physicsClientId=self.physicsClientId)
+
+        self.nb_rafraichissements += 1
+        return True
+
+    def supprimer(self):
+        """ Retire les lignes de l'affichage. """
+        for line_id in self.line_ids.ravel():
+            if line_id >= 0:
+                p.removeUserDebugItem(int(line_id), physicsClientId=self.physicsClientId)
+        self.line_ids[:] = -1
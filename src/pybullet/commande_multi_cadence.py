@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Architecture de commande multi-cadence.
+
+Trois niveaux, chacun avec sa propre fréquence :
+  - planificateur : consignes (q, qp) grossières, période dt de traj(),
+  - commande      : interpolation d'Hermite cubique des consignes, envoyée à
+                    setJointMotorControlArray à f_commande,
+  - physique      : pas de simulation à f_physique (multiple entier de f_commande).
+On peut ainsi régler la cadence de commande et celle de la physique sans
+régénérer la trajectoire avec un dt plus fin.
+"""
+import numpy as np
+import pybullet as p
+
+from src.const_v import dh
+from src.matrice_tn import generate_transformation_matrices_batch, calcul_T0i_batch
+from src.ordonnanceur import OrdonnanceurPeriodique
+from src.utils import derouler_angles, mgd_vers_simulation, simulation_vers_mgd, vitesse_mgd_vers_simulation
+
+
+def interpoler_hermite(t, temps, q, qp):
+    """
+    Interpolation d'Hermite cubique de (q, qp) aux instants t.
+    Utilise positions ET vitesses du planificateur : la consigne interpolée est C1
+    et passe exactement par les points planifiés (à 2 pi près : q est d'abord déroulé,
+    sinon un saut de 2 pi du MGI ferait balayer tout le tour à la consigne).
+
+    :param t: instants d'évaluation (scalaire ou tableau).
+    :param temps, q, qp: consignes du planificateur ((N,), (N, 6), (N, 6)).
+    :return: q_interp, qp_interp (tableaux (len(t), 6))
+    """
+    q = derouler_angles(q)
+    t = np.clip(np.atleast_1d(np.asarray(t, dtype=float)), temps[0], temps[-1])
+    k = np.clip(np.searchsorted(temps, t, side='right') - 1, 0, len(temps) - 2)
+
+    h = (temps[k + 1] - temps[k])[:, None]
+    u = (t[:, None] - temps[k][:, None]) / h
+
+    # Polynômes de base d'Hermite et leurs dérivées
+    h00 = 2 * u ** 3 - 3 * u ** 2 + 1
+    h10 = u ** 3 - 2 * u ** 2 + u
+    h01 = -2 * u ** 3 + 3 * u ** 2
+    h11 = u ** 3 - u ** 2
+    d00 = 6 * u ** 2 - 6 * u
+    d10 = 3 * u ** 2 - 4 * u + 1
+    d01 = -6 * u ** 2 + 6 * u
+    d11 = 3 * u ** 2 - 2 * u
+
+    q_interp = h00 * q[k] + h10 * h * qp[k] + h01 * q[k + 1] + h11 * h * qp[k + 1]
+    qp_interp = (d00 * q[k] + d01 * q[k + 1]) / h + d10 * qp[k] + d11 * qp[k + 1]
+    return q_interp, qp_interp
+
+
+def simulation_multi_cadence(robot_id, joint_indices, temps_plan, q_plan, qp_plan,
+                             f_commande=500, f_physique=2000, kp=0.5, kv=1.0,
+                             temps_reel=False, conversion=True, physicsClientId=0):
+    """
+    Exécute une trajectoire planifiée en découplant les trois cadences.
+
+    :param temps_plan, q_plan, qp_plan: sortie de traj() (convention MGD), à n'importe quel dt.
+    :param f_commande: fréquence (Hz) de la couche d'interpolation / commande.
+    :param f_physique: fréquence (Hz) des pas de simulation (multiple entier de f_commande).
+    :param temps_reel: cadence la couche de commande sur l'horloge (OrdonnanceurPeriodique).
+    :param conversion: False si l'URDF est déjà en convention MGD (ecrire_urdf_modele).
+    :return: dict {'temps', 'q_consigne', 'q_mesure', 'X_consigne', 'X_mesure', 'erreur', 'cadence'}
+    """
+    ratio = f_physique / f_commande
+    if abs(ratio - round(ratio)) > 1e-9 or ratio < 1:
+        raise ValueError("f_physique doit être un multiple entier de f_commande.")
+    ratio = int(round(ratio))
+
+    temps_plan = np.asarray(temps_plan, dtype=float)
+    p.setTimeStep(1.0 / f_physique, physicsClientId=physicsClientId)
+
+    # 1. Couche d'interpolation : consignes à la cadence de commande, en un seul calcul
+    temps = np.arange(temps_plan[0], temps_plan[-1] + 0.5 / f_commande, 1.0 / f_commande)
+    q_consigne, qp_consigne = interpoler_hermite(temps, temps_plan, np.asarray(q_plan), np.asarray(qp_plan))
+    if conversion:
+        q_cible_sim = mgd_vers_simulation(q_consigne)
+        qp_cible_sim = vitesse_mgd_vers_simulation(qp_consigne)
+    else:
+        q_cible_sim, qp_cible_sim = q_consigne, qp_consigne
+
+    # 2. Reset sur le premier point
+    for i, joint in enumerate(joint_indices):
+        p.resetJointState(robot_id, joint, q_cible_sim[0, i], physicsClientId=physicsClientId)
+
+    N = len(temps)
+    nb_axes = len(joint_indices)
+    q_mesure_sim = np.zeros((N, nb_axes))
+    ordonnanceur = OrdonnanceurPeriodique(1.0 / f_commande, nb_mesures=N) if temps_reel else None
+
+    # 3. Boucle de commande, 'ratio' pas physiques par tick
+    for i in range(N):
+        if ordonnanceur is not None:
+            ordonnanceur.attendre()
+
+        p.setJointMotorControlArray(robot_id, joint_indices, p.POSITION_CONTROL,
+                                    targetPositions=q_cible_sim[i],
+                                    targetVelocities=qp_cible_sim[i],
+                                    positionGains=[kp] * nb_axes,
+                                    velocityGains=[kv] * nb_axes,
+                                    physicsClientId=physicsClientId)
+        for _ in range(ratio):
+            p.stepSimulation(physicsClientId=physicsClientId)
+
+        states = p.getJointStates(robot_id, joint_indices, physicsClientId=physicsClientId)
+        q_mesure_sim[i] = [state[0] for state in states]
+
+    # 4. Analyse en batch après la boucle
+    q_mesure = simulation_vers_mgd(q_mesure_sim) if conversion else q_mesure_sim
+    X_consigne = calcul_T0i_batch(generate_transformation_matrices_batch(q_consigne, dh))[:, -1, :3, 3]
+    X_mesure = calcul_T0i_batch(generate_transformation_matrices_batch(q_mesure, dh))[:, -1, :3, 3]
+
+    return {"temps": temps, "q_consigne": q_consigne, "q_mesure": q_mesure,
+            "X_consigne": X_consigne, "X_mesure": X_mesure,
+            "erreur": np.linalg.norm(X_mesure - X_consigne, axis=1),
+            "cadence": ordonnanceur.statistiques() if ordonnanceur is not None else None}
@@ -6,19 +6,24 @@ Created on Tue Nov  4 14:48:07 2025
 @author: taix
 """
 import pybullet as p
-import time
 from src.pybullet import affiche
+from src.ordonnanceur import OrdonnanceurPeriodique
 
 F_CONTROL = 10000
 sleep_time = 1/F_CONTROL 
 
+# IDs des lignes du repère outil dessiné par setJointPosition, par robot
+_reperes_outil = {}
+
 def update_simulation(steps, sleep_time=0.0001):
      """
-     Update the simulation by stepping and waiting for a specified time.
+     Update the simulation by stepping at a fixed rate (one step every sleep_time,
+     on absolute deadlines, see OrdonnanceurPeriodique).
      """
+     ordonnanceur = OrdonnanceurPeriodique(sleep_time)
      for _ in range(steps):
+         ordonnanceur.attendre()
          p.stepSimulation()
-         time.sleep(sleep_time)
          
 # function to joint position, velocity and torque feedback
 def getJointStates(robot_id,control_joints):
@@ -40,31 +45,30 @@ def setJointPosition(robot_id, control_joints, position, kp=1.0, kv=1.0):
                                 targetVelocities=zero_vec,
                                 positionGains=[kp] * len(control_joints),
                                 velocityGains=[kv] * len(control_joints))
-    frame_ee = []
-    for _ in range(100):
-        p.stepSimulation()
-        time.sleep(sleep_time)
+    update_simulation(100, sleep_time)
         
-    frame_ee = affiche.update_joint_frame(robot_id, 7, frame_ee)
+    # Repère outil : les lignes du robot sont réutilisées d'un appel à l'autre
+    _reperes_outil[robot_id] = affiche.update_joint_frame(robot_id, 7, _reperes_outil.get(robot_id, []))
 
 #################################################################
     #function to do joint velcoity control
 def JointVelocityControl(robot_id, control_joints, joint_velocities, sim_time=0.05, max_force=200):
     print('Joint velocity controller')
+    ordonnanceur = OrdonnanceurPeriodique(sleep_time)
     t=0
     while t<sim_time:
+        ordonnanceur.attendre()
         p.setJointMotorControlArray(robot_id,
                                     control_joints,
                                     p.VELOCITY_CONTROL,
                                     targetVelocities=joint_velocities,
                                     forces = [max_force] * (len(control_joints)))
         p.stepSimulation()
-        time.sleep(sleep_time)
         t += sleep_time
 
 ####################################################################        
 # Fonction pour un controle en couple
-def JointTorqueControl(robot_id, couple,control_joints):
+def JointTorqueControl(robot_id, couple,control_joints, physicsClientId=0):
         """
         sends torque commands (needs an array of desired joint torques)
         """
@@ -72,5 +76,22 @@ def JointTorqueControl(robot_id, couple,control_joints):
 
         p.setJointMotorControlArray(robot_id, control_joints, 
                                     p.TORQUE_CONTROL, forces=couple, 
-                                    positionGains=zeroGains, velocityGains=zeroGains)
+                                    positionGains=zeroGains, velocityGains=zeroGains,
+                                    physicsClientId=physicsClientId)
 
+####################################################################
+# Mesure de la cadence de commande réellement tenue
+def mesurer_cadence(robot_id, control_joints, frequence=F_CONTROL, duree=1.0, politique="sauter"):
+    """
+    Boucle de commande (lecture d'état + commande en position + pas de simulation)
+    cadencée à 'frequence' pendant 'duree' secondes.
+    Renvoie les statistiques de l'ordonnanceur (fréquence réelle, gigue, dépassements).
+    """
+    ordonnanceur = OrdonnanceurPeriodique(1.0 / frequence, politique=politique)
+    for _ in range(int(duree * frequence)):
+        ordonnanceur.attendre()
+        positions, _, _ = getJointStates(robot_id, control_joints)
+        p.setJointMotorControlArray(robot_id, control_joints, p.POSITION_CONTROL,
+                                    targetPositions=positions)
+        p.stepSimulation()
+    return ordonnanceur.statistiques()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ferme de simulation : validation de plusieurs trajectoires en parallèle.
+
+Chaque processus de travail ouvre son propre client PyBullet DIRECT et y charge
+un UR3 une seule fois ; les trajectoires (jobs) sont ensuite réparties entre
+les processus et chacun renvoie des métriques de suivi.
+
+Un job est un dict :
+    {"nom": ..., "mode": "position" | "vitesse",
+     "O": [..], "R": .., "V": ..}                   -> trajectoire calculée par traj()
+  ou {"nom": ..., "mode": ..., "temps": .., "q": .., "qp": .., "V": ..}  -> trajectoire fournie
+  ou {"nom": ..., "mode": ..., "memoire": descripteur, "V": ..}  -> trajectoire en mémoire partagée
+                                                  (publier_trajectoire(temps=.., q=.., qp=..), sans copie)
+
+Chaque job renvoie statut "ok" ou "échec" (avec l'erreur) ; un processus se détache
+toujours de la mémoire partagée de son job, même en cas d'échec.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pybullet as p
+
+from src.const_v import dh
+from src.matrice_tn import generate_transformation_matrices_batch, calcul_T0i_batch
+from src.memoire_partagee import ouvrir_trajectoire
+from src.modele_differentiel import Jacob_geo_batch
+from src.part4_generation_articulaire import traj
+from src.pybullet.simulation_pybullet import URDF_PATH, charger_robot, simulation_position, simulation_vitesse
+
+# État propre à chaque processus de travail (client, robot)
+_ETAT = {}
+
+
+def _init_worker(urdf_path, sous_pas, conversion=True):
+    """ Connexion DIRECT et chargement du robot, une seule fois par processus. """
+    client = p.connect(p.DIRECT)
+    robot_id, joint_indices = charger_robot(0.005, sous_pas, urdf_path, physicsClientId=client)
+    _ETAT.update(client=client, robot_id=robot_id, joint_indices=joint_indices, sous_pas=sous_pas,
+                 conversion=conversion)
+
+
+def _simuler(job, temps, q, qp):
+    """ Simule le job sur la trajectoire (temps, q, qp) et renvoie ses métriques (scalaires). """
+    client = _ETAT["client"]
+    dt = temps[1] - temps[0]
+    sous_pas = _ETAT["sous_pas"]
+    p.setTimeStep(dt / sous_pas, physicsClientId=client)
+
+    options = dict(temps_reel=False, interactif=False, sous_pas=sous_pas, afficher=False,
+                   conversion=_ETAT["conversion"], physicsClientId=client)
+    mode = job.get("mode", "position")
+
+    if mode == "position":
+        mesures = simulation_position(_ETAT["robot_id"], _ETAT["joint_indices"], temps, q,
+                                      job.get("O"), job.get("R"), **options)
+        erreur = mesures["erreur"]
+        return {"nb_points": len(temps), "erreur_max": float(np.max(erreur)),
+                "erreur_rms": float(np.sqrt(np.mean(erreur ** 2))),
+                "t_erreur_max": float(temps[np.argmax(erreur)])}
+    if mode == "vitesse":
+        # Départ du robot sur le premier point de la trajectoire
+        mesures = simulation_vitesse(_ETAT["robot_id"], _ETAT["joint_indices"], temps, qp,
+                                     job.get("V"), q_init=q[0], **options)
+        # Vitesse opérationnelle de référence |J(q) . qp| sur la consigne
+        J_v = Jacob_geo_batch(calcul_T0i_batch(generate_transformation_matrices_batch(q, dh)))[:, :3, :]
+        V_ref = np.linalg.norm(np.einsum('nij,nj->ni', J_v, qp), axis=1)
+        ecart = np.abs(mesures["V_mesure_norme"] - V_ref)
+        return {"nb_points": len(temps), "ecart_vitesse_max": float(np.max(ecart)),
+                "ecart_vitesse_rms": float(np.sqrt(np.mean(ecart ** 2))),
+                "t_ecart_max": float(temps[np.argmax(ecart)])}
+    raise ValueError(f"Mode de job inconnu : {mode}")
+
+
+def _executer_job(job):
+    """
+    Exécute un job dans le client du processus courant et renvoie ses métriques.
+    Une erreur est rapportée dans le résultat (statut "échec") sans interrompre la ferme.
+    Une trajectoire en mémoire partagée est lue sans copie (vues valables le temps de la
+    simulation) et le processus s'en détache dans tous les cas.
+    """
+    t0 = time.perf_counter()
+    resultat = {"nom": job.get("nom"), "mode": job.get("mode", "position"), "pid": os.getpid()}
+
+    partagee = None
+    try:
+        try:
+            if "memoire" in job:
+                partagee = ouvrir_trajectoire(job["memoire"])
+                with partagee.vues() as tableaux:
+                    resultat["duree_traj"] = time.perf_counter() - t0
+                    resultat.update(_simuler(job, tableaux["temps"], tableaux["q"], tableaux["qp"]))
+            else:
+                if "q" in job:
+                    temps, q, qp = np.asarray(job["temps"]), np.asarray(job["q"]), np.asarray(job["qp"])
+                else:
+                    temps, q, qp, _ = traj(job["O"], job["R"], job["V"])
+                resultat["duree_traj"] = time.perf_counter() - t0
+                resultat.update(_simuler(job, temps, q, qp))
+            resultat["statut"] = "ok"
+        except Exception as e:
+            resultat.update(statut="échec", erreur=f"{type(e).__name__}: {e}")
+    finally:
+        if partagee is not None:
+            partagee.fermer()
+
+    resultat["duree_totale"] = time.perf_counter() - t0
+    return resultat
+
+
+def executer_ferme(jobs, nb_workers=None, urdf_path=URDF_PATH, sous_pas=1, conversion=True):
+    """
+    Répartit les jobs entre nb_workers processus (un client PyBullet DIRECT chacun).
+
+    Args:
+        jobs: liste de jobs (voir l'en-tête du module).
+        nb_workers: nombre de processus (défaut : nombre de cœurs).
+        conversion: False si l'URDF est déjà en convention MGD (ecrire_urdf_modele).
+
+    Returns:
+        Liste des métriques, dans l'ordre des jobs ('statut' : "ok" ou "échec" avec 'erreur').
+    """
+    nb_workers = nb_workers or os.cpu_count()
+    contexte = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=nb_workers, mp_context=contexte, initializer=_init_worker,
+                             initargs=(urdf_path, sous_pas, conversion)) as executeur:
+        return list(executeur.map(_executer_job, jobs))
+
+
+if __name__ == "__main__":
+    # Exemple : balayage de rayons et de vitesses
+    jobs = [{"nom": f"R={R}_V={V}", "mode": "position", "O": [0.25, -0.15, 0.5], "R": R, "V": V}
+            for R in (0.05, 0.08, 0.1) for V in (0.05, 0.1)]
+
+    t0 = time.perf_counter()
+    resultats = executer_ferme(jobs)
+    print(f"\n{len(jobs)} trajectoires validées en {time.perf_counter() - t0:.1f} s")
+    for res in resultats:
+        if res["statut"] != "ok":
+            print(f" {res['nom']:>14} : {res['erreur']}")
+            continue
+        print(f" {res['nom']:>14} : erreur max {res['erreur_max']:.3e} m, RMS {res['erreur_rms']:.3e} m")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rejeu d'une simulation enregistrée (EnregistreurTelemetrie, voir telemetrie.py).
+
+Le lecteur ne charge que les blocs nécessaires (cache LRU de quelques blocs) :
+on peut se positionner à n'importe quel instant, extraire une fenêtre pour la
+tracer, ou rejouer le mouvement dans PyBullet par resetJointState à n'importe
+quelle vitesse, sans relancer la physique ni la génération de trajectoire.
+"""
+import argparse
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pybullet as p
+
+from src.ordonnanceur import OrdonnanceurPeriodique
+from src.rendu_figures import rendu_figure, terminer_figure, reduire_series, attendre_rendus
+
+
+class LecteurTelemetrie:
+    """
+    Accès aléatoire aux blocs d'un dossier de télémétrie.
+
+    :param dossier: dossier contenant index.json et les blocs bloc_XXXXX.npz.
+    :param taille_cache: nombre de blocs gardés en mémoire.
+    """
+
+    def __init__(self, dossier, taille_cache=4):
+        with open(os.path.join(dossier, "index.json")) as f:
+            index = json.load(f)
+        if not index["blocs"]:
+            raise ValueError(f"Aucun bloc enregistré dans {dossier}.")
+
+        self.dossier = dossier
+        self.nb_axes = index["nb_axes"]
+        self.champs = index["champs"]
+        self.blocs = index["blocs"]
+        self.nb_echantillons = index["nb_echantillons"]
+        self.taille_cache = taille_cache
+
+        self._t_debut_blocs = np.array([bloc["t_debut"] for bloc in self.blocs])
+        self._t_fin_blocs = np.array([bloc["t_fin"] for bloc in self.blocs])
+        self._cache = OrderedDict()
+        self.nb_lectures = 0  # Nombre de blocs lus sur disque
+
+    @property
+    def t_debut(self):
+        return float(self._t_debut_blocs[0])
+
+    @property
+    def t_fin(self):
+        return float(self._t_fin_blocs[-1])
+
+    def _bloc(self, k):
+        """ Bloc k (dict {champ: tableau}), lu sur disque s'il n'est pas en cache. """
+        if k in self._cache:
+            self._cache.move_to_end(k)
+            return self._cache[k]
+
+        with np.load(os.path.join(self.dossier, self.blocs[k]["fichier"])) as donnees:
+            bloc = {champ: donnees[champ] for champ in self.champs}
+        self.nb_lectures += 1
+
+        self._cache[k] = bloc
+        if len(self._cache) > self.taille_cache:
+            self._cache.popitem(last=False)
+        return bloc
+
+    def echantillon(self, t):
+        """
+        Dernier échantillon enregistré à l'instant t (bloqueur d'ordre zéro).
+
+        :return: dict {champ: valeur}
+        """
+        k = int(np.clip(np.searchsorted(self._t_debut_blocs, t, side='right') - 1, 0, len(self.blocs) - 1))
+        bloc = self._bloc(k)
+        i = int(np.clip(np.searchsorted(bloc["temps"], t, side='right') - 1, 0, len(bloc["temps"]) - 1))
+        return {champ: bloc[champ][i] for champ in self.champs}
+
+    def extraire(self, t_debut=None, t_fin=None):
+        """
+        Échantillons de la fenêtre [t_debut, t_fin] ; seuls les blocs qui la recouvrent sont lus.
+
+        :return: dict {champ: tableau}
+        """
+        t_debut = self.t_debut if t_debut is None else t_debut
+        t_fin = self.t_fin if t_fin is None else t_fin
+        if t_fin < t_debut:
+            raise ValueError("t_fin doit être supérieur ou égal à t_debut.")
+
+        blocs = np.flatnonzero((self._t_fin_blocs >= t_debut) & (self._t_debut_blocs <= t_fin))
+        morceaux = {champ: [] for champ in self.champs}
+        for k in blocs:
+            bloc = self._bloc(k)
+            masque = (bloc["temps"] >= t_debut) & (bloc["temps"] <= t_fin)
+            for champ in self.champs:
+                morceaux[champ].append(bloc[champ][masque])
+
+        if not len(blocs):
+            return {champ: np.zeros((0,) if champ == "temps" else (0, self.nb_axes)) for champ in self.champs}
+        return {champ: np.concatenate(valeurs) for champ, valeurs in morceaux.items()}
+
+    def rejouer(self, robot_id, joint_indices, vitesse=1.0, t_debut=None, t_fin=None,
+                frequence_affichage=60.0, temps_reel=True, physicsClientId=0):
+        """
+        Rejoue l'enregistrement dans PyBullet (resetJointState, sans pas de simulation).
+
+        Une image est affichée toutes les 1 / frequence_affichage secondes (horloge murale),
+        et avance de vitesse / frequence_affichage dans l'enregistrement : vitesse = 10
+        rejoue dix fois plus vite que le temps réel, vitesse = 0.5 au ralenti.
+        Sans temps_reel, les images s'enchaînent sans attente.
+
+        :return: nombre d'images affichées.
+        """
+        if vitesse <= 0:
+            raise ValueError("La vitesse de rejeu doit être strictement positive.")
+
+        t_debut = self.t_debut if t_debut is None else t_debut
+        t_fin = self.t_fin if t_fin is None else t_fin
+        pas = vitesse / frequence_affichage
+        instants = np.append(np.arange(t_debut, t_fin, pas), t_fin)
+
+        ordonnanceur = OrdonnanceurPeriodique(1.0 / frequence_affichage, politique="sauter",
+                                              nb_mesures=len(instants)) if temps_reel else None
+        for t in instants:
+            if ordonnanceur is not None:
+                ordonnanceur.attendre()
+            etat = self.echantillon(t)
+            for i, joint in enumerate(joint_indices):
+                p.resetJointState(robot_id, joint, etat["q"][i], etat["qp"][i], physicsClientId=physicsClientId)
+
+        return len(instants)
+
+    def tracer(self, t_debut=None, t_fin=None):
+        """ Trace q, qp, couples et commandes sur la fenêtre [t_debut, t_fin]. """
+        donnees = self.extraire(t_debut, t_fin)
+        afficher_telemetrie(donnees["temps"], donnees["q"], donnees["qp"], donnees["couple"], donnees["commande"])
+
+
+@rendu_figure("telemetrie")
+def afficher_telemetrie(temps, q, qp, couple, commande):
+    import matplotlib.pyplot as plt
+    temps, q, qp, couple, commande = reduire_series(temps, q, qp, couple, commande)
+    fig, axes = plt.subplots(4, 1, sharex=True, figsize=(10, 10))
+
+    for ax, valeurs, titre in zip(axes, (q, qp, couple, commande),
+                                  ("Positions q (rad)", "Vitesses qp (rad/s)", "Couples (N.m)", "Commandes")):
+        for j in range(valeurs.shape[1]):
+            ax.plot(temps, valeurs[:, j], label=f"q{j + 1}")
+        ax.set_title(titre)
+        ax.grid(True)
+    axes[0].legend(ncol=valeurs.shape[1], fontsize=8)
+    axes[-1].set_xlabel("Temps (s)")
+    plt.tight_layout()
+    terminer_figure(fig)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Rejeu d'une simulation enregistrée (dossier de télémétrie)")
+    parser.add_argument("dossier", help="Dossier contenant index.json et les blocs")
+    parser.add_argument("--vitesse", type=float, default=1.0, help="Facteur de vitesse du rejeu")
+    parser.add_argument("--debut", type=float, default=None, help="Instant de départ (s)")
+    parser.add_argument("--fin", type=float, default=None, help="Instant de fin (s)")
+    parser.add_argument("--courbes", action="store_true", help="Tracer les courbes seulement, sans rejeu 3D")
+    args = parser.parse_args(args)
+
+    lecteur = LecteurTelemetrie(args.dossier)
+    print(f"{lecteur.nb_echantillons} échantillons, t = {lecteur.t_debut:.3f} .. {lecteur.t_fin:.3f} s "
+          f"({len(lecteur.blocs)} blocs)")
+
+    if not args.courbes:
+        from src.pybullet.simulation_pybullet import init_simulation
+
+        robot_id, joint_indices = init_simulation(1.0 / 240, mode="gui")
+        lecteur.rejouer(robot_id, joint_indices, vitesse=args.vitesse, t_debut=args.debut, t_fin=args.fin)
+        p.disconnect()
+
+    lecteur.tracer(args.debut, args.fin)
+    attendre_rendus()
+
+
+if __name__ == "__main__":
+    main()
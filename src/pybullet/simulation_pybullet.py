@@ -1,56 +1,78 @@
+import argparse
 import pybullet as p
 import pybullet_data
-import time
 import numpy as np
-import matplotlib.pyplot as plt
 import os
 
 # --- Imports de vos modules ---
-from const_v import dh
-from matrice_tn import generate_transformation_matrices, calcul_T06_global
-from modele_differentiel import Jacob_geo
-from part4_generation_articulaire import traj
-from utils import mgd_vers_simulation, simulation_vers_mgd
+from src.const_v import dh, couples_max
+from src.dynamique import rnea_batch, matrice_inertie_batch
+from src.matrice_tn import generate_transformation_matrices_batch, calcul_T0i_batch
+from src.modele_differentiel import Jacob_geo_batch
+from src.ordonnanceur import OrdonnanceurPeriodique
+from src.pybullet.affiche import ReperesLiens
+from src.pybullet.control import JointTorqueControl
+from src.part4_generation_articulaire import traj
+from src.rendu_figures import rendu_figure, terminer_figure
+from src.utils import derouler_angles, mgd_vers_simulation, simulation_vers_mgd, vitesse_mgd_vers_simulation, vitesse_simulation_vers_mgd
 
 # --- Configuration ---
 # Chemin vers l'URDF (A adapter selon l'emplacement exact de votre dossier ur_description)
 # D'après votre notebook, c'est: "./ur_description/urdf/ur3_robot.urdf"
 URDF_PATH = "ur_description/urdf/ur3_robot.urdf" 
 
-def init_simulation(dt):
-    """Initialise PyBullet, charge le sol et le robot."""
-    try:
-        p.connect(p.GUI)
-    except:
-        p.connect(p.DIRECT)
-        
-    p.setAdditionalSearchPath(pybullet_data.getDataPath())
-    p.setGravity(0, 0, -9.81)
-    p.setTimeStep(dt)
+def init_simulation(dt, mode="gui", sous_pas=1, urdf_path=URDF_PATH):
+    """
+    Initialise PyBullet, charge le sol et le robot.
+
+    Args:
+        mode: "gui" (fenêtre, repli sur DIRECT si indisponible) ou "direct" (sans affichage).
+        sous_pas: nombre de pas physiques par pas de commande (pas physique = dt / sous_pas).
+    """
+    if mode == "direct":
+        client = p.connect(p.DIRECT)
+    else:
+        try:
+            client = p.connect(p.GUI)
+        except:
+            client = p.connect(p.DIRECT)
+
+    return charger_robot(dt, sous_pas, urdf_path, physicsClientId=client)
+
+def charger_robot(dt, sous_pas=1, urdf_path=URDF_PATH, physicsClientId=0):
+    """
+    Configure un client PyBullet déjà connecté (gravité, pas de temps)
+    et y charge le sol et le robot.
+    """
+    p.setAdditionalSearchPath(pybullet_data.getDataPath(), physicsClientId=physicsClientId)
+    p.setGravity(0, 0, -9.81, physicsClientId=physicsClientId)
+    p.setTimeStep(dt / sous_pas, physicsClientId=physicsClientId)
     
     # Chargement du sol
-    p.loadURDF("plane.urdf")
+    p.loadURDF("plane.urdf", physicsClientId=physicsClientId)
     
     # Chargement du robot
-    if not os.path.exists(URDF_PATH):
-        print(f"ATTENTION: Le fichier {URDF_PATH} est introuvable.")
-        print("Veuillez vérifier le chemin URDF_PATH ligne 16.")
+    if not os.path.exists(urdf_path):
+        raise FileNotFoundError(f"URDF introuvable : {urdf_path} (voir URDF_PATH en tête de simulation_pybullet.py).")
     
     startPos = [0, 0, 0]
     startOrn = p.getQuaternionFromEuler([0, 0, 0])
-    robot_id = p.loadURDF(URDF_PATH, startPos, startOrn, useFixedBase=True)
+    # Inerties du fichier (sinon recalculées par PyBullet depuis les formes de collision)
+    robot_id = p.loadURDF(urdf_path, startPos, startOrn, useFixedBase=True, flags=p.URDF_USE_INERTIA_FROM_FILE,
+                          physicsClientId=physicsClientId)
     
-    # Identification des joints contrôlables (les 6 axes)
-    # D'après votre notebook, indices [1, 2, 3, 4, 5, 6]
-    joint_indices = [1, 2, 3, 4, 5, 6]
+    # Identification des joints contrôlables (les 6 axes) : les six premières articulations mobiles
+    # (indices [1, 2, 3, 4, 5, 6] pour l'URDF UR3, [0, ..., 5] pour generer_urdf_modele)
+    joint_indices = [j for j in range(p.getNumJoints(robot_id, physicsClientId=physicsClientId))
+                     if p.getJointInfo(robot_id, j, physicsClientId=physicsClientId)[2] != p.JOINT_FIXED][:6]
     
     return robot_id, joint_indices
 
-def get_feedback(robot_id, joint_indices):
+def get_feedback(robot_id, joint_indices, physicsClientId=0):
     """
     Récupère q et dq du simulateur et les convertit en convention MGD.
     """
-    states = p.getJointStates(robot_id, joint_indices)
+    states = p.getJointStates(robot_id, joint_indices, physicsClientId=physicsClientId)
     
     # 1. Lecture brute (Convention Simu)
     q_sim = [s[0] for s in states]
@@ -58,68 +80,127 @@ def get_feedback(robot_id, joint_indices):
     
     # 2. Conversion (Convention MGD)
     q_mgd = simulation_vers_mgd(q_sim)
-    qp_mgd = simulation_vers_mgd(qp_sim)
+    qp_mgd = vitesse_simulation_vers_mgd(qp_sim)
     
     return q_mgd, qp_mgd
 
-def simulation_position(robot_id, joint_indices, time_vector, q_traj, O, R):
+def pas_simulation(sous_pas=1, ordonnanceur=None, physicsClientId=0, commande=None):
+    """
+    Avance la physique d'un pas de commande (sous_pas pas physiques).
+    Avec un ordonnanceur (temps réel), on attend d'abord l'échéance du pas ;
+    sinon on enchaîne au plus vite.
+    commande: fonction rappelée avant chaque pas physique ; nécessaire en TORQUE_CONTROL,
+    dont les couples ne s'appliquent qu'au pas physique suivant.
+    """
+    if ordonnanceur is not None:
+        ordonnanceur.attendre()
+    for _ in range(sous_pas):
+        if commande is not None:
+            commande()
+        p.stepSimulation(physicsClientId=physicsClientId)
+
+
+def consignes_simulation(q_traj, conversion=True):
+    """
+    Consigne articulaire (convention MGD) déroulée, et la même en convention simulation.
+    Le MGI renvoie des angles repliés dans [-π, π] : sans déroulage, un saut de 2π ferait
+    faire un tour complet à l'articulation asservie. Commun à toutes les simulations.
+
+    Returns:
+        q_traj (N, 6) continue, q_cible_sim (N, 6)
+    """
+    q_traj = derouler_angles(q_traj)
+    return q_traj, (mgd_vers_simulation(q_traj) if conversion else q_traj)
+
+
+def simulation_position(robot_id, joint_indices, time_vector, q_traj, O, R,
+                        temps_reel=True, interactif=True, sous_pas=1, afficher=True, telemetrie=None,
+                        reperes=None, conversion=True, physicsClientId=0):
     """
     VI.1 : Exécute la trajectoire en contrôle de POSITION.
     Compare la position réelle (calculée via MGD sur q_mesuré) avec le cercle théorique.
+
+    Args:
+        temps_reel: cadence la boucle sur dt (sinon exécution au plus vite).
+        interactif: attend Entrée avant de démarrer.
+        sous_pas: pas physiques par pas de commande (voir init_simulation).
+        afficher: trace les courbes de suivi en fin de simulation.
+        telemetrie: EnregistreurTelemetrie optionnel (états et commandes en convention simulation).
+        reperes: ReperesLiens optionnel (affiche.py), rafraîchi à chaque pas selon sa décimation.
+        conversion: False si l'URDF est déjà en convention MGD (generer_urdf_modele).
+        physicsClientId: client PyBullet à utiliser (plusieurs simulations en parallèle).
+
+    Returns:
+        dict {'temps', 'q_mesure', 'X_mesure', 'X_theorique', 'erreur'} (tableaux numpy)
+        et 'cadence' (statistiques de l'ordonnanceur en temps réel, sinon None)
     """
     print("\n=== VI.1 Simulation en POSITION ===")
+    dt = time_vector[1] - time_vector[0]
     
+    # Pré-calcul (hors boucle) : consignes en convention simulation et
+    # trajectoire théorique par MGD sur toute la consigne, en un seul appel
+    q_traj, q_cible_sim = consignes_simulation(q_traj, conversion)
+    X_theorique = calcul_T0i_batch(generate_transformation_matrices_batch(q_traj, dh))[:, -1, :3, 3]
+
     # Reset du robot à la position initiale
-    q_init_sim = mgd_vers_simulation(q_traj[0])
     for i, joint in enumerate(joint_indices):
-        p.resetJointState(robot_id, joint, q_init_sim[i])
+        p.resetJointState(robot_id, joint, q_cible_sim[0, i], physicsClientId=physicsClientId)
         
-    # Listes pour stocker les mesures
-    X_mesure = []
-    X_theorique = []
+    # Tableaux préalloués pour les mesures (convention simulation)
+    N = len(time_vector)
+    q_mesure_sim = np.zeros((N, len(joint_indices)))
     
-    input("Appuyez sur Entrée pour démarrer la simulation POSITION...")
+    if interactif:
+        input("Appuyez sur Entrée pour démarrer la simulation POSITION...")
+
+    # Cadencement sur échéances absolues (pas de dérive due au temps de calcul)
+    ordonnanceur = OrdonnanceurPeriodique(dt, nb_mesures=N) if temps_reel else None
     
-    for i, t in enumerate(time_vector):
-        # 1. Consigne : On prend le q théorique et on le convertit pour la simu
-        target_q_mgd = q_traj[i]
-        target_q_sim = mgd_vers_simulation(target_q_mgd)
-        
-        # 2. Envoi Commande Position
+    for i in range(N):
+        # 1. Envoi Commande Position (consigne déjà convertie)
         p.setJointMotorControlArray(
             robot_id,
             joint_indices,
             p.POSITION_CONTROL,
-            targetPositions=target_q_sim,
+            targetPositions=q_cible_sim[i],
             # Gains par défaut ou ajustables (kp)
             positionGains=[1.0]*6,
-            velocityGains=[1.0]*6
+            velocityGains=[1.0]*6,
+            physicsClientId=physicsClientId
         )
         
-        # 3. Pas de simulation
-        p.stepSimulation()
-        time.sleep(time_vector[1] - time_vector[0]) # Temps réel
-        
-        # 4. Mesure & Calcul MGD (Pour voir où on est vraiment)
-        q_actuel_mgd, _ = get_feedback(robot_id, joint_indices)
+        # 2. Pas de simulation
+        pas_simulation(sous_pas, ordonnanceur, physicsClientId)
+        if reperes is not None:
+            reperes.mettre_a_jour()
         
-        # MGD sur la position actuelle
-        mats_actuels = generate_transformation_matrices(q_actuel_mgd, dh)
-        T06_actuel = calcul_T06_global(mats_actuels)
-        pos_actuelle = T06_actuel[:3, 3] # [x, y, z]
-        X_mesure.append(pos_actuelle)
-        
-        # Calcul position théorique pour comparaison (MGD sur la consigne)
-        mats_theo = generate_transformation_matrices(target_q_mgd, dh)
-        T06_theo = calcul_T06_global(mats_theo)
-        pos_theo = T06_theo[:3, 3]
-        X_theorique.append(pos_theo)
+        # 3. Mesure brute, la conversion et le MGD sont faits après la boucle
+        states = p.getJointStates(robot_id, joint_indices, physicsClientId=physicsClientId)
+        q_mesure_sim[i] = [state[0] for state in states]
+
+        if telemetrie is not None:
+            telemetrie.ajouter(time_vector[i], q_mesure_sim[i], [state[1] for state in states],
+                               [state[3] for state in states], q_cible_sim[i])
+
+    # MGD sur toutes les mesures (Pour voir où on est vraiment)
+    q_mesure = simulation_vers_mgd(q_mesure_sim) if conversion else q_mesure_sim
+    X_mesure = calcul_T0i_batch(generate_transformation_matrices_batch(q_mesure, dh))[:, -1, :3, 3]
+    erreurs = np.linalg.norm(X_mesure - X_theorique, axis=1)
 
     # Affichage des résultats
-    X_mesure = np.array(X_mesure)
-    X_theorique = np.array(X_theorique)
-    
-    plt.figure(figsize=(10, 5))
+    if afficher:
+        afficher_suivi_position(time_vector, X_mesure, X_theorique, erreurs)
+
+    return {"temps": np.asarray(time_vector), "q_mesure": q_mesure, "X_mesure": X_mesure,
+            "X_theorique": X_theorique, "erreur": erreurs,
+            "cadence": ordonnanceur.statistiques() if ordonnanceur is not None else None}
+
+
+@rendu_figure("suivi_position")
+def afficher_suivi_position(time_vector, X_mesure, X_theorique, erreurs):
+    """ Trajectoire XZ mesurée vs consigne et erreur de position au cours du temps. """
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(10, 5))
     
     # Trajectoire 2D (XZ)
     plt.subplot(1, 2, 1)
@@ -132,7 +213,6 @@ def simulation_position(robot_id, joint_indices, time_vector, q_traj, O, R):
     plt.axis('equal')
     
     # Erreur au cours du temps
-    erreurs = np.linalg.norm(X_mesure - X_theorique, axis=1)
     plt.subplot(1, 2, 2)
     plt.plot(time_vector, erreurs)
     plt.xlabel('Temps (s)')
@@ -141,66 +221,96 @@ def simulation_position(robot_id, joint_indices, time_vector, q_traj, O, R):
     plt.grid()
     
     plt.tight_layout()
-    plt.show()
+    terminer_figure(fig)
 
-def simulation_vitesse(robot_id, joint_indices, time_vector, qp_traj, V_cible):
+def simulation_vitesse(robot_id, joint_indices, time_vector, qp_traj, V_cible,
+                       temps_reel=True, interactif=True, sous_pas=1, afficher=True, telemetrie=None,
+                       reperes=None, conversion=True, q_init=None, physicsClientId=0):
     """
     VI.2 : Exécute la trajectoire en contrôle de VITESSE.
     Compare la norme de la vitesse cartésienne atteinte avec la consigne V.
+    Mêmes options que simulation_position ; q_init (convention MGD) est la configuration
+    de départ, en pratique q_traj[0] (défaut : estimation du départ du cercle de main()).
+
+    Returns:
+        dict {'temps', 'q_mesure', 'qp_mesure', 'V_mesure_norme'} (tableaux numpy) et 'cadence'
     """
     print("\n=== VI.2 Simulation en VITESSE ===")
+    dt = time_vector[1] - time_vector[0]
     
     # Reset du robot (Important car le mode vitesse fait dériver la position)
-    # On reprend la position de départ de la trajectoire
-    # Note: Il faut recalculer le q_traj[0] ou le passer en argument, ici on le recalcule vite fait
-    # Ou mieux, on reset juste à une position "connue" proche du départ
-    # Pour simplifier, on suppose que le robot est resté à la fin de la simu précédente, 
-    # donc on le reset brutalement.
-    q_start = [0.0, np.pi/2, -np.pi/4, 0.0, -np.pi/2, 0.0] # Estimation départ
-    q_start_sim = mgd_vers_simulation(q_start)
+    # On reprend la position de départ de la trajectoire, sinon une position "connue" proche du départ
+    if q_init is None:
+        q_start = [0.0, np.pi/2, -np.pi/4, 0.0, -np.pi/2, 0.0] # Estimation départ
+    else:
+        q_start = np.asarray(q_init, dtype=float)
+    q_start_sim = mgd_vers_simulation(q_start) if conversion else q_start
     
     for i, joint in enumerate(joint_indices):
-        p.resetJointState(robot_id, joint, q_start_sim[i])
+        p.resetJointState(robot_id, joint, q_start_sim[i], physicsClientId=physicsClientId)
     
-    V_mesure_norme = []
+    # Pré-calcul des consignes en convention simulation (signes seulement, pas d'offset)
+    qp_cible_sim = np.asarray(qp_traj, dtype=float)
+    if conversion:
+        qp_cible_sim = vitesse_mgd_vers_simulation(qp_cible_sim)
+
+    # Tableaux préalloués pour les mesures (convention simulation)
+    N = len(time_vector)
+    q_mesure_sim = np.zeros((N, len(joint_indices)))
+    qp_mesure_sim = np.zeros((N, len(joint_indices)))
     
-    input("Appuyez sur Entrée pour démarrer la simulation VITESSE...")
+    if interactif:
+        input("Appuyez sur Entrée pour démarrer la simulation VITESSE...")
+
+    ordonnanceur = OrdonnanceurPeriodique(dt, nb_mesures=N) if temps_reel else None
     
-    for i, t in enumerate(time_vector):
-        # 1. Consigne : Vitesse articulaire
-        target_qp_mgd = qp_traj[i]
-        target_qp_sim = mgd_vers_simulation(target_qp_mgd) # Linéaire, donc marche aussi pour vitesses
-        
-        # 2. Envoi Commande Vitesse
+    for i in range(N):
+        # 1. Envoi Commande Vitesse
         # En mode vitesse, il faut désactiver le gain de position (sinon il essaie de rester sur place)
         p.setJointMotorControlArray(
             robot_id,
             joint_indices,
             p.VELOCITY_CONTROL,
-            targetVelocities=target_qp_sim,
-            forces=[500]*6 # Force max suffisante
+            targetVelocities=qp_cible_sim[i],
+            forces=[500]*6, # Force max suffisante
+            physicsClientId=physicsClientId
         )
         
-        # 3. Simulation
-        p.stepSimulation()
-        time.sleep(time_vector[1] - time_vector[0])
-        
-        # 4. Mesure & Calcul Vitesse Cartésienne (Jacobienne)
-        q_actuel_mgd, qp_actuel_mgd = get_feedback(robot_id, joint_indices)
-        
-        # Calcul Jacobienne à la position actuelle
-        mats = generate_transformation_matrices(q_actuel_mgd, dh)
-        J = Jacob_geo(mats)
-        J_v = J[:3, :] # Partie linéaire 3x6
+        # 2. Simulation
+        pas_simulation(sous_pas, ordonnanceur, physicsClientId)
+        if reperes is not None:
+            reperes.mettre_a_jour()
         
-        # Vitesse Cartésienne V = J * q_point
-        v_cartesienne = np.dot(J_v, qp_actuel_mgd)
-        v_norm = np.linalg.norm(v_cartesienne)
-        
-        V_mesure_norme.append(v_norm)
+        # 3. Mesure brute
+        states = p.getJointStates(robot_id, joint_indices, physicsClientId=physicsClientId)
+        q_mesure_sim[i] = [state[0] for state in states]
+        qp_mesure_sim[i] = [state[1] for state in states]
+
+        if telemetrie is not None:
+            telemetrie.ajouter(time_vector[i], q_mesure_sim[i], qp_mesure_sim[i],
+                               [state[3] for state in states], qp_cible_sim[i])
+
+    # Vitesse Cartésienne V = J(q) * q_point sur toutes les mesures (Jacobienne batch)
+    q_mesure = simulation_vers_mgd(q_mesure_sim) if conversion else q_mesure_sim
+    qp_mesure = vitesse_simulation_vers_mgd(qp_mesure_sim) if conversion else qp_mesure_sim
+    J_v = Jacob_geo_batch(calcul_T0i_batch(generate_transformation_matrices_batch(q_mesure, dh)))[:, :3, :]
+    v_cartesienne = np.einsum('nij,nj->ni', J_v, qp_mesure)
+    V_mesure_norme = np.linalg.norm(v_cartesienne, axis=1)
         
     # Affichage Résultats
-    plt.figure()
+    if afficher:
+        afficher_suivi_vitesse(time_vector, V_mesure_norme, V_cible)
+
+    return {"temps": np.asarray(time_vector), "q_mesure": q_mesure, "qp_mesure": qp_mesure,
+            "V_mesure_norme": V_mesure_norme,
+            "cadence": ordonnanceur.statistiques() if ordonnanceur is not None else None}
+
+
+@rendu_figure("suivi_vitesse")
+def afficher_suivi_vitesse(time_vector, V_mesure_norme, V_cible):
+    """ Norme de la vitesse cartésienne mesurée vs consigne V. """
+    import matplotlib.pyplot as plt
+    fig = plt.figure()
     plt.plot(time_vector, V_mesure_norme, label='Vitesse Robot |OE|')
     plt.axhline(V_cible, color='r', linestyle='--', label='Consigne V')
     plt.xlabel('Temps (s)')
@@ -208,9 +318,106 @@ def simulation_vitesse(robot_id, joint_indices, time_vector, qp_traj, V_cible):
     plt.title('Suivi de Vitesse opérationnelle')
     plt.legend()
     plt.grid()
-    plt.show()
+    terminer_figure(fig)
+
+def simulation_couple(robot_id, joint_indices, time_vector, q_traj, qp_traj, qpp_traj,
+                      omega=20.0, amortissement=1.0,
+                      temps_reel=True, interactif=True, sous_pas=1, afficher=True, telemetrie=None,
+                      reperes=None, conversion=True, physicsClientId=0):
+    """
+    VI.3 : Exécute la trajectoire en contrôle de COUPLE (JointTorqueControl).
+    τ = τ_ff(t) + Kp(t) (q_d - q) + Kd(t) (q̇_d - q̇), où les couples d'anticipation τ_ff sont
+    calculés avant la boucle pour toute la trajectoire (RNEA vectorisé) : chaque pas ne fait
+    qu'une lecture de tableau et une petite correction PD.
+    Les gains sont mis à l'échelle par la diagonale de M(q_d(t)) (pré-calculée aussi) :
+    Kp = M_jj omega², Kd = 2 amortissement omega M_jj, ce qui donne la même dynamique
+    d'erreur sur chaque axe malgré des inerties très différentes (épaule / poignet).
+
+    Args:
+        omega: pulsation propre (rad/s) de la dynamique d'erreur ; le couplage inertiel
+               réduit la marge de stabilité, garder omega * dt de l'ordre de 0.1.
+        amortissement: coefficient d'amortissement de la dynamique d'erreur.
+        conversion: False si l'URDF est déjà en convention MGD (generer_urdf_modele).
+        Autres options : voir simulation_position.
+
+    Returns:
+        dict {'temps', 'q_mesure', 'X_mesure', 'X_theorique', 'erreur', 'couple', 'cadence'}
+    """
+    print("\n=== VI.3 Simulation en COUPLE ===")
+    dt = time_vector[1] - time_vector[0]
+
+    # Pré-calcul : consignes et couples d'anticipation en convention simulation
+    q_traj, q_cible_sim = consignes_simulation(q_traj, conversion)
+    tau_ff = rnea_batch(q_traj, qp_traj, qpp_traj)
+    if conversion:
+        qp_cible_sim = vitesse_mgd_vers_simulation(np.asarray(qp_traj, dtype=float))
+        tau_ff_sim = vitesse_mgd_vers_simulation(tau_ff)  # Signes seulement
+    else:
+        qp_cible_sim, tau_ff_sim = np.asarray(qp_traj, dtype=float), tau_ff
+    X_theorique = calcul_T0i_batch(generate_transformation_matrices_batch(q_traj, dh))[:, -1, :3, 3]
+
+    M_diag = np.diagonal(matrice_inertie_batch(q_traj), axis1=1, axis2=2)
+    kp = M_diag * omega ** 2
+    kd = M_diag * 2 * amortissement * omega
+    tau_max = np.asarray(couples_max, dtype=float)
+
+    # Reset et désactivation des moteurs par défaut (sinon ils freinent les articulations)
+    for i, joint in enumerate(joint_indices):
+        p.resetJointState(robot_id, joint, q_cible_sim[0, i], qp_cible_sim[0, i], physicsClientId=physicsClientId)
+    p.setJointMotorControlArray(robot_id, joint_indices, p.VELOCITY_CONTROL,
+                                forces=[0.0] * len(joint_indices), physicsClientId=physicsClientId)
+
+    N = len(time_vector)
+    q_mesure_sim = np.zeros((N, len(joint_indices)))
+    couple = np.zeros((N, len(joint_indices)))
+
+    if interactif:
+        input("Appuyez sur Entrée pour démarrer la simulation COUPLE...")
+
+    ordonnanceur = OrdonnanceurPeriodique(dt, nb_mesures=N) if temps_reel else None
+
+    states = p.getJointStates(robot_id, joint_indices, physicsClientId=physicsClientId)
+    for i in range(N):
+        # 1. Anticipation (lecture) + correction PD, saturée aux couples max
+        q_sim = np.array([state[0] for state in states])
+        qp_sim = np.array([state[1] for state in states])
+        tau = tau_ff_sim[i] + kp[i] * (q_cible_sim[i] - q_sim) + kd[i] * (qp_cible_sim[i] - qp_sim)
+        couple[i] = np.clip(tau, -tau_max, tau_max)
+
+        # 2-3. Envoi Commande Couple (maintenue sur chaque pas physique) et pas de simulation
+        pas_simulation(sous_pas, ordonnanceur, physicsClientId,
+                       commande=lambda: JointTorqueControl(robot_id, couple[i], joint_indices,
+                                                           physicsClientId=physicsClientId))
+        if reperes is not None:
+            reperes.mettre_a_jour()
+
+        # 4. Mesure brute
+        states = p.getJointStates(robot_id, joint_indices, physicsClientId=physicsClientId)
+        q_mesure_sim[i] = [state[0] for state in states]
+
+        if telemetrie is not None:
+            telemetrie.ajouter(time_vector[i], q_mesure_sim[i], [state[1] for state in states],
+                               couple[i], q_cible_sim[i])
+
+    # MGD sur toutes les mesures
+    q_mesure = simulation_vers_mgd(q_mesure_sim) if conversion else q_mesure_sim
+    X_mesure = calcul_T0i_batch(generate_transformation_matrices_batch(q_mesure, dh))[:, -1, :3, 3]
+    erreurs = np.linalg.norm(X_mesure - X_theorique, axis=1)
+
+    if afficher:
+        afficher_suivi_position(time_vector, X_mesure, X_theorique, erreurs)
+
+    return {"temps": np.asarray(time_vector), "q_mesure": q_mesure, "X_mesure": X_mesure,
+            "X_theorique": X_theorique, "erreur": erreurs, "couple": couple,
+            "cadence": ordonnanceur.statistiques() if ordonnanceur is not None else None}
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Simulation PyBullet de la trajectoire UR3 (VI.1 / VI.2)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Mode DIRECT, sans cadencement temps réel, sans pause ni figure")
+    parser.add_argument("--sous-pas", type=int, default=1, help="Pas physiques par pas de commande")
+    args = parser.parse_args(args)
 
-def main():
     # 1. Génération de trajectoire (Module V.4)
     print("Calcul de la trajectoire...")
     # Paramètres (Exemple)
@@ -218,19 +425,35 @@ def main():
     R = 0.1
     V = 0.05
     
-    time_vec, q_traj, qp_traj, _ = traj(O, R, V, Debug=False)
+    time_vec, q_traj, qp_traj, qpp_traj = traj(O, R, V, Debug=False)
     dt = time_vec[1] - time_vec[0]
     
     # 2. Initialisation Simulateur
-    robot_id, joint_indices = init_simulation(dt)
+    mode = "direct" if args.headless else "gui"
+    robot_id, joint_indices = init_simulation(dt, mode=mode, sous_pas=args.sous_pas)
+    options = dict(temps_reel=not args.headless, interactif=not args.headless,
+                   sous_pas=args.sous_pas, afficher=not args.headless)
+    if not args.headless:
+        # Repère outil redessiné à ~30 Hz seulement
+        options["reperes"] = ReperesLiens(robot_id, [joint_indices[-1]], decimation=max(1, round(1 / (30 * dt))))
     
     # 3. Simulation Position
-    simuler_position(robot_id, joint_indices, time_vec, q_traj, O, R)
+    res_pos = simulation_position(robot_id, joint_indices, time_vec, q_traj, O, R, **options)
+    print(f" -> Erreur de position max : {np.max(res_pos['erreur']):.4e} m")
+    if res_pos["cadence"] is not None:
+        cadence = res_pos["cadence"]
+        print(f" -> Cadence tenue : {cadence['frequence_reelle']:.1f} Hz (visée {cadence['frequence_visee']:.1f} Hz), "
+              f"gigue p99 {cadence['gigue_p99'] * 1e3:.3f} ms, {cadence['nb_depassements']} dépassements")
     
     # 4. Simulation Vitesse
-    simuler_vitesse(robot_id, joint_indices, time_vec, qp_traj, V)
+    res_vit = simulation_vitesse(robot_id, joint_indices, time_vec, qp_traj, V, q_init=q_traj[0], **options)
+    print(f" -> Vitesse max mesurée : {np.max(res_vit['V_mesure_norme']):.4f} m/s (Consigne : {V} m/s)")
+
+    # 5. Simulation Couple (anticipation RNEA + PD)
+    res_couple = simulation_couple(robot_id, joint_indices, time_vec, q_traj, qp_traj, qpp_traj, **options)
+    print(f" -> Erreur de position max (couple) : {np.max(res_couple['erreur']):.4e} m")
     
     p.disconnect()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
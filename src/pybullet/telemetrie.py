@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Enregistreur de télémétrie pour les simulations PyBullet.
+
+Les mesures (temps, q, qp, couples, commandes) sont écrites dans des tampons
+circulaires numpy de capacité fixe : ajout en temps constant, sans allocation
+pendant la boucle de commande. Si un dossier est fourni, les échantillons sont
+vidés périodiquement sur disque par blocs (bloc_00000.npz, ...) décrits par
+un fichier index.json.
+"""
+import json
+import os
+
+import numpy as np
+
+
+CHAMPS = ("temps", "q", "qp", "couple", "commande")
+
+
+class EnregistreurTelemetrie:
+    """
+    Tampons circulaires préalloués pour la télémétrie d'une simulation.
+
+    :param nb_axes: nombre d'articulations enregistrées.
+    :param capacite: nombre d'échantillons conservés en mémoire (les plus anciens sont écrasés).
+    :param dossier: si fourni, dossier où les blocs sont vidés (sinon mémoire seule).
+    :param taille_bloc: nombre d'échantillons par bloc écrit (défaut : capacite // 2).
+    :param compresser: écrit des .npz compressés (plus compact, plus lent).
+    """
+
+    def __init__(self, nb_axes=6, capacite=10000, dossier=None, taille_bloc=None, compresser=False):
+        if taille_bloc is None:
+            taille_bloc = max(capacite // 2, 1)
+        if taille_bloc > capacite:
+            raise ValueError("taille_bloc doit être inférieure ou égale à la capacité.")
+
+        self.nb_axes = nb_axes
+        self.capacite = capacite
+        self.dossier = dossier
+        self.taille_bloc = taille_bloc
+        self.compresser = compresser
+
+        self.tampons = {
+            "temps": np.zeros(capacite),
+            "q": np.zeros((capacite, nb_axes)),
+            "qp": np.zeros((capacite, nb_axes)),
+            "couple": np.zeros((capacite, nb_axes)),
+            "commande": np.zeros((capacite, nb_axes)),
+        }
+        self.nb_total = 0  # Nombre d'échantillons reçus depuis le début
+        self.nb_sauve = 0  # Nombre d'échantillons déjà écrits sur disque
+        self.blocs = []  # Description des blocs écrits (pour index.json)
+
+        if dossier is not None:
+            os.makedirs(dossier, exist_ok=True)
+
+    def ajouter(self, t, q, qp, couple, commande):
+        """ Ajoute un échantillon (temps constant). """
+        i = self.nb_total % self.capacite
+        self.tampons["temps"][i] = t
+        self.tampons["q"][i] = q
+        self.tampons["qp"][i] = qp
+        self.tampons["couple"][i] = couple
+        self.tampons["commande"][i] = commande
+        self.nb_total += 1
+
+        if self.dossier is not None and self.nb_total - self.nb_sauve >= self.taille_bloc:
+            self.vider()
+
+    def enregistrer_etat(self, robot_id, control_joints, t, commande, physicsClientId=0):
+        """ Lit l'état des articulations (getJointStates du client donné) et l'ajoute au tampon. """
+        import pybullet as p
+
+        etats = p.getJointStates(robot_id, control_joints, physicsClientId=physicsClientId)
+        self.ajouter(t, [etat[0] for etat in etats], [etat[1] for etat in etats], [etat[3] for etat in etats],
+                     commande)
+
+    def _indices(self, debut, fin):
+        """ Indices dans les tampons des échantillons globaux [debut, fin). """
+        if self.nb_total - debut > self.capacite:
+            raise RuntimeError("Échantillons écrasés avant d'être sauvés : augmentez la capacité.")
+        return np.arange(debut, fin) % self.capacite
+
+    def donnees(self):
+        """
+        Renvoie (copie, ordre chronologique) les échantillons encore en mémoire.
+
+        :return: dict {champ: tableau}
+        """
+        debut = max(self.nb_total - self.capacite, 0)
+        idx = self._indices(debut, self.nb_total)
+        return {champ: self.tampons[champ][idx] for champ in CHAMPS}
+
+    def vider(self):
+        """ Écrit sur disque les échantillons non encore sauvés (un bloc). """
+        if self.dossier is None or self.nb_sauve == self.nb_total:
+            return
+
+        idx = self._indices(self.nb_sauve, self.nb_total)
+        bloc = {champ: self.tampons[champ][idx] for champ in CHAMPS}
+
+        fichier = f"bloc_{len(self.blocs):05d}.npz"
+        sauver = np.savez_compressed if self.compresser else np.savez
+        sauver(os.path.join(self.dossier, fichier), **bloc)
+
+        self.blocs.append({"fichier": fichier, "n": len(idx),
+                           "t_debut": float(bloc["temps"][0]), "t_fin": float(bloc["temps"][-1])})
+        self.nb_sauve = self.nb_total
+        self._ecrire_index()
+
+    def _ecrire_index(self):
+        index = {"nb_axes": self.nb_axes, "champs": list(CHAMPS),
+                 "nb_echantillons": self.nb_sauve, "blocs": self.blocs}
+        with open(os.path.join(self.dossier, "index.json"), "w") as f:
+            json.dump(index, f, indent=1)
+
+    def fermer(self):
+        """ Vide les derniers échantillons sur disque. """
+        self.vider()
+
+
+def charger_telemetrie(dossier):
+    """
+    Relit tous les blocs d'un dossier de télémétrie et les concatène.
+
+    :return: dict {champ: tableau}
+    """
+    with open(os.path.join(dossier, "index.json")) as f:
+        index = json.load(f)
+
+    if not index["blocs"]:
+        return {champ: np.zeros((0,) if champ == "temps" else (0, index["nb_axes"])) for champ in index["champs"]}
+
+    morceaux = {champ: [] for champ in index["champs"]}
+    for bloc in index["blocs"]:
+        with np.load(os.path.join(dossier, bloc["fichier"])) as donnees:
+            for champ in morceaux:
+                morceaux[champ].append(donnees[champ])
+
+    return {champ: np.concatenate(valeurs) for champ, valeurs in morceaux.items()}
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Validation du modèle dynamique (src/dynamique.py) contre calculateInverseDynamics de PyBullet.
+
+generer_urdf_modele construit un URDF à partir des paramètres DH modifiés et
+inertiels de const_v : les deux modèles décrivent alors exactement le même robot,
+ce qui permet une comparaison sans l'URDF constructeur (ni ses maillages).
+"""
+import os
+
+import numpy as np
+import pybullet as p
+
+from src.const_v import dh, inertie
+from src.dynamique import rnea_batch
+from src.utils import mgd_vers_simulation, vitesse_mgd_vers_simulation
+
+
+def _rot_x(a):
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+
+
+def _rot_z(a):
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+
+
+def _rpy(R):
+    """ Angles roulis / tangage / lacet URDF (R = Rz(y) Ry(p) Rx(r)). """
+    if abs(R[2, 0]) > 1 - 1e-9:
+        # Blocage de cardan : on fixe le roulis à 0
+        tangage = -np.sign(R[2, 0]) * np.pi / 2
+        return 0.0, tangage, np.arctan2(-R[0, 1], R[1, 1])
+    return np.arctan2(R[2, 1], R[2, 2]), np.arcsin(-R[2, 0]), np.arctan2(R[1, 0], R[0, 0])
+
+
+def generer_urdf_modele(dh_params=dh, inertie_params=inertie):
+    """
+    URDF (texte) d'un robot série équivalent au modèle DH modifié :
+    joint i = RotX(alpha_{i-1}) TransX(a_{i-1}) RotZ(offset_i) TransZ(r_i), axe z.
+    """
+    morceaux = ['<?xml version="1.0"?>', '<robot name="ur3_dh">',
+                '  <link name="link0"><inertial><mass value="1.0"/>'
+                '<inertia ixx="0.01" ixy="0" ixz="0" iyy="0.01" iyz="0" izz="0.01"/></inertial></link>']
+
+    for i in range(len(dh_params["a_i_m1"])):
+        R = _rot_x(dh_params["alpha_i_m1"][i]) @ _rot_z(dh_params["theta_offset"][i])
+        xyz = _rot_x(dh_params["alpha_i_m1"][i]) @ np.array([dh_params["a_i_m1"][i], 0, 0]) + R @ np.array([0, 0, dh_params["r_i"][i]])
+        roulis, tangage, lacet = _rpy(R)
+
+        c = inertie_params["centre_masse"][i]
+        I = np.asarray(inertie_params["tenseur"][i])
+        morceaux.append(
+            f'  <link name="link{i + 1}"><inertial>'
+            f'<origin xyz="{c[0]} {c[1]} {c[2]}" rpy="0 0 0"/>'
+            f'<mass value="{inertie_params["masse"][i]}"/>'
+            f'<inertia ixx="{I[0, 0]}" ixy="{I[0, 1]}" ixz="{I[0, 2]}" iyy="{I[1, 1]}" iyz="{I[1, 2]}" izz="{I[2, 2]}"/>'
+            f'</inertial></link>')
+        morceaux.append(
+            f'  <joint name="joint{i + 1}" type="continuous">'
+            f'<parent link="link{i}"/><child link="link{i + 1}"/>'
+            f'<origin xyz="{xyz[0]} {xyz[1]} {xyz[2]}" rpy="{roulis} {tangage} {lacet}"/>'
+            f'<axis xyz="0 0 1"/><dynamics damping="0" friction="0"/></joint>')
+
+    morceaux.append('</robot>')
+    return "\n".join(morceaux)
+
+
+def ecrire_urdf_modele(dossier, dh_params=dh, inertie_params=inertie):
+    """ Écrit l'URDF de generer_urdf_modele dans 'dossier' et renvoie son chemin (pour loadURDF). """
+    chemin = os.path.join(dossier, "ur3_dh.urdf")
+    with open(chemin, "w") as f:
+        f.write(generer_urdf_modele(dh_params, inertie_params))
+    return chemin
+
+
+def comparer_avec_pybullet(robot_id, q, qp, qpp, conversion=True, physicsClientId=0):
+    """
+    Couples calculés par PyBullet (calculateInverseDynamics, échantillon par échantillon)
+    comparés au modèle RNEA vectorisé.
+
+    :param conversion: True pour l'URDF UR3 (convention simulation, voir utils) ;
+                       False pour un URDF issu de generer_urdf_modele (convention MGD).
+    :return: tau_pybullet (N, 6), tau_rnea (N, 6), écart max (N.m)
+    """
+    q = np.atleast_2d(q)
+    qp = np.atleast_2d(qp)
+    qpp = np.atleast_2d(qpp)
+
+    if conversion:
+        q_sim = mgd_vers_simulation(q)
+        qp_sim = vitesse_mgd_vers_simulation(qp)
+        qpp_sim = vitesse_mgd_vers_simulation(qpp)
+    else:
+        q_sim, qp_sim, qpp_sim = q, qp, qpp
+
+    tau_pybullet = np.zeros_like(q)
+    for i in range(len(q)):
+        tau = p.calculateInverseDynamics(robot_id, list(q_sim[i]), list(qp_sim[i]), list(qpp_sim[i]),
+                                         physicsClientId=physicsClientId)
+        tau_pybullet[i] = tau[:6]
+
+    if conversion:
+        tau_pybullet = vitesse_mgd_vers_simulation(tau_pybullet)  # Signes seulement
+
+    tau_rnea = rnea_batch(q, qp, qpp)
+    return tau_pybullet, tau_rnea, float(np.max(np.abs(tau_pybullet - tau_rnea)))
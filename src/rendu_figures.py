@@ -0,0 +1,213 @@
+import functools
+import importlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+# Configuration globale du rendu des figures
+#   mode "ecran"   : comportement historique, plt.show() bloquant
+#   mode "fichier" : rendu PNG/SVG en arrière-plan (backend Agg, pool de processus)
+_CONFIG = {
+    "mode": "ecran",
+    "dossier": "figures",
+    "format": "png",
+    "nb_workers": 2,
+    "max_points": 5000,
+    "chemin": None,  # Fichier cible pendant un rendu (interne)
+}
+
+_executeur = None
+_rendus = []
+_compteurs = {}
+
+
+def configurer_rendu(mode="ecran", dossier="figures", format="png", nb_workers=2, max_points=5000):
+    """
+    Choisit le mode de sortie des fonctions afficher_* / plot_*.
+
+    Args:
+        mode: "ecran" (fenêtres matplotlib) ou "fichier" (images sur disque, sans fenêtre).
+        dossier: répertoire de sortie des images (mode "fichier").
+        format: "png" ou "svg".
+        nb_workers: nombre de processus de rendu (0 = rendu synchrone dans le processus courant).
+        max_points: nombre de points par courbe au-delà duquel on sous-échantillonne (LTTB).
+    """
+    if mode not in ("ecran", "fichier"):
+        raise ValueError("mode doit valoir 'ecran' ou 'fichier'.")
+    if format not in ("png", "svg"):
+        raise ValueError("format doit valoir 'png' ou 'svg'.")
+
+    _CONFIG.update(mode=mode, dossier=dossier, format=format,
+                   nb_workers=nb_workers, max_points=max_points)
+    if mode == "fichier":
+        os.makedirs(dossier, exist_ok=True)
+
+
+# =========================================================================
+# SOUS-ÉCHANTILLONNAGE LTTB (Largest Triangle Three Buckets)
+# =========================================================================
+
+def lttb_indices(x, y, n_sortie):
+    """
+    Indices des points conservés par l'algorithme LTTB : on garde le premier et le
+    dernier point, puis dans chaque paquet le point formant le plus grand triangle
+    avec le point retenu précédent et la moyenne du paquet suivant.
+    Conserve les pics et la forme générale de la courbe.
+    """
+    n = len(x)
+    if n_sortie >= n or n_sortie < 3:
+        return np.arange(n)
+
+    indices = np.empty(n_sortie, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    # Bornes des paquets (hors premier et dernier point)
+    bornes = np.linspace(1, n - 1, n_sortie - 1).astype(int)
+
+    a = 0
+    for k in range(n_sortie - 2):
+        debut, fin = bornes[k], bornes[k + 1]
+
+        # Moyenne du paquet suivant (ou dernier point)
+        if k + 2 < len(bornes):
+            suivant = slice(bornes[k + 1], bornes[k + 2])
+            x_moy, y_moy = x[suivant].mean(), y[suivant].mean()
+        else:
+            x_moy, y_moy = x[-1], y[-1]
+
+        # Aire (x2) des triangles (point retenu, candidat, moyenne suivante)
+        aires = np.abs((x[a] - x_moy) * (y[debut:fin] - y[a])
+                       - (x[a] - x[debut:fin]) * (y_moy - y[a]))
+        a = debut + int(np.argmax(aires))
+        indices[k + 1] = a
+
+    return indices
+
+
+def reduire_series(temps, *series):
+    """
+    Sous-échantillonne des séries partageant le même axe temps si elles dépassent
+    max_points. Chaque colonne est réduite par LTTB et on garde l'union des indices,
+    pour que toutes les courbes restent tracées sur les mêmes instants.
+
+    Returns:
+        temps, *series (réduits, ou inchangés si assez courts)
+    """
+    temps = np.asarray(temps)
+    max_points = _CONFIG["max_points"]
+    if max_points is None or len(temps) <= max_points:
+        return (temps,) + series
+
+    colonnes = []
+    for serie in series:
+        serie = np.asarray(serie)
+        colonnes.extend(serie.T if serie.ndim == 2 else [serie])
+
+    n_colonne = max(max_points // max(len(colonnes), 1), 200)
+    garde = np.zeros(len(temps), dtype=bool)
+    for colonne in colonnes:
+        garde[lttb_indices(temps, colonne, n_colonne)] = True
+
+    return (temps[garde],) + tuple(np.asarray(serie)[garde] for serie in series)
+
+
+# =========================================================================
+# RENDU EN ARRIÈRE-PLAN
+# =========================================================================
+
+def _chemin_suivant(nom):
+    """ Nom de fichier unique pour la k-ième figure 'nom'. """
+    _compteurs[nom] = _compteurs.get(nom, 0) + 1
+    fichier = f"{nom}_{_compteurs[nom]:02d}.{_CONFIG['format']}"
+    return os.path.join(_CONFIG["dossier"], fichier)
+
+
+def _rendu_worker(module, nom_fonction, args, kwargs, chemin, max_points, processus_dedie=True):
+    """
+    Exécute une fonction d'affichage et sauve la figure dans 'chemin'.
+    Le backend Agg n'est imposé que dans un processus de rendu dédié : dans le processus
+    appelant (nb_workers=0), changer de backend couperait l'affichage des figures suivantes.
+    """
+    if processus_dedie:
+        import matplotlib
+        matplotlib.use("Agg")
+
+    ancien = dict(_CONFIG)
+    _CONFIG.update(mode="rendu", chemin=chemin, max_points=max_points)
+    try:
+        fonction = getattr(importlib.import_module(module), nom_fonction).__wrapped__
+        fonction(*args, **kwargs)
+    finally:
+        _CONFIG.clear()
+        _CONFIG.update(ancien)
+    return chemin
+
+
+def _obtenir_executeur():
+    global _executeur
+    if _executeur is None:
+        # 'spawn' : processus neufs, sans état matplotlib hérité du parent
+        contexte = multiprocessing.get_context("spawn")
+        _executeur = ProcessPoolExecutor(max_workers=_CONFIG["nb_workers"], mp_context=contexte)
+    return _executeur
+
+
+def rendu_figure(nom):
+    """
+    Décorateur des fonctions d'affichage.
+    En mode "ecran", la fonction est appelée normalement.
+    En mode "fichier", le tracé est confié à un processus de rendu et l'appel rend la main
+    immédiatement ; la fonction renvoie alors le chemin du fichier qui sera produit.
+    """
+    def decorateur(fonction):
+        @functools.wraps(fonction)
+        def wrapper(*args, **kwargs):
+            if _CONFIG["mode"] != "fichier":
+                return fonction(*args, **kwargs)
+
+            chemin = _chemin_suivant(nom)
+            if _CONFIG["nb_workers"] == 0:
+                return _rendu_worker(fonction.__module__, fonction.__name__, args, kwargs,
+                                     chemin, _CONFIG["max_points"], processus_dedie=False)
+
+            futur = _obtenir_executeur().submit(_rendu_worker, fonction.__module__, fonction.__name__,
+                                                args, kwargs, chemin, _CONFIG["max_points"])
+            _rendus.append(futur)
+            return chemin
+        return wrapper
+    return decorateur
+
+
+def terminer_figure(fig=None):
+    """
+    À appeler à la place de plt.show() en fin de fonction d'affichage :
+    affiche la figure à l'écran, ou la sauve puis la ferme pendant un rendu fichier.
+    """
+    import matplotlib.pyplot as plt
+
+    if _CONFIG["mode"] == "rendu":
+        fig = fig if fig is not None else plt.gcf()
+        fig.savefig(_CONFIG["chemin"])
+        plt.close(fig)
+    else:
+        plt.show()
+
+
+def attendre_rendus():
+    """
+    Attend la fin de tous les rendus en cours et libère le pool de processus.
+
+    Returns:
+        Liste des fichiers produits.
+    """
+    global _executeur
+    chemins = [futur.result() for futur in _rendus]
+    _rendus.clear()
+    if _executeur is not None:
+        _executeur.shutdown()
+        _executeur = None
+    return chemins
@@ -0,0 +1,202 @@
+import numpy as np
+
+from src.part1_loi_mouvement import loi_trapezoidale
+from src.part4_generation_articulaire import calcul_trajectoire_articulaire, parametres_robot
+
+
+# =========================================================================
+# SEGMENTS GÉOMÉTRIQUES (paramétrés par l'abscisse curviligne s)
+# =========================================================================
+
+def segment_lineaire(A, B, V=None):
+    """
+    Segment de droite de A vers B. V (m/s) optionnel : vitesse propre au segment.
+    """
+    A = np.array(A, dtype=float)
+    B = np.array(B, dtype=float)
+    L = np.linalg.norm(B - A)
+    if L == 0:
+        raise ValueError("Segment linéaire de longueur nulle.")
+    return {"type": "lineaire", "A": A, "B": B, "L": L, "V": V}
+
+
+def segment_arc(O, R, u_debut, u_fin, V=None):
+    """
+    Arc de cercle dans le plan (X, Z), Y constant, même convention que V.2 :
+        x = Ox - R sin(u),  z = Oz + R cos(u)
+    L'arc va de l'angle u_debut à u_fin (sens trigonométrique si u_fin > u_debut).
+    """
+    O = np.array(O, dtype=float)
+    L = abs(u_fin - u_debut) * R
+    if L == 0:
+        raise ValueError("Arc de longueur nulle.")
+    return {"type": "arc", "O": O, "R": R, "u_debut": u_debut, "u_fin": u_fin, "L": L, "V": V}
+
+
+def evaluer_segment(seg, s, s_dot, s_ddot):
+    """
+    Calcule X, dX, ddX (tableaux (n, 3)) le long d'un segment pour s(t), s_dot(t), s_ddot(t).
+    """
+    if seg["type"] == "lineaire":
+        d = (seg["B"] - seg["A"]) / seg["L"]  # Direction unitaire
+        X = seg["A"] + np.outer(s, d)
+        dX = np.outer(s_dot, d)
+        ddX = np.outer(s_ddot, d)
+        return X, dX, ddX
+
+    if seg["type"] == "arc":
+        Cx, Cy, Cz = seg["O"]
+        R = seg["R"]
+        sens = np.sign(seg["u_fin"] - seg["u_debut"])
+        u = seg["u_debut"] + sens * s / R
+
+        X = np.empty((len(s), 3))
+        X[:, 0] = Cx - R * np.sin(u)
+        X[:, 1] = Cy
+        X[:, 2] = Cz + R * np.cos(u)
+
+        dX = np.zeros((len(s), 3))
+        dX[:, 0] = -sens * s_dot * np.cos(u)
+        dX[:, 2] = -sens * s_dot * np.sin(u)
+
+        ddX = np.zeros((len(s), 3))
+        ddX[:, 0] = -sens * s_ddot * np.cos(u) + (s_dot ** 2 / R) * np.sin(u)
+        ddX[:, 2] = -sens * s_ddot * np.sin(u) - (s_dot ** 2 / R) * np.cos(u)
+        return X, dX, ddX
+
+    raise ValueError(f"Type de segment inconnu : {seg['type']}")
+
+
+def extremites_segment(seg):
+    """ Renvoie les points de départ et d'arrivée d'un segment. """
+    X, _, _ = evaluer_segment(seg, np.array([0.0, seg["L"]]), np.zeros(2), np.zeros(2))
+    return X[0], X[1]
+
+
+# =========================================================================
+# COMPOSITION AVEC ZONES DE RACCORDEMENT
+# =========================================================================
+
+def planifier_composition(segments, V, A=0.25, fusion=1.0, tol_jonction=1e-6):
+    """
+    Lois de mouvement et instants de départ des segments d'un programme (sans échantillonnage).
+
+    Returns:
+        plan : dict {'segments', 'lois', 'debuts', 'extremites', 'duree'}, à évaluer
+        par evaluer_composition() sur n'importe quel vecteur temps.
+    """
+    if len(segments) == 0:
+        raise ValueError("Aucun segment à composer.")
+    if not 0.0 <= fusion <= 1.0:
+        raise ValueError("fusion doit être compris entre 0 et 1.")
+
+    # 1. Lois de mouvement et instants de départ de chaque segment
+    lois = []
+    for seg in segments:
+        V_seg = seg["V"] if seg["V"] is not None else V
+        _, _, _, (t1, t2, tf) = loi_trapezoidale(0.0, seg["L"], V_seg, A)
+        lois.append((V_seg, t1, t2, tf))
+
+    debuts = np.zeros(len(segments))
+    for k in range(1, len(segments)):
+        _, _, t2_prec, tf_prec = lois[k - 1]
+        t_acc = lois[k][1]
+        recouvrement = fusion * min(tf_prec - t2_prec, t_acc)
+        debuts[k] = debuts[k - 1] + tf_prec - recouvrement
+
+    # 2. Vérification de la contiguïté des segments
+    extremites = [extremites_segment(seg) for seg in segments]
+    for k in range(1, len(segments)):
+        saut = np.linalg.norm(extremites[k][0] - extremites[k - 1][1])
+        if saut > tol_jonction:
+            raise ValueError(f"Segments {k - 1} et {k} non contigus (écart {saut:.3e} m).")
+
+    return {"segments": segments, "lois": lois, "debuts": debuts, "extremites": extremites,
+            "duree": debuts[-1] + lois[-1][3], "A": A}
+
+
+def evaluer_composition(plan, temps):
+    """
+    Consigne X, dX, ddX d'un programme planifié, aux instants 'temps' (croissants).
+    Chaque échantillon ne dépend que de son instant : une longue trajectoire peut être
+    évaluée fenêtre par fenêtre.
+    """
+    temps = np.asarray(temps, dtype=float)
+    N = len(temps)
+    A = plan["A"]
+    extremites = plan["extremites"]
+
+    X = np.zeros((N, 3))
+    dX = np.zeros((N, 3))
+    ddX = np.zeros((N, 3))
+    X[:] = extremites[0][0]
+
+    # Superposition des déplacements de chaque segment (écriture en place)
+    for k, seg in enumerate(plan["segments"]):
+        V_seg, _, _, tf_seg = plan["lois"][k]
+        debut = plan["debuts"][k]
+        i0 = np.searchsorted(temps, debut)
+        i1 = np.searchsorted(temps, debut + tf_seg, side='right')
+
+        s, s_dot, s_ddot, _ = loi_trapezoidale(temps[i0:i1] - debut, seg["L"], V_seg, A)
+        X_seg, dX_seg, ddX_seg = evaluer_segment(seg, s, s_dot, s_ddot)
+
+        depart, arrivee = extremites[k]
+        X[i0:i1] += X_seg - depart
+        dX[i0:i1] += dX_seg
+        ddX[i0:i1] += ddX_seg
+        X[i1:] += arrivee - depart  # Segment terminé : déplacement complet
+
+    return X, dX, ddX
+
+
+def calcul_trajectoire_composee(segments, V, A=0.25, fusion=1.0, dt=0.005, tol_jonction=1e-6):
+    """
+    Enchaîne plusieurs segments en une seule consigne opérationnelle X(t), dX(t), ddX(t).
+
+    Chaque segment suit une loi trapézoïdale (même accélération A, vitesse V ou V propre
+    au segment). Les segments se recouvrent dans le temps au niveau des jonctions :
+    la décélération du segment k est superposée à l'accélération du segment k+1
+    (zone de raccordement). La vitesse reste continue et le robot ne s'arrête plus
+    entre deux mouvements.
+
+    Args:
+        segments: liste de segments (segment_lineaire, segment_arc), contigus.
+        V (m/s): vitesse de palier par défaut.
+        A (m/s²): accélération/décélération commune.
+        fusion: taux de recouvrement dans [0, 1] (0 = arrêt à chaque jonction).
+        dt (s): période d'échantillonnage.
+
+    Returns:
+        time, X, dX, ddX, debuts (instants de départ de chaque segment)
+    """
+    plan = planifier_composition(segments, V, A, fusion, tol_jonction)
+
+    # Vecteur temps, puis consigne sur toute la durée
+    N = int(plan["duree"] / dt) + 1
+    time = np.linspace(0, plan["duree"], N)
+    X, dX, ddX = evaluer_composition(plan, time)
+
+    return time, X, dX, ddX, plan["debuts"]
+
+
+def traj_composee(segments, V, A=0.25, fusion=1.0, dt=0.005, q_init=None, limites=None, robot=None, Debug=False):
+    """
+    Génération articulaire d'un programme multi-segments.
+    Une seule trajectoire contiguë (N, 6) est préallouée ; le MGI de chaque segment
+    est initialisé par la fin du segment précédent.
+    limites, robot : comme pour traj() (UR3 sans contrôle par défaut ; un robot donné
+    apporte ses paramètres DH et ses limites).
+
+    Returns:
+        time, q, qp, qpp
+    """
+    time, X_ref, dX_ref, _, _ = calcul_trajectoire_composee(segments, V, A, fusion, dt)
+
+    if Debug: print(f"Trajectoire composée : {len(segments)} segments, durée {time[-1]:.2f} s")
+
+    dh_params, limites = parametres_robot(robot, limites)
+    q, qp, qpp = calcul_trajectoire_articulaire(X_ref, dX_ref, dt=time[1] - time[0], q_init=q_init,
+                                                limites=limites, dh_params=dh_params, Debug=Debug)
+
+    return time, q, qp, qpp
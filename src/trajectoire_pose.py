@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Trajectoire circulaire en pose complète (6 DDL) : position et orientation de l'outil.
+
+traj() ne commande que la position (J_v, 3x6) : l'orientation de l'outil dérive
+librement le long du cercle. Ici l'orientation de consigne est fixe, ou interpolée
+par SLERP (vectorisé sur toute la trajectoire) entre une orientation de départ et
+une orientation d'arrivée, au prorata de l'abscisse curviligne. Chaque échantillon
+est résolu par le MGI en pose (Jacobienne 6x6) et la vitesse par le MDI complet :
+qp = J^-1 [dX ; omega].
+"""
+import numpy as np
+
+from src.const_v import dh
+from src.matrice_tn import generate_transformation_matrices, calcul_T06_global
+from src.modele_differentiel import Jacob_geo, MGI_numerique, MGI_pose
+from src.modeles_robot import modele_robot
+from src.orientation import quaternion_depuis_matrice, matrice_depuis_quaternion, slerp, vecteur_rotation
+from src.part1_loi_mouvement import calcul_loi_mouvement
+from src.part2_trajectoire_operationnelle import calcul_trajectoire_operationnelle
+from src.part4_generation_articulaire import Q_INIT_DEFAUT
+
+
+def consigne_orientation(s, s_dot, longueur, R_debut, R_fin=None):
+    """
+    Orientation de consigne le long d'une trajectoire d'abscisse s (0 .. longueur).
+
+    Args:
+        R_debut: orientation (3x3) de départ.
+        R_fin: orientation (3x3) d'arrivée (None : orientation fixe).
+
+    Returns:
+        R_ref (N, 3, 3), omega_ref (N, 3) vitesse angulaire dans le repère de base
+    """
+    N = len(s)
+    R_debut = np.asarray(R_debut, dtype=float)
+    if R_fin is None:
+        return np.broadcast_to(R_debut, (N, 3, 3)).copy(), np.zeros((N, 3))
+
+    R_fin = np.asarray(R_fin, dtype=float)
+    Q = slerp(quaternion_depuis_matrice(R_debut), quaternion_depuis_matrice(R_fin), s / longueur)
+
+    # SLERP = rotation d'axe fixe (dans la base) : omega = axe * angle * du/dt
+    axe_angle = vecteur_rotation(R_fin @ R_debut.T)
+    return matrice_depuis_quaternion(Q), np.outer(s_dot / longueur, axe_angle)
+
+
+def resoudre_points_pose(X_ref, dX_ref, R_ref, omega_ref, q, qp, q_prev, dh_params=dh, Debug=False):
+    """
+    MGI en pose et MDI complet échantillon par échantillon, écrits en place dans q et qp.
+    Chaque MGI est initialisé par la solution de l'échantillon précédent, le premier par q_prev.
+
+    Returns:
+        dernière solution
+    """
+    vitesse = np.empty(6)
+    for i in range(len(X_ref)):
+        q_sol = MGI_pose(X_ref[i], R_ref[i], q_prev, dh_params, max_iter=20, alpha=0.8, tol=1e-5, tol_rot=1e-5)
+        if q_sol is None:
+            if Debug: print(f"Warn: MGI pose non convergé itération {i}")
+            q_sol = q_prev
+
+        q[i, :] = q_sol
+        q_prev = q_sol
+
+        vitesse[:3] = dX_ref[i]
+        vitesse[3:] = omega_ref[i]
+        qp[i, :] = np.dot(np.linalg.pinv(Jacob_geo(generate_transformation_matrices(q_sol, dh_params))), vitesse)
+    return q_prev
+
+
+def calcul_trajectoire_articulaire_pose(X_ref, dX_ref, R_ref, omega_ref, dt, q_init=None, dh_params=dh,
+                                        Debug=False):
+    """
+    Équivalent de calcul_trajectoire_articulaire en pose complète.
+    Le premier échantillon est résolu depuis q_init (par défaut Q_INIT_DEFAUT) avec plus
+    d'itérations (départ à froid).
+
+    Returns:
+        q, qp, qpp
+    """
+    N = len(X_ref)
+    q = np.zeros((N, 6))
+    qp = np.zeros((N, 6))
+    q_init = np.array(Q_INIT_DEFAUT if q_init is None else q_init, dtype=float)
+
+    q_depart = MGI_pose(X_ref[0], R_ref[0], q_init, dh_params, max_iter=100, alpha=0.8, tol=1e-5, tol_rot=1e-5)
+    if q_depart is None:
+        raise ValueError("MGI en pose impossible au premier échantillon (orientation hors d'atteinte ?).")
+
+    if Debug: print(f"Calcul de la trajectoire articulaire en pose ({N} points)...")
+    resoudre_points_pose(X_ref, dX_ref, R_ref, omega_ref, q, qp, q_depart, dh_params, Debug=Debug)
+
+    qpp = np.gradient(qp, dt, axis=0)
+    return q, qp, qpp
+
+
+def orientation_depart(X_depart, q_init=None, dh_params=dh):
+    """ Orientation de l'outil au départ de traj() : MGI position seule depuis q_init. """
+    q_init = np.array(Q_INIT_DEFAUT if q_init is None else q_init, dtype=float)
+    q_sol = MGI_numerique(X_depart, q_init, dh_params, max_iter=100, alpha=0.8, tol=1e-5)
+    if q_sol is None:
+        raise ValueError("Point de départ hors d'atteinte.")
+    return calcul_T06_global(generate_transformation_matrices(q_sol, dh_params))[:3, :3]
+
+
+def traj_pose(O, R, V, dt=0.005, orientation=None, orientation_fin=None, robot=None, Debug=False):
+    """
+    Cercle de traj(O, R, V) avec l'orientation de l'outil commandée.
+
+    Args:
+        orientation: orientation (3x3) de l'outil au départ (défaut : celle du départ de traj()).
+        orientation_fin: orientation (3x3) à l'arrivée, interpolée par SLERP (None : orientation fixe).
+        robot: nom du modèle ou ModeleRobot (UR3 par défaut).
+
+    Returns:
+        time, q, qp, qpp, R_ref, omega_ref
+    """
+    dh_params = dh if robot is None else modele_robot(robot).dh
+    time, s, s_dot, s_ddot, _ = calcul_loi_mouvement(R, V, dt)
+    X_ref, dX_ref, _ = calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot)
+
+    if orientation is None:
+        orientation = orientation_depart(X_ref[0], dh_params=dh_params)
+    R_ref, omega_ref = consigne_orientation(s, s_dot, 2 * np.pi * R, orientation, orientation_fin)
+
+    q, qp, qpp = calcul_trajectoire_articulaire_pose(X_ref, dX_ref, R_ref, omega_ref, time[1] - time[0],
+                                                     dh_params=dh_params, Debug=Debug)
+    return time, q, qp, qpp, R_ref, omega_ref
@@ -1,17 +1,20 @@
 import numpy as np
 
+from src.const_v import conversion_simulation
 
-def mgd_vers_simulation(q_mgd):
+
+def mgd_vers_simulation(q_mgd, conversion=conversion_simulation):
     """
     Convertit la configuration articulaire du MGD (Théorique)
     vers la configuration attendue par PyBullet (Réel/Simulé).
+    conversion : signes / offsets du modèle (const_v.modeles_robot[...]["simulation"]).
     """
     # 1. Définition des corrections
     # Signes : Inversion de l'axe 2
-    signes = np.array([1, -1, -1, 1, 1, 1])
+    signes = np.array(conversion["signes"])
 
     # Offsets : Décalages pour les axes 4 et 5
-    offsets = np.array([0, 0, 0, -np.pi / 2, np.pi, 0])
+    offsets = np.array(conversion["offsets"])
 
     # 2. Calcul
     q_mgd = np.array(q_mgd)
@@ -20,7 +23,7 @@ def mgd_vers_simulation(q_mgd):
     return q_sim
 
 
-def simulation_vers_mgd(q_sim):
+def simulation_vers_mgd(q_sim, conversion=conversion_simulation):
     """
     Convertit la configuration articulaire de la Simulation (PyBullet)
     vers la configuration du MGD (Théorique).
@@ -28,8 +31,8 @@ def simulation_vers_mgd(q_sim):
     Inverse de mgd_vers_simulation.
     """
     # 1. Définition des corrections (Doivent être identiques à l'aller)
-    signes = np.array([1, -1, -1, 1, 1, 1])
-    offsets = np.array([0, 0, 0, -np.pi / 2, np.pi, 0])
+    signes = np.array(conversion["signes"])
+    offsets = np.array(conversion["offsets"])
 
     # 2. Calcul Inverse
     # Formule aller : q_sim = (q_mgd * signes) + offsets
@@ -42,6 +45,33 @@ def simulation_vers_mgd(q_sim):
 
     return q_mgd
 
+def vitesse_mgd_vers_simulation(qp_mgd, conversion=conversion_simulation):
+    """
+    Convertit des vitesses (ou couples) articulaires MGD -> PyBullet.
+    Les offsets sont constants : seuls les signes s'appliquent aux dérivées.
+    """
+    signes = np.array(conversion["signes"])
+    return np.array(qp_mgd) * signes
+
+
+def vitesse_simulation_vers_mgd(qp_sim, conversion=conversion_simulation):
+    """
+    Convertit des vitesses (ou couples) articulaires PyBullet -> MGD.
+    Inverse de vitesse_mgd_vers_simulation (les signes valent +/-1).
+    """
+    signes = np.array(conversion["signes"])
+    return np.array(qp_sim) * signes
+
+
+def derouler_angles(q):
+    """
+    Rend continue une trajectoire articulaire (N, 6) : le MGI normalise ses solutions
+    dans [-pi, pi], d'où des sauts de 2 pi quand un axe passe par +/- pi. Ces sauts sont
+    retirés (np.unwrap) ; la configuration physique, et donc le MGD, est inchangée.
+    À appliquer avant toute interpolation ou consigne envoyée au simulateur.
+    """
+    return np.unwrap(np.asarray(q, dtype=float), axis=0)
+
 # --- Exemple de vérification avec vos valeurs ---
 if __name__ == "__main__":
     # Cas 1 : Tout à zéro
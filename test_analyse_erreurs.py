@@ -0,0 +1,55 @@
+import time as chrono
+import numpy as np
+from src.const_v import dh
+from src.matrice_tn import generate_transformation_matrices, calcul_T06_global
+from src.modele_differentiel import Jacob_geo
+from src.part3_analyse_tache import calcul_X_robot_et_erreurs, rapport_erreurs
+
+
+def test_analyse_erreurs_vectorisee():
+    print("==================================================")
+    print("     TEST ANALYSE DES ERREURS (VERSION VECTORISÉE)")
+    print("==================================================\n")
+
+    # 1. Trajectoire articulaire arbitraire (sinusoïdes sur chaque axe)
+    N = 2000
+    temps = np.linspace(0, 10, N)
+    phases = np.linspace(0, 1, 6)
+    q = 0.5 * np.sin(0.3 * temps[:, None] + phases)
+    qp = 0.15 * np.cos(0.3 * temps[:, None] + phases)
+
+    # 2. Référence : boucle échantillon par échantillon (MGD + Jacob_geo)
+    X_boucle = np.zeros((N, 3))
+    dX_boucle = np.zeros((N, 3))
+    t0 = chrono.perf_counter()
+    for i in range(N):
+        mats = generate_transformation_matrices(q[i], dh)
+        X_boucle[i] = calcul_T06_global(mats)[:3, 3]
+        dX_boucle[i] = Jacob_geo(mats)[:3, :].dot(qp[i])
+    t_boucle = chrono.perf_counter() - t0
+
+    # 3. Version vectorisée (consigne = référence décalée de 1 mm sur x)
+    X_consigne = X_boucle + np.array([1e-3, 0, 0])
+    t0 = chrono.perf_counter()
+    X_robot, dX_robot, erreur_X, erreur_dX = calcul_X_robot_et_erreurs(temps, X_consigne, dX_boucle, q, qp)
+    t_batch = chrono.perf_counter() - t0
+
+    ecart_X = np.max(np.abs(X_robot - X_boucle))
+    ecart_dX = np.max(np.abs(dX_robot - dX_boucle))
+    print(f"Écart MGD boucle / batch      : {ecart_X:.2e} m")
+    print(f"Écart vitesse boucle / batch  : {ecart_dX:.2e} m/s")
+    print(f"Temps boucle : {t_boucle * 1e3:.1f} ms, batch : {t_batch * 1e3:.1f} ms")
+    assert ecart_X < 1e-12 and ecart_dX < 1e-12
+
+    # 4. Rapport sans interface graphique
+    rapport = rapport_erreurs(temps, erreur_X, erreur_dX)
+    print(f"\nRMS position : {rapport['position']['rms']}")
+    print(f"P95 position : {rapport['position']['p95']}")
+    assert np.allclose(rapport["position"]["rms"], [1e-3, 0, 0], atol=1e-12)
+    assert np.allclose(rapport["vitesse"]["max"], 0, atol=1e-12)
+
+    print("\n>>> SUCCÈS : Analyse vectorisée identique à la boucle. <<<")
+
+
+if __name__ == "__main__":
+    test_analyse_erreurs_vectorisee()
@@ -0,0 +1,67 @@
+import time
+import numpy as np
+from src.collisions import ModeleCollision, distance_segments
+from src.part4_generation_articulaire import traj
+
+
+def test_collisions():
+    print("==================================================")
+    print("     TEST COLLISIONS (CAPSULES, SOL, OBSTACLES)")
+    print("==================================================\n")
+
+    # 1. Distance segment / segment contre un échantillonnage fin des deux segments
+    rng = np.random.default_rng(0)
+    u = np.linspace(0, 1, 401)[:, None]
+    P1, Q1, P2, Q2 = rng.uniform(-1, 1, (4, 50, 3))
+    Q2[:5] = P2[:5]                       # Points
+    Q1[5:10] = P1[5:10] + 0.3 * (Q2[5:10] - P2[5:10])  # Segments parallèles
+    d = distance_segments(P1, Q1, P2, Q2)
+    for i in range(50):
+        a = P1[i] + u * (Q1[i] - P1[i])
+        b = P2[i] + u * (Q2[i] - P2[i])
+        brute = np.min(np.linalg.norm(a[:, None] - b[None], axis=-1))
+        assert d[i] <= brute + 1e-12 and brute - d[i] < 5e-3, (i, d[i], brute)
+
+    # 2. Configurations connues
+    modele = ModeleCollision()
+    rapport = modele.verifier([0.0, 1.0, 2.0], [[0, 0, 0, 0, 0, 0], [0, -2.0, 0, 0, 0, 0], [0, 0, 2.9, 0, 0, 0]])
+    assert rapport["collision"].tolist() == [False, True, True]
+    assert rapport["premier_temps"] == 1.0 and rapport["premier_contact"][1] == "sol"
+    assert rapport["premiere_distance"] < 0
+    print(f" -> Bras replié vers le sol : {rapport['premier_contact']} ({rapport['premiere_distance']:.3f} m)")
+
+    # 3. Pré-passe : mêmes collisions que les distances exactes (aucun contact manqué)
+    q = rng.uniform(-np.pi, np.pi, (5000, 6))
+    distances, _ = modele.distances(q)
+    for marge in (0.0, 0.02, 0.1):
+        rapport = modele.verifier(np.arange(len(q)), q, marge=marge)
+        assert np.array_equal(rapport["collision"], distances.min(axis=1) < marge), marge
+        assert rapport["nb_candidats"] < distances.size
+        print(f" -> Aléatoires, marge {marge} m : {rapport['nb_collisions']} / {len(q)} en collision, "
+              f"{rapport['nb_candidats']} / {distances.size} distances exactes")
+
+    # 4. Trajectoire du cercle : dégagée ; obstacle placé sur le trajet de l'outil : détecté
+    temps, q_traj, _, _ = traj([0.25, -0.15, 0.5], 0.1, 0.05, dt=0.005)
+    t0 = time.perf_counter()
+    rapport = modele.verifier(temps, q_traj, marge=0.02)
+    duree = time.perf_counter() - t0
+    print(f" -> Cercle ({len(temps)} points) : dégagement min {rapport['degagement_min']:.3f} m en {duree * 1e3:.1f} ms")
+    assert rapport["sans_collision"] and duree < 0.5
+
+    A, B = modele.capsules(q_traj)
+    modele.ajouter_obstacle("montage", B[len(temps) // 2, 6], B[len(temps) // 2, 6], 0.01)
+    rapport = modele.verifier(temps, q_traj)
+    assert not rapport["sans_collision"] and rapport["premier_contact"][1] == "montage"
+    assert rapport["premier_temps"] <= temps[len(temps) // 2]
+
+    modele = ModeleCollision()
+    modele.ajouter_plan("paroi", [-1, 0, 0], [0.3, 0, 0])  # Le cercle (plan xz) va jusqu'à x = 0.35
+    rapport = modele.verifier(temps, q_traj)
+    assert rapport["premier_contact"][1] == "paroi"
+    assert 0 < rapport["nb_collisions"] < len(temps)
+
+    print("\n>>> SUCCÈS : Vérification des collisions validée. <<<")
+
+
+if __name__ == "__main__":
+    test_collisions()
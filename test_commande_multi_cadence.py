@@ -0,0 +1,63 @@
+import tempfile
+import numpy as np
+import pytest
+
+p = pytest.importorskip("pybullet")
+
+from src.const_v import limites_articulaires
+from src.mgi_parallele import ecart_angulaire
+from src.part4_generation_articulaire import traj
+from src.pybullet.commande_multi_cadence import interpoler_hermite, simulation_multi_cadence
+from src.pybullet.simulation_pybullet import charger_robot
+from src.pybullet.validation_dynamique import ecrire_urdf_modele
+
+
+def test_commande_multi_cadence():
+    print("==================================================")
+    print("       TEST INTERPOLATION D'HERMITE (COMMANDE MULTI-CADENCE)")
+    print("==================================================\n")
+
+    # Cercle dont l'axe 2 passe par +/- pi : le MGI renvoie des sauts de 2 pi
+    temps, q, qp, _ = traj([0.25, -0.15, 0.5], 0.1, 0.05, dt=0.02)
+    sauts = np.flatnonzero(np.abs(np.diff(q, axis=0)).max(axis=1) > np.pi)
+    print(f"Sauts de 2 pi dans la consigne planifiée : échantillons {sauts + 1}")
+    assert len(sauts) > 0
+
+    # 1. Interpolation à 2 kHz : pas de balayage du tour complet entre deux ticks
+    f_commande = 2000
+    t = np.arange(0.0, temps[-1], 1.0 / f_commande)
+    q_interp, qp_interp = interpoler_hermite(t, temps, q, qp)
+    pas_max = np.abs(np.diff(q_interp, axis=0)).max()
+    borne = np.max(limites_articulaires["vitesse"]) / f_commande
+    print(f"|dq| max entre deux ticks : {pas_max:.2e} rad (borne qp_max / f = {borne:.2e} rad)")
+    assert pas_max < borne
+
+    # 2. La consigne interpolée passe par les points planifiés (à 2 pi près), vitesses comprises
+    q_plan, qp_plan = interpoler_hermite(temps, temps, q, qp)
+    assert np.abs(ecart_angulaire(q_plan, q)).max() < 1e-9
+    assert np.allclose(qp_plan, qp)
+
+    # 3. Boucle multi-cadence (DIRECT, URDF du modèle) : commande 500 Hz, physique 2 kHz,
+    #    plan décalé dans le temps (la grille de commande part de temps[0])
+    client = p.connect(p.DIRECT)
+    try:
+        with tempfile.TemporaryDirectory() as dossier:
+            robot, articulations = charger_robot(0.02, urdf_path=ecrire_urdf_modele(dossier), physicsClientId=client)
+        resultat = simulation_multi_cadence(robot, articulations, temps + 1.0, q, qp, f_commande=500,
+                                            f_physique=2000, conversion=False, physicsClientId=client)
+    finally:
+        p.disconnect(client)
+
+    print(f"Multi-cadence : {len(resultat['temps'])} ticks de {resultat['temps'][0]:.3f} à "
+          f"{resultat['temps'][-1]:.3f} s, erreur max {resultat['erreur'].max() * 1000:.3f} mm")
+    assert resultat["temps"][0] == temps[0] + 1.0
+    assert abs(resultat["temps"][-1] - (temps[-1] + 1.0)) <= 1.0 / 500
+    assert np.allclose(np.diff(resultat["temps"]), 1.0 / 500)
+    assert resultat["cadence"] is None
+    assert resultat["erreur"].max() < 1e-3
+
+    print("\n>>> SUCCÈS : Interpolation continue à travers les sauts de 2 pi. <<<")
+
+
+if __name__ == "__main__":
+    test_commande_multi_cadence()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import numpy as np
+from src.const_v import couples_max
+from src.dynamique import rnea_batch, matrice_inertie_batch, verifier_couples
+from src.part4_generation_articulaire import traj
+
+
+def test_dynamique():
+    print("==================================================")
+    print("       TEST MODÈLE DYNAMIQUE (RNEA VECTORISÉ)")
+    print("==================================================\n")
+
+    # 1. Comparaison avec PyBullet (URDF généré depuis les paramètres DH / inertiels)
+    try:
+        import pybullet as p
+        from src.pybullet.validation_dynamique import generer_urdf_modele, comparer_avec_pybullet
+    except ImportError:
+        print("pybullet non installé : comparaison ignorée.")
+    else:
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, "ur3_dh.urdf")
+            with open(chemin, "w") as f:
+                f.write(generer_urdf_modele())
+
+            client = p.connect(p.DIRECT)
+            p.setGravity(0, 0, -9.81, physicsClientId=client)
+            robot = p.loadURDF(chemin, useFixedBase=True, flags=p.URDF_USE_INERTIA_FROM_FILE,
+                               physicsClientId=client)
+
+            rng = np.random.default_rng(0)
+            q = rng.uniform(-np.pi, np.pi, (50, 6))
+            qp = rng.uniform(-1, 1, (50, 6))
+            qpp = rng.uniform(-3, 3, (50, 6))
+            _, _, ecart = comparer_avec_pybullet(robot, q, qp, qpp, conversion=False, physicsClientId=client)
+            p.disconnect(client)
+
+        print(f"Écart RNEA / PyBullet (50 configurations) : {ecart:.2e} N.m")
+        assert ecart < 1e-8
+
+    # 2. Couples de la trajectoire circulaire et faisabilité
+    time, q, qp, qpp = traj([0.25, -0.15, 0.5], 0.1, 0.05, dt=0.02)
+    tau = rnea_batch(q, qp, qpp)
+    rapport = verifier_couples(time, tau)
+    print(f"\nTrajectoire ({len(time)} points) : |tau| max par axe = {np.round(np.abs(tau).max(axis=0), 2)} N.m")
+    print(f"Marges : {np.round(rapport['marge'], 2)} N.m -> faisable : {rapport['faisable']}")
+    assert rapport["faisable"]
+
+    # 3. Détection d'un dépassement (limites artificiellement réduites)
+    rapport = verifier_couples(time, tau, limites=np.array(couples_max) * 0.01)
+    print(f"Limites / 100 : premier dépassement à t = {rapport['premier_temps']:.2f} s, axe {rapport['premier_axe'] + 1}")
+    assert not rapport["faisable"]
+
+    # 4. Matrice d'inertie : symétrique définie positive, et M q̈ = τ(q, 0, q̈) sans gravité
+    M = matrice_inertie_batch(q[::20])
+    assert np.allclose(M, np.transpose(M, (0, 2, 1)))
+    assert np.all(np.linalg.eigvalsh(M) > 0)
+    tau_M = np.einsum('nij,nj->ni', M, qpp[::20])
+    assert np.allclose(tau_M, rnea_batch(q[::20], np.zeros_like(qpp[::20]), qpp[::20], gravite=0.0))
+    print(f"Matrice d'inertie ({len(M)} configurations) : symétrique définie positive")
+
+    print("\n>>> SUCCÈS : Modèle dynamique validé. <<<")
+
+
+if __name__ == "__main__":
+    test_dynamique()
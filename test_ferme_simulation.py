@@ -0,0 +1,71 @@
+import tempfile
+import pytest
+
+pytest.importorskip("pybullet")
+
+from src.memoire_partagee import publier_trajectoire
+from src.part4_generation_articulaire import traj
+from src.pybullet.ferme_simulation import executer_ferme
+from src.pybullet.validation_dynamique import ecrire_urdf_modele
+
+
+def test_ferme_simulation():
+    print("==================================================")
+    print("       TEST FERME DE SIMULATION (DIRECT)")
+    print("==================================================\n")
+
+    O, R, V = [0.25, -0.15, 0.5], 0.1, 0.05
+    temps, q, qp, _ = traj(O, R, V, dt=0.02)
+    temps, q, qp = temps[:300], q[:300], qp[:300]
+    trajectoire = {"temps": temps, "q": q, "qp": qp, "O": O, "R": R, "V": V}
+
+    partagee = publier_trajectoire(temps=temps, q=q, qp=qp)
+    memoire = {"memoire": partagee.descripteur, "O": O, "R": R, "V": V}
+
+    jobs = [dict(trajectoire, nom="position", mode="position"),
+            dict(trajectoire, nom="vitesse", mode="vitesse"),
+            dict(trajectoire, nom="inconnu", mode="couple"),
+            {"nom": "incomplet", "mode": "position", "O": O},
+            dict(memoire, nom="memoire", mode="position"),
+            dict(memoire, nom="memoire_echec", mode="couple")]
+
+    try:
+        with tempfile.TemporaryDirectory() as dossier:
+            resultats = executer_ferme(jobs, nb_workers=1, urdf_path=ecrire_urdf_modele(dossier), sous_pas=4,
+                                       conversion=False)
+        # Les processus se sont détachés du segment, y compris après un échec
+        nb_references = partagee.nb_references
+    finally:
+        partagee.fermer()
+
+    for res in resultats:
+        print(f" {res['nom']:>13} : {res['statut']} {res.get('erreur', '')}")
+    position, vitesse, inconnu, incomplet, memoire, memoire_echec = resultats
+    assert [res["nom"] for res in resultats] == [job["nom"] for job in jobs]
+
+    # 1. Position : suivi de la consigne
+    print(f"Position : erreur max {position['erreur_max'] * 1000:.3f} mm")
+    assert position["statut"] == "ok"
+    assert position["erreur_max"] < 1e-3
+
+    # 2. Vitesse : départ sur q[0], la vitesse opérationnelle suit |J(q) qp| dès le début
+    print(f"Vitesse : écart max {vitesse['ecart_vitesse_max'] * 1000:.3f} mm/s")
+    assert vitesse["statut"] == "ok"
+    assert vitesse["ecart_vitesse_max"] < 0.02 * V
+
+    # 3. Jobs invalides : rapportés sans interrompre la ferme
+    assert inconnu["statut"] == "échec" and "Mode de job inconnu" in inconnu["erreur"]
+    assert incomplet["statut"] == "échec" and incomplet["erreur"].startswith("KeyError")
+
+    # 4. Trajectoire en mémoire partagée : mêmes métriques que la trajectoire fournie
+    assert memoire["statut"] == "ok"
+    assert memoire["erreur_max"] == pytest.approx(position["erreur_max"])
+    assert memoire_echec["statut"] == "échec"
+    print(f"Références au segment après la ferme : {nb_references}")
+    assert nb_references == 1
+
+    print("\n>>> SUCCÈS : Ferme de simulation validée. <<<")
+
+
+if __name__ == "__main__":
+    test_ferme_simulation()
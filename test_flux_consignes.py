@@ -0,0 +1,34 @@
+from src.flux_consignes import banc_flux
+from src.part4_generation_articulaire import traj
+
+
+def test_flux_consignes():
+    print("==================================================")
+    print("       TEST DIFFUSION DES CONSIGNES (CONTRÔLEUR SIMULÉ)")
+    print("==================================================\n")
+
+    frequence = 250
+    # Consignes de traj() rejouées à la cadence du contrôleur (2 s de flux)
+    _, q, qp, _ = traj([0.25, -0.15, 0.5], 0.1, 0.05, dt=0.02)
+    q, qp = q[:500], qp[:500]
+
+    resultats = banc_flux(q, qp, frequence=frequence, anticipation=8)
+    client, serveur = resultats["client"], resultats["serveur"]
+
+    print(f"{client['nb_consignes']} consignes en {client['duree']:.2f} s, {client['nb_etats']} paquets d'état")
+    print(f"Latence aller-retour p50 / max : {client['rtt_p50'] * 1e3:.3f} / {client['rtt_max'] * 1e3:.3f} ms")
+    print(f"Gigue p99 : {client['gigue_p99'] * 1e3:.3f} ms, paquets en retard : {client['nb_etats_en_retard']}")
+    print(f"Contrôleur : {serveur['nb_famines']} famines, {serveur['nb_debordements']} débordements")
+
+    # Toutes les consignes consommées, la file du contrôleur jamais débordée,
+    # et la durée fixée par la cadence du contrôleur (pas par le client)
+    assert serveur["nb_debordements"] == 0
+    assert client["nb_etats"] >= len(q)
+    assert abs(client["duree"] - len(q) / frequence) < 0.5
+    assert client["rtt_p50"] < 1.0 / frequence
+
+    print("\n>>> SUCCÈS : Flux cadencé par le contrôleur, sans débordement. <<<")
+
+
+if __name__ == "__main__":
+    test_flux_consignes()
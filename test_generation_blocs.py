@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import numpy as np
+from src.generation_blocs import traj_par_blocs, generer_par_blocs, consigne_composee, iterer_blocs
+from src.part4_generation_articulaire import traj
+from src.pybullet.telemetrie import charger_telemetrie
+from src.trajectoire_composee import segment_lineaire, segment_arc, traj_composee
+
+
+def test_generation_blocs():
+    print("==================================================")
+    print("      TEST GÉNÉRATION PAR BLOCS (MÉMOIRE BORNÉE)")
+    print("==================================================\n")
+
+    O, R, V, dt = [0.25, -0.15, 0.5], 0.1, 0.05, 0.05
+    temps, q, qp, qpp = traj(O, R, V, dt=dt)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        # 1. Blocs de taille quelconque : résultat identique au calcul d'un seul tenant
+        for taille_bloc in (7, 1, len(temps) - 1):
+            sortie = os.path.join(dossier, f"cercle_{taille_bloc}")
+            index = traj_par_blocs(O, R, V, sortie, dt=dt, taille_bloc=taille_bloc)
+            assert len(index["blocs"]) == -(-len(temps) // taille_bloc)
+            assert max(bloc["n"] for bloc in index["blocs"]) <= taille_bloc
+
+            relu = charger_telemetrie(sortie)
+            for champ, reference in (("temps", temps), ("q", q), ("qp", qp), ("qpp", qpp)):
+                assert np.array_equal(relu[champ], reference), (taille_bloc, champ)
+            print(f" -> Blocs de {taille_bloc} : {len(index['blocs'])} fichiers, identiques à traj()")
+
+        # Lecture bloc par bloc
+        assert sum(len(bloc["temps"]) for bloc in iterer_blocs(sortie)) == len(temps)
+
+        # 2. Programme multi-segments
+        segments = [segment_lineaire([0.3, -0.15, 0.4], [0.3, -0.15, 0.5]),
+                    segment_arc([0.25, -0.15, 0.5], 0.05, -np.pi / 2, np.pi / 2),
+                    segment_lineaire([0.2, -0.15, 0.5], [0.2, -0.15, 0.4])]
+        t_c, q_c, _, qpp_c = traj_composee(segments, V=0.05, dt=dt)
+        sortie = os.path.join(dossier, "programme")
+        generer_par_blocs(consigne_composee(segments, V=0.05), sortie, dt=dt, taille_bloc=25)
+        relu = charger_telemetrie(sortie)
+        assert np.array_equal(relu["q"], q_c) and np.array_equal(relu["qpp"], qpp_c)
+
+        # 3. Stockage float32 : erreur d'arrondi mesurée contre le float64
+        sortie = os.path.join(dossier, "float32")
+        index = traj_par_blocs(O, R, V, sortie, dt=dt, taille_bloc=100, float32=True)
+        relu = charger_telemetrie(sortie)
+        assert relu["q"].dtype == np.float32 and relu["temps"].dtype == np.float64
+        erreur_q = max(bloc["erreur_q_float32"] for bloc in index["blocs"])
+        erreur_X = max(bloc["erreur_X_float32"] for bloc in index["blocs"])
+        assert np.isclose(erreur_q, np.max(np.abs(relu["q"] - q)))
+        assert erreur_X < 1e-6
+        print(f" -> float32 : erreur articulaire {erreur_q:.2e} rad, position outil {erreur_X:.2e} m")
+
+        with open(os.path.join(sortie, "index.json")) as f:
+            assert json.load(f)["type"] == "float32"
+
+        # Tolérance dépassée : arrêt en erreur
+        try:
+            traj_par_blocs(O, R, V, os.path.join(dossier, "refus"), dt=dt, float32=True, tol_float32=1e-12)
+            assert False, "tolérance float32 ignorée"
+        except ValueError as e:
+            print(f" -> Refusé : {e}")
+
+    print("\n>>> SUCCÈS : Génération par blocs validée. <<<")
+
+
+if __name__ == "__main__":
+    test_generation_blocs()
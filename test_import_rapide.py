@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+# Budget de temps d'import de la façade de calcul (numpy seul : ~0.1 s)
+BUDGET_IMPORT_S = 0.5
+
+MESURE = """
+import sys, time
+t0 = time.perf_counter()
+import src.calcul
+duree = time.perf_counter() - t0
+charges = [m for m in src.calcul.MODULES_DIFFERES if m in sys.modules]
+print(duree, ",".join(charges))
+"""
+
+
+def test_import_rapide():
+    print("==================================================")
+    print("       TEST IMPORT DE LA FAÇADE DE CALCUL")
+    print("==================================================\n")
+
+    # Interpréteur neuf (les modules déjà importés par pytest fausseraient la mesure) ;
+    # meilleure de trois mesures pour lisser le bruit du système
+    racine = os.path.dirname(os.path.abspath(__file__))
+    durees = []
+    for _ in range(3):
+        sortie = subprocess.run([sys.executable, "-c", MESURE], cwd=racine, capture_output=True,
+                                text=True, check=True).stdout.split()
+        durees.append(float(sortie[0]))
+        charges = sortie[1] if len(sortie) > 1 else ""
+        assert charges == "", f"Modules lourds chargés à l'import : {charges}"
+
+    print(f"import src.calcul : {min(durees) * 1e3:.0f} ms (budget {BUDGET_IMPORT_S * 1e3:.0f} ms), "
+          f"sans matplotlib / sympy / pybullet")
+    assert min(durees) < BUDGET_IMPORT_S
+
+    print("\n>>> SUCCÈS : Import de calcul dans le budget. <<<")
+
+
+if __name__ == "__main__":
+    test_import_rapide()
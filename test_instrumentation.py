@@ -0,0 +1,46 @@
+import json
+import numpy as np
+from src import instrumentation
+from src.const_v import dh
+from src.modele_differentiel import MGI_numerique
+from src.part4_generation_articulaire import traj
+
+
+def test_instrumentation():
+    print("==================================================")
+    print("       TEST INSTRUMENTATION DU PIPELINE traj()")
+    print("==================================================\n")
+
+    O, R, V = [0.25, -0.15, 0.5], 0.1, 0.05
+
+    # 1. Désactivée : rien n'est enregistré
+    instrumentation.desactiver()
+    instrumentation.reinitialiser()
+    traj(O, R, V, dt=0.05)
+    assert not instrumentation.rapport().etapes and not instrumentation.rapport().compteurs
+
+    # 2. Activée : étapes chronométrées et compteurs cohérents
+    instrumentation.activer()
+    temps, q, qp, qpp = traj(O, R, V, dt=0.05)
+    MGI_numerique([5.0, 0.0, 0.0], q[0], dh, max_iter=10)  # Cible hors d'atteinte : échec compté
+    rapport = instrumentation.rapport()
+    instrumentation.desactiver()
+
+    print(rapport)
+    for etape in ("traj", "loi_mouvement", "trajectoire_operationnelle", "trajectoire_articulaire",
+                  "mgi_mgd", "mgi_jacobienne", "mgi_pinv", "mdi"):
+        assert etape in rapport.etapes, etape
+    assert rapport.compteurs["points"] == len(temps)
+    assert rapport.compteurs["mgi_appels"] == len(temps) + 1
+    assert rapport.compteurs["mgi_echecs"] == 1
+    assert rapport.etapes["mgi_jacobienne"]["nb"] == rapport.compteurs["mgi_iterations"]  # Une J par correction
+    assert np.sum(rapport.etapes["mgi_mgd"]["histogramme"][0]) == rapport.etapes["mgi_mgd"]["nb"]
+
+    # 3. Rapport structuré, sérialisable en JSON
+    json.dumps(rapport.en_dict())
+
+    print("\n>>> SUCCÈS : Instrumentation validée. <<<")
+
+
+if __name__ == "__main__":
+    test_instrumentation()
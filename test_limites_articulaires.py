@@ -0,0 +1,107 @@
+import os
+import tempfile
+import time
+import numpy as np
+from src.const_v import limites_articulaires
+from src.generation_blocs import traj_par_blocs
+from src.limites_articulaires import verifier_limites, ControleLimites, DepassementLimite
+from src.part4_generation_articulaire import traj
+
+
+def _depassement_incremental(q, qp, dt, limites=limites_articulaires):
+    """ Premier dépassement vu par ControleLimites sur une trajectoire déjà calculée. """
+    controle = ControleLimites(dt, limites)
+    try:
+        for q_i, qp_i in zip(q, qp):
+            controle(q_i, qp_i)
+        controle.terminer()
+    except DepassementLimite as e:
+        return e
+    assert False, "dépassement non détecté par ControleLimites"
+
+
+def test_limites_articulaires():
+    print("==================================================")
+    print("  TEST LIMITES ARTICULAIRES (POSITION, VITESSE, ACC.)")
+    print("==================================================\n")
+
+    O, R, V, dt = [0.25, -0.15, 0.5], 0.1, 0.05, 0.02
+    temps, q, qp, qpp = traj(O, R, V, dt=dt)
+
+    # 1. Limites UR3 : trajectoire du cercle faisable, marges positives
+    t0 = time.perf_counter()
+    rapport = verifier_limites(temps, q, qp, qpp)
+    print(f" -> Vérification de {len(temps)} points en {(time.perf_counter() - t0) * 1e3:.2f} ms")
+    assert rapport["faisable"] and rapport["premier_temps"] is None
+    for grandeur, marge in rapport["marge"].items():
+        print(f"    marge {grandeur:12s} : {np.round(marge, 3)}")
+        assert np.all(marge > 0)
+
+    # Contrôle pendant le MGI : même résultat que sans contrôle
+    _, q_c, qp_c, qpp_c = traj(O, R, V, dt=dt, limites=limites_articulaires)
+    assert np.array_equal(q_c, q) and np.array_equal(qpp_c, qpp)
+
+    # 2. Limites réduites : même premier dépassement en vérification globale et pendant le MGI
+    limites_reduites = {
+        "position": dict(limites_articulaires, position_max=0.95 * np.max(q, axis=0) + 1e-9),
+        "vitesse": dict(limites_articulaires, vitesse=0.5 * np.max(np.abs(qp), axis=0) + 1e-9),
+        "acceleration": dict(limites_articulaires, acceleration=0.5 * np.max(np.abs(qpp), axis=0) + 1e-9),
+    }
+    for grandeur, reduites in limites_reduites.items():
+        rapport = verifier_limites(temps, q, qp, qpp, limites=reduites)
+        assert not rapport["faisable"] and rapport["premiere_grandeur"] == grandeur
+
+        try:
+            traj(O, R, V, dt=dt, limites=reduites)
+            assert False, "dépassement non détecté pendant le MGI"
+        except DepassementLimite as e:
+            print(f" -> {e}")
+            assert (e.grandeur, e.axe) == (grandeur, rapport["premier_axe"])
+            assert np.isclose(e.temps, rapport["premier_temps"]) and e.valeur == rapport["premiere_valeur"]
+            assert e.indice < len(temps) - 1 or grandeur == "acceleration"
+
+    # Échelon de vitesse : l'accélération de l'échantillon précédent dépasse en premier
+    temps_e = np.arange(51) * 0.01
+    q_e, qp_e = np.zeros((51, 6)), np.zeros((51, 6))
+    qp_e[21:, 0] = 1.2 * np.pi
+    rapport = verifier_limites(temps_e, q_e, qp_e, np.gradient(qp_e, 0.01, axis=0))
+    e = _depassement_incremental(q_e, qp_e, 0.01)
+    print(f" -> Échelon : {e}")
+    assert (e.grandeur, rapport["premiere_grandeur"]) == ("acceleration", "acceleration")
+    assert np.isclose(e.temps, rapport["premier_temps"]) and np.isclose(e.temps, 0.20)
+
+    # Position sur q déroulé : l'axe 2 dépasse pi alors que le MGI renvoie des angles dans [-pi, pi]
+    assert np.all(np.abs(q) <= np.pi)
+    debattement_pi = dict(limites_articulaires, position_min=[-np.pi] * 6, position_max=[np.pi] * 6)
+    rapport = verifier_limites(temps, q, qp, qpp, limites=debattement_pi)
+    e = _depassement_incremental(q, qp, temps[1] - temps[0], debattement_pi)
+    print(f" -> Déroulé : {e}")
+    assert (rapport["premiere_grandeur"], rapport["premier_axe"]) == ("position", 1)
+    assert (e.grandeur, e.axe, e.indice) == ("position", 1, int(np.argmax(np.abs(np.diff(q[:, 1])) > np.pi)) + 1)
+    assert np.isclose(e.temps, rapport["premier_temps"]) and e.valeur == rapport["premiere_valeur"]
+
+    # Saut de q (changement de branche du MGI) invisible dans qp : borné par qp_max * dt
+    q_saut = q.copy()
+    q_saut[200:, 2] += 0.5
+    rapport = verifier_limites(temps, q_saut, qp, qpp)
+    e = _depassement_incremental(q_saut, qp, temps[1] - temps[0])
+    print(f" -> Saut : {e}")
+    assert (rapport["premiere_grandeur"], rapport["premier_axe"], rapport["premiere_valeur"]) == ("saut", 2, e.valeur)
+    assert (e.grandeur, e.axe, e.indice) == ("saut", 2, 200)
+
+    # 3. Génération par blocs : arrêt au bloc du premier dépassement, blocs suivants non calculés
+    with tempfile.TemporaryDirectory() as dossier:
+        try:
+            traj_par_blocs(O, R, V, dossier, dt=dt, taille_bloc=20, limites=limites_reduites["vitesse"])
+            assert False, "dépassement non détecté par blocs"
+        except ValueError as e:
+            assert isinstance(e, DepassementLimite)
+            nb_fichiers = len([f for f in os.listdir(dossier) if f.endswith(".npz")])
+            assert nb_fichiers == e.indice // 20
+            print(f" -> Par blocs : arrêt à l'échantillon {e.indice}, {nb_fichiers} blocs écrits")
+
+    print("\n>>> SUCCÈS : Limites articulaires validées. <<<")
+
+
+if __name__ == "__main__":
+    test_limites_articulaires()
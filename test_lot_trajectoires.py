@@ -0,0 +1,73 @@
+import csv
+import json
+import os
+import tempfile
+import numpy as np
+from src.lot_trajectoires import lire_jobs, executer_lot, tableau_resume, main
+
+
+def test_lot_trajectoires():
+    print("==================================================")
+    print("     TEST GÉNÉRATION DE TRAJECTOIRES PAR LOTS")
+    print("==================================================\n")
+
+    with tempfile.TemporaryDirectory() as dossier:
+        # 1. Lecture des jobs : JSON et CSV donnent les mêmes jobs normalisés
+        jobs_json = [{"nom": "petit", "O": [0.25, -0.15, 0.5], "R": 0.05, "V": 0.05, "dt": 0.05},
+                     {"O": [0.25, -0.15, 0.5], "R": 0.1, "V": 0.1, "dt": 0.05}]
+        chemin_json = os.path.join(dossier, "jobs.json")
+        with open(chemin_json, "w") as f:
+            json.dump(jobs_json, f)
+
+        chemin_csv = os.path.join(dossier, "jobs.csv")
+        with open(chemin_csv, "w", newline="") as f:
+            ecrivain = csv.writer(f)
+            ecrivain.writerow(["nom", "Ox", "Oy", "Oz", "R", "V", "dt"])
+            ecrivain.writerow(["petit", 0.25, -0.15, 0.5, 0.05, 0.05, 0.05])
+            ecrivain.writerow(["", 0.25, -0.15, 0.5, 0.1, 0.1, 0.05])
+
+        jobs = lire_jobs(chemin_json)
+        assert jobs == lire_jobs(chemin_csv)
+        assert [job["nom"] for job in jobs] == ["petit", "job_0001"]
+
+        # Jobs invalides : refusés avant tout calcul
+        for invalide in ([{"O": [0, 0, 0], "V": 0.1}], [{"O": [0, 0, 0], "R": -0.1, "V": 0.1}],
+                         [{"nom": "a", "O": [0, 0, 0], "R": 0.1, "V": 0.1}] * 2):
+            with open(chemin_json, "w") as f:
+                json.dump(invalide, f)
+            try:
+                lire_jobs(chemin_json)
+                assert False, "job invalide accepté"
+            except ValueError as e:
+                print(f" -> Refusé : {e}")
+
+        # 2. Lot en parallèle : un fichier .npz par job, identique au calcul séquentiel
+        sortie = os.path.join(dossier, "sortie")
+        resultats = executer_lot(jobs, sortie, nb_workers=2)
+        print(tableau_resume(resultats))
+        assert [res["nom"] for res in resultats] == ["petit", "job_0001"]
+        assert all(res["statut"] == "ok" for res in resultats)
+        assert all(res["erreur_position_max"] < 1e-3 for res in resultats)
+
+        sequentiel = executer_lot(jobs[:1], os.path.join(dossier, "sequentiel"), nb_workers=1)
+        with np.load(resultats[0]["fichier"]) as lot, np.load(sequentiel[0]["fichier"]) as seq:
+            assert np.array_equal(lot["q"], seq["q"])
+            assert lot["q"].shape == (resultats[0]["nb_points"], 6)
+            assert float(lot["R"]) == 0.05
+
+        # 3. Un job en échec n'interrompt pas le lot ; code de sortie 1
+        with open(chemin_json, "w") as f:
+            json.dump([jobs_json[0], {"nom": "dt_trop_grand", "O": [0.25, -0.15, 0.5], "R": 0.05, "V": 0.05,
+                                      "dt": 100.0}], f)
+        chemin_resume = os.path.join(dossier, "resume.json")
+        code = main([chemin_json, "--sortie", sortie, "--workers", "2", "--resume", chemin_resume])
+        assert code == 1
+        with open(chemin_resume) as f:
+            resume = json.load(f)
+        assert [res["statut"] for res in resume] == ["ok", "échec"]
+
+    print("\n>>> SUCCÈS : Génération par lots validée. <<<")
+
+
+if __name__ == "__main__":
+    test_lot_trajectoires()
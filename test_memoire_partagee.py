@@ -0,0 +1,80 @@
+import multiprocessing
+import os
+
+import numpy as np
+from src.memoire_partagee import publier_trajectoire, ouvrir_trajectoire
+from src.part4_generation_articulaire import traj
+
+
+def _lecteur(descripteur, file_resultats):
+    """ Processus consommateur : lit la trajectoire sans copie et renvoie une empreinte. """
+    with ouvrir_trajectoire(descripteur) as trajectoire:
+        with trajectoire.vues() as tableaux:
+            file_resultats.put((float(tableaux["q"].sum()), tableaux["q"].flags.writeable,
+                                trajectoire.nb_references))
+
+
+def test_memoire_partagee():
+    print("==================================================")
+    print("       TEST TRAJECTOIRE EN MÉMOIRE PARTAGÉE")
+    print("==================================================\n")
+
+    temps, q, qp, qpp = traj([0.25, -0.15, 0.5], 0.1, 0.05, dt=0.02)
+    producteur = publier_trajectoire(temps=temps, q=q, qp=qp, qpp=qpp)
+    descripteur = producteur.descripteur
+    print(f"Segment {descripteur['nom']} : {descripteur['taille'] / 1e3:.1f} ko, tableaux {list(descripteur['tableaux'])}")
+
+    # 1. Lecture dans un autre processus (spawn : seul le descripteur est transmis)
+    contexte = multiprocessing.get_context("spawn")
+    file_resultats = contexte.Queue()
+    processus = contexte.Process(target=_lecteur, args=(descripteur, file_resultats))
+    processus.start()
+    somme, modifiable, nb_references = file_resultats.get(timeout=60)
+    processus.join()
+    print(f"Lecteur : somme(q) = {somme:.6f} (attendu {q.sum():.6f}), références pendant la lecture : {nb_references}")
+    assert np.isclose(somme, q.sum())
+    assert not modifiable
+    assert nb_references == 2
+    assert producteur.nb_references == 1
+
+    # 2. Le producteur se détache en premier : le segment survit tant qu'un lecteur reste attaché
+    lecteur = ouvrir_trajectoire(descripteur)
+    producteur.fermer()
+    with lecteur.vues() as tableaux:
+        assert np.array_equal(tableaux["qp"], qp)
+        # 3. Fermer dans un bloc vues() est refusé
+        try:
+            lecteur.fermer()
+            assert False, "fermer() aurait dû échouer"
+        except ValueError as erreur:
+            print(f"Dans le bloc : {erreur}")
+        tranche = tableaux["temps"][10:20]
+    assert tableaux == {}
+
+    # Une tranche sortie du bloc retient le segment : refusé, sans perdre la référence
+    try:
+        lecteur.fermer()
+        assert False, "fermer() aurait dû échouer"
+    except ValueError as erreur:
+        print(f"Vue encore référencée : {erreur}")
+    assert lecteur.nb_references == 1
+    del tranche
+
+    # Une copie est indépendante du segment
+    copie_q = lecteur.copie("q")
+
+    # 4. Dernier détachement : segment libéré
+    lecteur.fermer()
+    assert np.array_equal(copie_q, q)
+    assert not os.path.exists("/dev/shm/" + descripteur["nom"].lstrip("/"))
+    try:
+        ouvrir_trajectoire(descripteur)
+        assert False, "le segment aurait dû être libéré"
+    except ValueError as erreur:
+        print(f"Après le dernier détachement : {erreur}")
+
+    print("\n>>> SUCCÈS : Trajectoire partagée sans copie, libérée au dernier détachement. <<<")
+
+
+if __name__ == "__main__":
+    test_memoire_partagee()
@@ -0,0 +1,53 @@
+import numpy as np
+from src.const_v import dh
+from src.matrice_tn import generate_transformation_matrices, calcul_T06_global
+from src.mgi_parallele import traj_parallele, mgi_multi_departs, ecart_angulaire
+from src.part1_loi_mouvement import calcul_loi_mouvement
+from src.part2_trajectoire_operationnelle import calcul_trajectoire_operationnelle
+from src.part3_analyse_tache import calcul_X_robot_et_erreurs
+from src.part4_generation_articulaire import traj, Q_INIT_DEFAUT
+
+
+def test_mgi_parallele():
+    print("==================================================")
+    print("        TEST MGI PARALLÈLE PAR SEGMENTS")
+    print("==================================================\n")
+
+    O, R, V, dt = [0.25, -0.15, 0.5], 0.1, 0.05, 0.02
+    temps, q_seq, qp_seq, _ = traj(O, R, V, dt=dt)
+    _, s, s_dot, s_ddot, _ = calcul_loi_mouvement(R, V, dt)
+    X, dX, _ = calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot)
+    d2_seq = np.max(np.abs(np.diff(np.unwrap(q_seq, axis=0), 2, axis=0)))
+
+    # 1. MGI multi-départs : solution convergée, proche de la configuration de référence
+    q_sol = mgi_multi_departs(X[100], Q_INIT_DEFAUT)
+    assert np.linalg.norm(calcul_T06_global(generate_transformation_matrices(q_sol, dh))[:3, 3] - X[100]) < 1e-5
+
+    # 2. Segments en parallèle : consigne suivie, raccords réparés, aucune discontinuité
+    temps_p, q, qp, qpp, raccords = traj_parallele(O, R, V, dt=dt, nb_workers=2, nb_segments=4)
+    assert np.array_equal(temps_p, temps) and q.shape == q_seq.shape
+    _, _, erreur_X, erreur_dX = calcul_X_robot_et_erreurs(temps, X, dX, q, qp)
+    print(f" -> Erreur position max : {np.max(np.linalg.norm(erreur_X, axis=1)):.2e} m")
+    assert np.max(np.linalg.norm(erreur_X, axis=1)) < 1e-4
+    assert np.max(np.linalg.norm(erreur_dX, axis=1)) < 1e-9  # qp = MDI (+ vitesse dans le noyau de J_v)
+
+    assert len(raccords) == 3
+    for raccord in raccords:
+        print(f" -> Raccord {raccord['indice']} : {raccord['saut_initial']:.2e} -> {raccord['saut_final']:.2e} rad "
+              f"({raccord['reparation']})")
+        assert raccord["saut_final"] < 1e-4
+    d2 = np.max(np.abs(np.diff(np.unwrap(q, axis=0), 2, axis=0)))
+    assert d2 < 2 * d2_seq, (d2, d2_seq)
+    assert np.max(np.abs(ecart_angulaire(q, q_seq))) < 0.05  # Même branche, dérive limitée à l'espace nul
+    assert np.all(np.isfinite(qpp))
+
+    # 3. Tout saut traité comme un changement de branche : résolution séquentielle, identique à traj()
+    _, q_b, qp_b, _, raccords = traj_parallele(O, R, V, dt=dt, nb_workers=2, nb_segments=4, seuil_branche=0.0)
+    assert all(raccord["reparation"] == "segment_resolu" for raccord in raccords)
+    assert np.array_equal(q_b, q_seq) and np.array_equal(qp_b, qp_seq)
+
+    print("\n>>> SUCCÈS : MGI parallèle par segments validé. <<<")
+
+
+if __name__ == "__main__":
+    test_mgi_parallele()
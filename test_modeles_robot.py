@@ -0,0 +1,108 @@
+import os
+import tempfile
+import time
+import numpy as np
+from src.const_v import dh, modeles_robot
+from src.generation_blocs import traj_par_blocs
+from src.limites_articulaires import DepassementLimite
+from src.mgi_parallele import traj_parallele
+from src.modeles_robot import ModeleRobot, modele_robot, noms_modeles
+from src.part1_loi_mouvement import calcul_loi_mouvement
+from src.part2_trajectoire_operationnelle import calcul_trajectoire_operationnelle
+from src.part4_generation_articulaire import traj
+from src.pybullet.telemetrie import charger_telemetrie
+from src.trajectoire_composee import segment_lineaire, segment_arc, calcul_trajectoire_composee, traj_composee
+
+
+def test_modeles_robot():
+    print("==================================================")
+    print("        TEST REGISTRE DES MODÈLES (UR3/5/10)")
+    print("==================================================\n")
+
+    # 1. Registre : une instance par modèle, nom insensible à la casse
+    assert noms_modeles() == ["UR3", "UR5", "UR10"]
+    assert modele_robot("ur5") is modele_robot("UR5")
+    assert modele_robot("UR3").dh is dh
+    try:
+        modele_robot("UR20")
+        assert False, "modèle inconnu accepté"
+    except ValueError as e:
+        print(f" -> Refusé : {e}")
+
+    # UR3 via le registre : identique au calcul historique
+    O, R, V, dt = [0.25, -0.15, 0.5], 0.1, 0.05, 0.02
+    _, q, qp, _ = traj(O, R, V, dt=dt)
+    _, q_r, qp_r, _ = traj(O, R, V, dt=dt, robot="UR3")
+    assert np.array_equal(q_r, q) and np.array_equal(qp_r, qp)
+
+    rng = np.random.default_rng(0)
+    q_test = rng.uniform(-np.pi, np.pi, (20, 6))
+    portees = {}
+    for nom, O in (("UR3", [0.25, -0.15, 0.5]), ("UR5", [0.4, -0.2, 0.5]), ("UR10", [0.6, -0.3, 0.6])):
+        modele = modele_robot(nom)
+
+        # 2. Jacobienne analytique (compilée au premier appel) = Jacobienne géométrique
+        t0 = time.perf_counter()
+        J_ana = modele.jacobienne_analytique(q_test[0])
+        construction = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        J_ana = np.array([modele.jacobienne_analytique(qi) for qi in q_test])
+        evaluation = (time.perf_counter() - t0) / len(q_test)
+        assert np.max(np.abs(J_ana - modele.jacobienne_batch(q_test))) < 1e-12
+        assert evaluation < 5e-3
+        assert np.allclose(modele.position_outil(q_test)[3], modele.mgd(q_test[3])[:3, 3])
+
+        # 3. Trajectoire : consigne suivie, limites du modèle respectées
+        temps, q, qp, qpp = traj(O, R, V, dt=dt, robot=nom)
+        _, s, s_dot, s_ddot, _ = calcul_loi_mouvement(R, V, dt)
+        X, dX, _ = calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot)
+        assert np.max(np.linalg.norm(modele.position_outil(q) - X, axis=1)) < 1e-4
+        assert np.allclose(np.einsum('nij,nj->ni', modele.jacobienne_batch(q)[:, :3], qp), dX)
+        assert modele.verifier_limites(temps, q, qp, qpp)["faisable"]
+        assert np.allclose(modele.depuis_simulation(modele.vers_simulation(q)), q)
+
+        portees[nom] = modele.dh["a_i_m1"][2] + modele.dh["a_i_m1"][3]
+        print(f" -> {nom} : Jacobienne compilée en {construction * 1e3:.0f} ms, "
+              f"évaluée en {evaluation * 1e6:.0f} µs ; cercle suivi ({len(temps)} points)")
+
+    assert portees["UR3"] < portees["UR5"] < portees["UR10"]
+
+    # 4. Autres générateurs : mêmes paramètres DH que traj(robot=...)
+    ur5, O = modele_robot("UR5"), [0.4, -0.2, 0.5]
+    temps, q, qp, qpp = traj(O, R, V, dt=dt, robot="UR5")
+    with tempfile.TemporaryDirectory() as dossier:
+        traj_par_blocs(O, R, V, os.path.join(dossier, "ur5"), dt=dt, taille_bloc=13, robot="UR5")
+        relu = charger_telemetrie(os.path.join(dossier, "ur5"))
+    assert np.array_equal(relu["q"], q) and np.array_equal(relu["qpp"], qpp)
+
+    _, q_par, _, _, _ = traj_parallele(O, R, V, dt=dt, nb_workers=1, nb_segments=2, decimation_guide=5,
+                                       robot="UR5")
+    assert np.max(np.linalg.norm(ur5.position_outil(q_par) - ur5.position_outil(q), axis=1)) < 1e-4
+
+    segments = [segment_lineaire([0.45, -0.2, 0.4], [0.45, -0.2, 0.5]),
+                segment_arc(O, 0.05, -np.pi / 2, np.pi / 2)]
+    _, X_c, _, _, _ = calcul_trajectoire_composee(segments, V, dt=dt)
+    _, q_c, _, _ = traj_composee(segments, V, dt=dt, robot="UR5")
+    assert np.max(np.linalg.norm(ur5.position_outil(q_c) - X_c, axis=1)) < 1e-4
+    print(" -> UR5 : blocs identiques à traj(), parallèle et multi-segments suivis")
+
+    # 5. Limites du modèle contrôlées par défaut (ici un UR5 bridé à 0.1 rad/s)
+    parametres = dict(modeles_robot["UR5"], limites=dict(modeles_robot["UR5"]["limites"], vitesse=[0.1] * 6))
+    bride = ModeleRobot("UR5 bridé", parametres)
+    for generation in (lambda: traj(O, R, V, dt=dt, robot=bride),
+                       lambda: traj_composee(segments, V, dt=dt, robot=bride)):
+        try:
+            generation()
+            assert False, "limites du modèle non contrôlées"
+        except DepassementLimite as e:
+            assert e.grandeur == "vitesse"
+    # Limites données explicitement : elles remplacent celles du modèle
+    _, q_b, _, _ = traj(O, R, V, dt=dt, robot=bride, limites=modeles_robot["UR5"]["limites"])
+    assert np.array_equal(q_b, q)
+    print(" -> Limites du modèle contrôlées pendant le MGI (UR5 bridé refusé)")
+
+    print("\n>>> SUCCÈS : Registre des modèles validé. <<<")
+
+
+if __name__ == "__main__":
+    test_modeles_robot()
@@ -0,0 +1,53 @@
+import time
+import numpy as np
+from src.ordonnanceur import OrdonnanceurPeriodique
+
+
+def test_ordonnanceur():
+    print("==================================================")
+    print("       TEST ORDONNANCEUR À ÉCHÉANCES FIXES")
+    print("==================================================\n")
+
+    # 1. Corps de boucle court (~30% de la période) : pas de dérive
+    periode = 2e-3
+    ordo = OrdonnanceurPeriodique(periode)
+
+    def corps(k):
+        fin = time.perf_counter() + 0.3 * periode
+        while time.perf_counter() < fin:
+            pass
+
+    t0 = time.perf_counter()
+    ordo.executer(corps, 200)
+    duree = time.perf_counter() - t0
+    stats = ordo.statistiques()
+
+    print(f"Fréquence visée : {stats['frequence_visee']:.0f} Hz, réelle : {stats['frequence_reelle']:.1f} Hz")
+    print(f"Durée de 200 ticks : {duree * 1e3:.1f} ms (attendu ~{199 * periode * 1e3:.0f} ms)")
+    print(f"Gigue p50 / p99 : {stats['gigue_p50'] * 1e6:.0f} / {stats['gigue_p99'] * 1e6:.0f} µs")
+    # Avec un sleep(periode) après le travail on obtiendrait ~130% de la durée
+    assert abs(stats["periode_moyenne"] - periode) < 0.1 * periode
+
+    # 2. Dépassements : corps deux fois plus long que la période, politique "sauter"
+    ordo = OrdonnanceurPeriodique(periode, politique="sauter")
+    ordo.executer(lambda k: time.sleep(2.2 * periode), 20)
+    stats = ordo.statistiques()
+    print(f"\nPolitique 'sauter' : {stats['nb_depassements']} dépassements, {stats['nb_sautes']} ticks sautés")
+    assert stats["nb_depassements"] >= 15 and stats["nb_sautes"] >= stats["nb_depassements"]
+    # Les ticks restent alignés sur la grille d'échéances : chaque tick démarre sur une échéance
+    # t0 + k * periode (k entier), jamais en avance, après une échéance au moins sautée
+    echeances = ordo.instants[:ordo.nb_ticks] - ordo.retards[:ordo.nb_ticks]
+    phases = (echeances - echeances[0]) / periode
+    print(f"Écart max des échéances à la grille t0 + k * periode : "
+          f"{np.abs(phases - np.round(phases)).max() * periode * 1e9:.3f} ns, "
+          f"retard médian {np.median(ordo.retards[1:ordo.nb_ticks]) * 1e6:.0f} µs")
+    assert np.allclose(phases, np.round(phases), atol=1e-6)
+    assert np.all(np.diff(np.round(phases)) >= 2)  # Corps de 2.2 périodes
+    assert np.all(ordo.retards[:ordo.nb_ticks] >= 0)
+    assert np.median(ordo.retards[1:ordo.nb_ticks]) < 0.2 * periode
+
+    print("\n>>> SUCCÈS : Cadence tenue sur échéances absolues. <<<")
+
+
+if __name__ == "__main__":
+    test_ordonnanceur()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import matplotlib
+import numpy as np
+from src.rendu_figures import configurer_rendu, lttb_indices, reduire_series, attendre_rendus
+from src.part3_analyse_tache import afficher_erreurs_X
+
+
+def test_rendu_figures():
+    print("==================================================")
+    print("       TEST RENDU DES FIGURES SANS FENÊTRE")
+    print("==================================================\n")
+
+    # 1. LTTB : la réduction conserve les extrêmes d'un signal bruité avec un pic
+    t = np.linspace(0, 10, 100_000)
+    y = np.sin(t) + 0.01 * np.random.default_rng(0).standard_normal(len(t))
+    y[54321] = 5.0
+    idx = lttb_indices(t, y, 1000)
+    print(f"LTTB : {len(t)} -> {len(idx)} points, pic conservé : {54321 in idx}")
+    assert len(idx) == 1000 and 54321 in idx
+    assert idx[0] == 0 and idx[-1] == len(t) - 1
+
+    # 2. Réduction de plusieurs séries sur le même axe temps
+    erreur = np.column_stack((y, -y, 0 * y))
+    t_r, e_r, v_r = reduire_series(t, erreur, erreur)
+    print(f"Séries réduites : {erreur.shape} -> {e_r.shape}")
+    assert len(t_r) == len(e_r) == len(v_r) < len(t)
+
+    # 3. Mode fichier synchrone : une image est produite, le backend de l'appelant est conservé
+    backend_initial = matplotlib.get_backend()
+    matplotlib.use("pdf")  # Backend non Agg, disponible sans affichage
+    with tempfile.TemporaryDirectory() as dossier:
+        configurer_rendu(mode="fichier", dossier=dossier, format="png", nb_workers=0)
+        try:
+            chemin = afficher_erreurs_X(t, erreur, erreur)
+            attendre_rendus()
+            backend = matplotlib.get_backend()
+        finally:
+            configurer_rendu(mode="ecran")
+            matplotlib.use(backend_initial)
+        print(f"Figure écrite : {os.path.basename(chemin)} ({os.path.getsize(chemin)} octets)")
+        assert os.path.getsize(chemin) > 0
+        assert backend == "pdf", backend
+
+    print("\n>>> SUCCÈS : Rendu sans fenêtre opérationnel. <<<")
+
+
+if __name__ == "__main__":
+    test_rendu_figures()
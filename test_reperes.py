@@ -0,0 +1,58 @@
+import tempfile
+import numpy as np
+import pytest
+
+p = pytest.importorskip("pybullet")
+
+from src.const_v import dh
+from src.matrice_tn import generate_transformation_matrices, calcul_T06_global
+from src.pybullet.affiche import ReperesLiens, quaternions_vers_matrices
+from src.pybullet.validation_dynamique import ecrire_urdf_modele
+
+
+def test_reperes():
+    print("==================================================")
+    print("       TEST REPÈRES DE DÉBOGAGE (MISE À JOUR EN PLACE)")
+    print("==================================================\n")
+
+    # 1. Conversion quaternions -> matrices, comparée à PyBullet
+    rng = np.random.default_rng(0)
+    quaternions = rng.normal(size=(20, 4))
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    R = quaternions_vers_matrices(quaternions)
+    R_pb = np.array([np.reshape(p.getMatrixFromQuaternion(list(qu)), (3, 3)) for qu in quaternions])
+    print(f"Écart max avec getMatrixFromQuaternion : {np.max(np.abs(R - R_pb)):.2e}")
+    assert np.allclose(R, R_pb)
+
+    # 2. Décimation et poses lues en un appel (client DIRECT, UR3 du modèle DH)
+    client = p.connect(p.DIRECT)
+    with tempfile.TemporaryDirectory() as dossier:
+        robot = p.loadURDF(ecrire_urdf_modele(dossier), useFixedBase=True, physicsClientId=client)
+    q = [0.3, -0.5, 0.7, 0.2, -0.4, 0.1]
+    for axe, angle in enumerate(q):
+        p.resetJointState(robot, axe, angle, physicsClientId=client)
+
+    reperes = ReperesLiens(robot, [1, 3, 5], decimation=10, physicsClientId=client)
+    for _ in range(100):
+        p.stepSimulation(physicsClientId=client)
+        reperes.mettre_a_jour()
+    print(f"{reperes.nb_appels} appels -> {reperes.nb_rafraichissements} rafraîchissements (décimation 10)")
+    assert reperes.nb_rafraichissements == 10
+
+    positions, rotations = reperes.poses()
+    etat = p.getLinkState(robot, 5, computeForwardKinematics=1, physicsClientId=client)
+    assert np.allclose(positions[2], etat[4])
+    assert np.allclose(rotations[2], np.reshape(p.getMatrixFromQuaternion(etat[5]), (3, 3)))
+    p.disconnect(client)
+
+    # 3. Repère outil = MGD du projet (l'URDF généré suit la convention DH)
+    T06 = calcul_T06_global(generate_transformation_matrices(q, dh))
+    print(f"Écart repère outil / MGD : {np.max(np.abs(positions[2] - T06[:3, 3])):.2e} m")
+    assert np.allclose(positions[2], T06[:3, 3])
+    assert np.allclose(rotations[2], T06[:3, :3])
+
+    print("\n>>> SUCCÈS : Repères validés. <<<")
+
+
+if __name__ == "__main__":
+    test_reperes()
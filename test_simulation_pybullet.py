@@ -0,0 +1,88 @@
+import tempfile
+import time
+import numpy as np
+import pytest
+
+p = pytest.importorskip("pybullet")
+
+from src.const_v import dh
+from src.dynamique import matrice_inertie_batch
+from src.matrice_tn import generate_transformation_matrices, calcul_T06_global
+from src.part4_generation_articulaire import traj
+from src.pybullet.simulation_pybullet import charger_robot, simulation_position, simulation_couple
+from src.pybullet.validation_dynamique import ecrire_urdf_modele
+from src.utils import derouler_angles
+
+
+def test_simulation_pybullet():
+    print("==================================================")
+    print("       TEST SIMULATION PYBULLET (DIRECT, SANS TEMPS RÉEL)")
+    print("==================================================\n")
+
+    # Cercle complet : l'axe 2 passe par +/- pi (sauts de 2 pi dans la sortie du MGI)
+    O, R = [0.25, -0.15, 0.5], 0.1
+    temps, q, _, _ = traj(O, R, 0.05, dt=0.02)
+    assert np.abs(np.diff(q, axis=0)).max() > np.pi
+
+    client = p.connect(p.DIRECT)
+    try:
+        # 1. URDF absent : erreur explicite
+        with pytest.raises(FileNotFoundError):
+            charger_robot(0.02, urdf_path="introuvable/ur3_robot.urdf", physicsClientId=client)
+
+        # 2. URDF du modèle (convention MGD) : six articulations mobiles détectées
+        with tempfile.TemporaryDirectory() as dossier:
+            robot, articulations = charger_robot(0.02, sous_pas=4, urdf_path=ecrire_urdf_modele(dossier),
+                                                 physicsClientId=client)
+        print(f"Articulations commandées : {articulations}")
+        assert articulations == [0, 1, 2, 3, 4, 5]
+
+        # 3. Suivi en position au plus vite (pas_simulation sans ordonnanceur)
+        debut = time.perf_counter()
+        resultat = simulation_position(robot, articulations, temps, q, O, R, temps_reel=False, interactif=False,
+                                       sous_pas=4, afficher=False, conversion=False, physicsClientId=client)
+        duree = time.perf_counter() - debut
+
+        # 5. Matrice d'inertie vectorisée = celle de PyBullet (inerties de l'URDF)
+        q_test = np.random.default_rng(0).uniform(-np.pi, np.pi, (20, 6))
+        M_pb = np.array([p.calculateMassMatrix(robot, list(qi), physicsClientId=client) for qi in q_test])
+        ecart_M = np.abs(matrice_inertie_batch(q_test) - M_pb).max()
+
+        # 6. Suivi en couple (RNEA + PD), couples maintenus sur les sous-pas physiques
+        temps_c, q_c, qp_c, qpp_c = traj(O, R, 0.05, dt=0.005)
+        p.setTimeStep(0.005 / 2, physicsClientId=client)
+        couple = simulation_couple(robot, articulations, temps_c, q_c, qp_c, qpp_c, temps_reel=False,
+                                   interactif=False, sous_pas=2, afficher=False, conversion=False,
+                                   physicsClientId=client)
+    finally:
+        p.disconnect(client)
+
+    print(f"{len(temps)} pas ({temps[-1]:.1f} s simulées) en {duree:.2f} s, "
+          f"erreur max {resultat['erreur'].max() * 1000:.3f} mm")
+    assert resultat["cadence"] is None
+    assert duree < temps[-1]
+    assert resultat["q_mesure"].shape == q.shape
+    assert resultat["erreur"].max() < 1e-3
+
+    # 4. MGD vectorisé pré-calculé (consigne et mesures) = MGD échantillon par échantillon
+    X_theorique = np.array([calcul_T06_global(generate_transformation_matrices(qi, dh))[:3, 3] for qi in q])
+    X_mesure = np.array([calcul_T06_global(generate_transformation_matrices(qi, dh))[:3, 3]
+                         for qi in resultat["q_mesure"]])
+    print(f"Écart MGD vectorisé / point à point : {np.abs(resultat['X_theorique'] - X_theorique).max():.2e} m")
+    assert np.allclose(resultat["X_theorique"], X_theorique, atol=1e-12)
+    assert np.allclose(resultat["X_mesure"], X_mesure, atol=1e-12)
+    assert np.allclose(resultat["erreur"], np.linalg.norm(X_mesure - X_theorique, axis=1))
+    assert np.abs(resultat["q_mesure"] - derouler_angles(q)).max() < 1e-2
+
+    print(f"Écart matrice d'inertie / calculateMassMatrix : {ecart_M:.2e}")
+    assert ecart_M < 1e-8
+
+    print(f"Couple : erreur max {couple['erreur'].max() * 1000:.3f} mm sur {temps_c[-1]:.1f} s")
+    assert couple["erreur"].max() < 1e-3
+    assert np.abs(couple["q_mesure"] - derouler_angles(q_c)).max() < 1e-2
+
+    print("\n>>> SUCCÈS : Simulation PyBullet validée. <<<")
+
+
+if __name__ == "__main__":
+    test_simulation_pybullet()
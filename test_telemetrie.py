@@ -0,0 +1,86 @@
+import math
+import tempfile
+import numpy as np
+import pybullet as p
+from src.pybullet.validation_dynamique import ecrire_urdf_modele
+from src.pybullet.telemetrie import EnregistreurTelemetrie, charger_telemetrie
+from src.pybullet.rejeu import LecteurTelemetrie
+
+
+def test_telemetrie():
+    print("==================================================")
+    print("       TEST ENREGISTREUR DE TÉLÉMÉTRIE")
+    print("==================================================\n")
+
+    N = 2500
+    temps = np.arange(N) * 1e-3
+    q = np.sin(temps[:, None] + np.arange(6))
+
+    with tempfile.TemporaryDirectory() as dossier:
+        # Capacité volontairement faible : le tampon circulaire fait plusieurs tours
+        tele = EnregistreurTelemetrie(nb_axes=6, capacite=400, dossier=dossier, taille_bloc=256)
+        for i in range(N):
+            tele.ajouter(temps[i], q[i], 2 * q[i], 3 * q[i], -q[i])
+        tele.fermer()
+
+        # 1. Mémoire : seuls les 400 derniers échantillons, dans l'ordre
+        memoire = tele.donnees()
+        print(f"En mémoire : {len(memoire['temps'])} échantillons (t = {memoire['temps'][0]:.3f} .. {memoire['temps'][-1]:.3f} s)")
+        assert np.array_equal(memoire["temps"], temps[-400:])
+        assert np.array_equal(memoire["q"], q[-400:])
+
+        # 2. Disque : tous les échantillons, répartis en blocs
+        disque = charger_telemetrie(dossier)
+        print(f"Sur disque : {len(disque['temps'])} échantillons en {len(tele.blocs)} blocs")
+        assert np.array_equal(disque["temps"], temps)
+        assert np.array_equal(disque["couple"], 3 * q)
+        assert np.array_equal(disque["commande"], -q)
+
+        # 3. Rejeu : accès aléatoire, seuls les blocs utiles sont lus
+        lecteur = LecteurTelemetrie(dossier, taille_cache=2)
+        etat = lecteur.echantillon(1.2345)
+        assert np.array_equal(etat["q"], q[1234])
+        fenetre = lecteur.extraire(0.3, 0.5)
+        assert np.array_equal(fenetre["temps"], temps[(temps >= 0.3) & (temps <= 0.5)])
+        print(f"Rejeu : échantillon à t = 1.2345 s et fenêtre [0.3, 0.5] s -> {lecteur.nb_lectures} blocs lus")
+        assert lecteur.nb_lectures <= 3
+
+        # 4. Enregistrement de l'état d'un robot : client PyBullet explicite (ferme multi-clients)
+        clients = [p.connect(p.DIRECT), p.connect(p.DIRECT)]
+        robots = [p.loadURDF(ecrire_urdf_modele(dossier), useFixedBase=True, physicsClientId=c) for c in clients]
+        for axe in range(6):
+            p.resetJointState(robots[1], axe, q[0, axe], physicsClientId=clients[1])
+        etat = EnregistreurTelemetrie(nb_axes=6, capacite=4)
+        etat.enregistrer_etat(robots[1], list(range(6)), 0.0, np.zeros(6), physicsClientId=clients[1])
+        for c in clients:
+            p.disconnect(c)
+        assert np.allclose(etat.donnees()["q"][0], q[0])
+        print(f"État lu sur le client {clients[1]} (et non le client {clients[0]}) : q = {np.round(q[0], 3)}")
+
+        # 5. Rejeu dans PyBullet (DIRECT, sans attente) : nombre d'images et état final
+        client = p.connect(p.DIRECT)
+        robot = p.loadURDF(ecrire_urdf_modele(dossier), useFixedBase=True, physicsClientId=client)
+        t_debut, t_fin, vitesse, frequence = 0.1, 2.0, 2.0, 60.0
+        nb_images = lecteur.rejouer(robot, list(range(6)), vitesse=vitesse, t_debut=t_debut, t_fin=t_fin,
+                                    frequence_affichage=frequence, temps_reel=False, physicsClientId=client)
+        etats = p.getJointStates(robot, list(range(6)), physicsClientId=client)
+        p.disconnect(client)
+        dernier = int(np.searchsorted(temps, t_fin, side='right')) - 1
+        print(f"Rejeu [{t_debut}, {t_fin}] s à x{vitesse} : {nb_images} images")
+        assert nb_images == math.ceil((t_fin - t_debut) * frequence / vitesse) + 1
+        assert np.allclose([e[0] for e in etats], q[dernier])
+        assert np.allclose([e[1] for e in etats], 2 * q[dernier])
+
+        # Rejeu complet : l'état final est le dernier échantillon enregistré
+        client = p.connect(p.DIRECT)
+        robot = p.loadURDF(ecrire_urdf_modele(dossier), useFixedBase=True, physicsClientId=client)
+        lecteur.rejouer(robot, list(range(6)), vitesse=10.0, temps_reel=False, physicsClientId=client)
+        etats = p.getJointStates(robot, list(range(6)), physicsClientId=client)
+        p.disconnect(client)
+        assert np.allclose([e[0] for e in etats], q[-1])
+
+    print("\n>>> SUCCÈS : Aucun échantillon perdu ni dupliqué. <<<")
+
+
+if __name__ == "__main__":
+    test_telemetrie()
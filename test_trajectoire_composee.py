@@ -0,0 +1,54 @@
+import numpy as np
+from src.const_v import dh
+from src.matrice_tn import generate_transformation_matrices, calcul_T06_global
+from src.trajectoire_composee import segment_lineaire, segment_arc, calcul_trajectoire_composee, traj_composee
+
+
+def test_trajectoire_composee():
+    print("==================================================")
+    print("       TEST TRAJECTOIRE MULTI-SEGMENTS")
+    print("==================================================\n")
+
+    # Programme : montée en ligne droite, quart de cercle, descente verticale
+    O = [0.25, -0.15, 0.5]
+    R = 0.1
+    segments = [
+        segment_lineaire([0.15, -0.15, 0.5], [0.25, -0.15, 0.6]),
+        segment_arc(O, R, 0.0, np.pi / 2),
+        segment_lineaire([0.15, -0.15, 0.5], [0.15, -0.15, 0.4]),
+    ]
+    V = 0.05
+
+    # 1. Durée avec et sans zones de raccordement
+    t_arret, _, _, _, _ = calcul_trajectoire_composee(segments, V, fusion=0.0)
+    t_fusion, X, dX, _, debuts = calcul_trajectoire_composee(segments, V, fusion=1.0)
+    dt = t_fusion[1] - t_fusion[0]
+
+    print(f"Durée sans raccordement : {t_arret[-1]:.3f} s")
+    print(f"Durée avec raccordement : {t_fusion[-1]:.3f} s")
+    print(f"Départs des segments    : {np.round(debuts, 3)}")
+    assert t_fusion[-1] < t_arret[-1]
+
+    # 2. Continuité en vitesse : aucun saut entre deux échantillons
+    saut_max = np.max(np.linalg.norm(np.diff(dX, axis=0), axis=1))
+    print(f"Saut de vitesse max entre échantillons : {saut_max:.2e} m/s")
+    assert saut_max < 0.01
+
+    # 3. Cohérence X / dX (intégration numérique)
+    X_integre = X[0] + np.cumsum(dX[:-1], axis=0) * dt
+    err_int = np.max(np.abs(X_integre - X[1:]))
+    print(f"Écart intégration dX -> X : {err_int:.2e} m")
+    assert err_int < 1e-3
+
+    # 4. Génération articulaire (pas grossier pour rester rapide)
+    time, q, qp, qpp = traj_composee(segments, V, dt=0.05)
+    T06 = calcul_T06_global(generate_transformation_matrices(q[-1], dh))
+    err_fin = np.linalg.norm(T06[:3, 3] - np.array([0.15, -0.15, 0.4]))
+    print(f"\nTrajectoire articulaire : {q.shape}, erreur point final : {err_fin:.2e} m")
+    assert err_fin < 1e-4
+
+    print("\n>>> SUCCÈS : Trajectoire composée continue et atteignable. <<<")
+
+
+if __name__ == "__main__":
+    test_trajectoire_composee()
@@ -0,0 +1,63 @@
+import numpy as np
+from src.orientation import (quaternion_depuis_matrice, matrice_depuis_quaternion, slerp,
+                             vecteur_rotation, erreur_orientation)
+from src.part1_loi_mouvement import calcul_loi_mouvement
+from src.part2_trajectoire_operationnelle import calcul_trajectoire_operationnelle
+from src.part3_analyse_tache import calcul_X_robot_et_erreurs, calcul_orientation_et_erreurs, rapport_erreurs
+from src.part4_generation_articulaire import traj
+from src.trajectoire_pose import traj_pose
+
+
+def test_trajectoire_pose():
+    print("==================================================")
+    print("     TEST TRAJECTOIRE EN POSE COMPLÈTE (6 DDL)")
+    print("==================================================\n")
+
+    # 1. Quaternions : aller-retour matrice, SLERP à vitesse angulaire constante
+    rng = np.random.default_rng(0)
+    Q = rng.normal(size=(500, 4))
+    Q = Q / np.linalg.norm(Q, axis=1, keepdims=True) * np.sign(Q[:, :1])
+    assert np.allclose(quaternion_depuis_matrice(matrice_depuis_quaternion(Q)), Q)
+
+    axe, angle = np.array([0.0, 0.6, 0.8]), 1.2
+    R_debut = matrice_depuis_quaternion(Q[0])
+    R_fin = matrice_depuis_quaternion([np.cos(angle / 2), *np.sin(angle / 2) * axe]) @ R_debut
+    R_u = matrice_depuis_quaternion(slerp(Q[0], quaternion_depuis_matrice(R_fin), np.linspace(0, 1, 7)))
+    assert np.allclose(R_u[0], R_debut) and np.allclose(R_u[-1], R_fin)
+    assert np.allclose(vecteur_rotation(R_u[1:] @ np.swapaxes(R_u[:-1], 1, 2)), axe * angle / 6)
+
+    O, R, V, dt = [0.25, -0.15, 0.5], 0.1, 0.05, 0.02
+    _, s, s_dot, s_ddot, _ = calcul_loi_mouvement(R, V, dt)
+    X, dX, _ = calcul_trajectoire_operationnelle(O, R, s, s_dot, s_ddot)
+
+    # 2. traj() (position seule) : l'orientation de l'outil dérive le long du cercle
+    temps, q, qp, _ = traj(O, R, V, dt=dt)
+    R_robot, _, _, _ = calcul_orientation_et_erreurs(temps, np.eye(3), np.zeros(3), q, qp)
+    derive = np.max(np.linalg.norm(erreur_orientation(R_robot[0], R_robot), axis=1))
+    print(f" -> traj() position seule : dérive d'orientation {np.degrees(derive):.1f}°")
+    assert derive > 0.1
+
+    # 3. Orientation fixe, puis interpolée (SLERP) : pose suivie, vitesses exactes
+    R_depart = R_robot[0]
+    R_arrivee = matrice_depuis_quaternion([np.cos(0.2), 0.0, 0.0, np.sin(0.2)]) @ R_depart  # 22.9° autour de z
+    for nom, orientation_fin in (("fixe", None), ("SLERP", R_arrivee)):
+        temps, q, qp, qpp, R_ref, omega_ref = traj_pose(O, R, V, dt=dt, orientation_fin=orientation_fin)
+        _, _, erreur_X, erreur_dX = calcul_X_robot_et_erreurs(temps, X, dX, q, qp)
+        _, _, erreur_R, erreur_omega = calcul_orientation_et_erreurs(temps, R_ref, omega_ref, q, qp)
+        rapport = rapport_erreurs(temps, erreur_X, erreur_dX, erreur_R=erreur_R, erreur_omega=erreur_omega)
+
+        print(f" -> Orientation {nom} : position {rapport['position']['norme_max']:.1e} m, "
+              f"orientation {rapport['orientation']['norme_max']:.1e} rad, "
+              f"vitesse angulaire {rapport['vitesse_angulaire']['norme_max']:.1e} rad/s")
+        assert rapport["position"]["norme_max"] < 1e-4 and rapport["orientation"]["norme_max"] < 1e-4
+        assert rapport["vitesse"]["norme_max"] < 1e-9 and rapport["vitesse_angulaire"]["norme_max"] < 1e-9
+        assert np.allclose(R_ref[0], R_depart) and np.all(np.isfinite(qpp))
+
+    assert np.allclose(R_ref[-1], R_arrivee)
+    assert np.isclose(np.max(np.linalg.norm(omega_ref, axis=1)), 0.4 * np.max(s_dot) / (2 * np.pi * R))
+
+    print("\n>>> SUCCÈS : Trajectoire en pose complète validée. <<<")
+
+
+if __name__ == "__main__":
+    test_trajectoire_pose()